@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""
+Common helpers of the benchmark scripts.
+
+Every script can be run from any directory, e.g.
+    python3 benchmarks/bench_collision.py --sizes 10000 100000
+and prints a plain text table. Shapes are generated from a fixed seed,
+so two runs on the same machine measure the same data.
+"""
+from contextlib import contextmanager
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Makes the models package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.rectangle import Rectangle  # noqa: E402
+from models.square import Square  # noqa: E402
+
+SEED = 12345
+
+
+def random_shapes(count, extent=None, max_size=64, squares=0.5, seed=SEED):
+    """
+    Returns random Rectangle and Square instances.
+
+    Args:
+        count (int): Number of shapes
+        extent (int, optional): Positions are drawn in [0, extent).
+                                Defaults to a plane growing with count,
+                                so the density of shapes stays the same.
+        max_size (int, optional): Largest width or height. Defaults to 64.
+        squares (float, optional): Share of Square instances.
+                                   Defaults to 0.5.
+        seed (int, optional): Random seed. Defaults to SEED.
+
+    Returns:
+        list: The shapes, with ids 1 to count
+    """
+    if extent is None:
+        extent = max(1024, int((count ** 0.5) * max_size))
+    generator = random.Random(seed)
+    randint = generator.randint
+    shapes = []
+    for id in range(1, count + 1):
+        x = randint(0, extent - 1)
+        y = randint(0, extent - 1)
+        if generator.random() < squares:
+            shapes.append(Square(randint(1, max_size), x, y, id))
+        else:
+            shapes.append(Rectangle(randint(1, max_size),
+                                    randint(1, max_size), x, y, id))
+    return shapes
+
+
+def random_rectangles(count, **kwargs):
+    """
+    Returns random Rectangle instances only.
+
+    Args:
+        count (int): Number of rectangles
+        **kwargs: Passed to random_shapes()
+
+    Returns:
+        list: The rectangles
+    """
+    return random_shapes(count, squares=0, **kwargs)
+
+
+def best_time(function, repeat=3):
+    """
+    Returns the best wall time of several calls of function.
+
+    Args:
+        function (function): Function called without arguments
+        repeat (int, optional): Number of calls. Defaults to 3.
+
+    Returns:
+        float: Seconds taken by the fastest call
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+@contextmanager
+def temporary_directory():
+    """
+    Context manager running its block in a fresh temporary directory.
+
+    Yields:
+        str: Path of the directory
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(cwd)
+
+
+def print_table(headers, rows):
+    """
+    Prints rows as a text table with aligned columns.
+
+    Args:
+        headers (list): Column titles
+        rows (list): Lists of values, formatted with str()
+    """
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max([len(header)] + [len(row[i]) for row in rows])
+              for i, header in enumerate(headers)]
+    print("  ".join(header.rjust(width)
+                    for header, width in zip(headers, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in rows:
+        print("  ".join(value.rjust(width)
+                        for value, width in zip(row, widths)))
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Event loop latency benchmark of the asyncio persistence API.
+
+While --count rectangles are saved and loaded, a ticker task asks to
+wake up every millisecond and records how late it actually runs. The
+blocking save_to_file() and load_from_file() called from a coroutine
+stall the loop for the whole operation; asave_to_file() and
+aload_from_file() only for one chunk at a time.
+
+Usage:
+    python3 benchmarks/bench_async.py [--count 1000000] [--chunk-size 4096]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import print_table, random_rectangles, temporary_directory
+
+from models.rectangle import Rectangle
+
+TICK = 0.001
+
+
+async def ticker(delays, stop):
+    """
+    Records how late each wake-up is until stop is set.
+
+    Args:
+        delays (list): List receiving the delays, in seconds
+        stop (asyncio.Event): Set when the measured work is done
+    """
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        delays.append(time.perf_counter() - start - TICK)
+
+
+async def measure(work):
+    """
+    Runs a coroutine next to the ticker.
+
+    Args:
+        work (coroutine): Work to measure
+
+    Returns:
+        tuple: (seconds taken by work, list of ticker delays)
+    """
+    delays = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(ticker(delays, stop))
+    # Lets the ticker start before the work
+    await asyncio.sleep(TICK)
+    start = time.perf_counter()
+    await work
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await task
+    return elapsed, delays
+
+
+async def blocking_save(shapes):
+    """
+    Saves shapes with the blocking method, from a coroutine.
+
+    Args:
+        shapes (list): Shapes to save
+    """
+    Rectangle.save_to_file(shapes)
+
+
+async def blocking_load():
+    """
+    Loads the shapes with the blocking method, from a coroutine.
+    """
+    Rectangle.load_from_file()
+
+
+async def benchmark(shapes, chunk_size):
+    """
+    Measures each method and returns the table rows.
+
+    Args:
+        shapes (list): Shapes to save
+        chunk_size (int): Chunk size of the asyncio methods
+
+    Returns:
+        list: One row per method
+    """
+    cases = [
+        ("save_to_file", lambda: blocking_save(shapes)),
+        ("asave_to_file", lambda: Rectangle.asave_to_file(shapes,
+                                                          chunk_size)),
+        ("load_from_file", blocking_load),
+        ("aload_from_file", lambda: Rectangle.aload_from_file(chunk_size)),
+    ]
+    rows = []
+    for name, work in cases:
+        elapsed, delays = await measure(work())
+        delays.sort()
+        rows.append([name, "{:.3f}".format(elapsed), len(delays),
+                     "{:.1f}".format(delays[len(delays) // 2] * 1e3),
+                     "{:.1f}".format(delays[int(len(delays) * 0.99)] * 1e3),
+                     "{:.1f}".format(delays[-1] * 1e3)])
+    return rows
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per method.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    arguments = parser.parse_args()
+
+    shapes = random_rectangles(arguments.count)
+    with temporary_directory():
+        rows = asyncio.run(benchmark(shapes, arguments.chunk_size))
+    print("{} rectangles, chunks of {}".format(arguments.count,
+                                               arguments.chunk_size))
+    print_table(["method", "seconds", "ticks", "median ms", "p99 ms",
+                 "max stall ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Benchmark of the binary file format against JSON.
+
+Saves --count rectangles as <Class name>.json and as <Class name>.bin,
+then compares file size, save time, decoding time (records to
+dictionaries, without building instances), load time and the time to
+fetch one shape by id (get_from_file() on the binary index, a full load
+for JSON).
+
+The default 10M shapes need several GB of memory; pass --count to use
+fewer.
+
+Usage:
+    python3 benchmarks/bench_binary_format.py [--count 10000000]
+"""
+import argparse
+import json
+import os
+
+from _common import (best_time, print_table, random_rectangles,
+                     temporary_directory)
+
+from models import binary_format
+from models.rectangle import Rectangle
+
+
+def decode_json(filename):
+    """
+    Returns the dictionaries of a JSON shape file.
+
+    Args:
+        filename (str): Path of the file
+
+    Returns:
+        list: Dictionaries of the file
+    """
+    with open(filename, "r") as file:
+        return json.load(file)
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per format.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=10000000)
+    arguments = parser.parse_args()
+
+    shapes = random_rectangles(arguments.count)
+    middle = shapes[len(shapes) // 2].id
+    rows = []
+    with temporary_directory():
+        for file_format, extension in (("json", ".json"), ("binary", ".bin")):
+            save = best_time(lambda: Rectangle.save_to_file(shapes,
+                                                            file_format), 1)
+            filename = "Rectangle" + extension
+            size = os.path.getsize(filename)
+            if file_format == "binary":
+                decode = best_time(lambda: binary_format.load_binary(
+                    filename), 1)
+            else:
+                decode = best_time(lambda: decode_json(filename), 1)
+            load = best_time(lambda: Rectangle.load_from_file(file_format),
+                             1)
+            if file_format == "binary":
+                find = best_time(lambda: Rectangle.get_from_file(middle))
+            else:
+                find = best_time(lambda: [
+                    shape for shape in Rectangle.load_from_file()
+                    if shape.id == middle], 1)
+            rows.append([file_format, "{:.1f}".format(size / 1e6),
+                         "{:.1f}".format(size / arguments.count),
+                         "{:.3f}".format(save), "{:.3f}".format(decode),
+                         "{:.3f}".format(load), "{:.6f}".format(find)])
+    print("{} rectangles".format(arguments.count))
+    print_table(["format", "MB", "bytes/shape", "save s", "decode s",
+                 "load s", "find one s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Benchmark of models.collision.
+
+Times collide() on lists of shapes and on a ShapeStore, at constant
+density, for each size. The quadratic nested loop it replaces is timed
+too, up to --brute-limit shapes, and checked to find the same pairs.
+
+Usage:
+    python3 benchmarks/bench_collision.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+
+from _common import best_time, print_table, random_shapes
+
+from models.collision import collide, collide_columns
+from models.shape_store import ShapeStore
+
+
+def brute_force(xs, ys, widths, heights):
+    """
+    Returns the overlapping pairs found by comparing every two shapes.
+
+    Args:
+        xs (list): X coordinates
+        ys (list): Y coordinates
+        widths (list): Widths
+        heights (list): Heights
+
+    Returns:
+        list: Sorted (i, j) index pairs with i < j
+    """
+    pairs = []
+    count = len(xs)
+    for i in range(count):
+        x0, y0 = xs[i], ys[i]
+        x1, y1 = x0 + widths[i], y0 + heights[i]
+        for j in range(i + 1, count):
+            if (xs[j] < x1 and x0 < xs[j] + widths[j]
+                    and ys[j] < y1 and y0 < ys[j] + heights[j]):
+                pairs.append((i, j))
+    return pairs
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per size.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10000, 100000, 1000000])
+    parser.add_argument("--brute-limit", type=int, default=10000,
+                        help="largest size timed with the nested loop")
+    arguments = parser.parse_args()
+
+    rows = []
+    for size in arguments.sizes:
+        shapes = random_shapes(size)
+        store = ShapeStore(shapes)
+        columns = ([shape.x for shape in shapes],
+                   [shape.y for shape in shapes],
+                   [shape.width for shape in shapes],
+                   [shape.height for shape in shapes])
+        overlapping, containing = collide_columns(*columns)
+        objects = best_time(lambda: collide(shapes), 1)
+        columnar = best_time(lambda: collide(store), 1)
+        if size <= arguments.brute_limit:
+            brute = best_time(lambda: brute_force(*columns), 1)
+            assert brute_force(*columns) == overlapping
+            brute = "{:.3f}".format(brute)
+        else:
+            brute = "-"
+        rows.append([size, len(overlapping), len(containing),
+                     "{:.3f}".format(objects), "{:.3f}".format(columnar),
+                     brute])
+    print_table(["shapes", "overlapping", "containing", "objects s",
+                 "store s", "nested loop s"], rows)
+
+
+if __name__ == "__main__":
+    main()
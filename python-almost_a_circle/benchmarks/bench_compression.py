@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Size and throughput benchmark of the compressed shape files.
+
+Saves --count rectangles uncompressed and with each codec of
+models.compressed, then prints the file size, the compression ratio and
+the save and load throughput in MB of JSON text per second.
+
+Usage:
+    python3 benchmarks/bench_compression.py [--count 1000000]
+"""
+import argparse
+import os
+
+from _common import (best_time, print_table, random_rectangles,
+                     temporary_directory)
+
+from models import compressed
+from models.rectangle import Rectangle
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per codec.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=1000000)
+    arguments = parser.parse_args()
+
+    shapes = random_rectangles(arguments.count)
+    text_size = len(Rectangle.encode_json(shapes)) / 1e6
+    rows = []
+    with temporary_directory():
+        for codec in [None] + list(compressed.CODECS):
+            save = best_time(lambda: Rectangle.save_to_file(
+                shapes, compression=codec), 1)
+            path, _ = compressed.find("Rectangle.json", codec)
+            size = os.path.getsize(path) / 1e6
+            load = best_time(lambda: Rectangle.load_from_file(
+                compression=codec), 1)
+            rows.append([codec or "none", "{:.2f}".format(size),
+                         "{:.1f}x".format(text_size / size),
+                         "{:.1f}".format(text_size / save),
+                         "{:.1f}".format(text_size / load)])
+    print("{} rectangles, {:.1f} MB of JSON".format(arguments.count,
+                                                    text_size))
+    print_table(["codec", "MB", "ratio", "save MB/s", "load MB/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Benchmark of create_many() against the create() loop.
+
+Builds the same instances from the dictionaries of --count shapes with
+one create() call per dictionary (dummy instance plus update()) and
+with one create_many() call, then times load_from_file(), which uses
+create_many().
+
+Usage:
+    python3 benchmarks/bench_create.py [--count 1000000]
+"""
+import argparse
+
+from _common import (best_time, print_table, random_rectangles,
+                     temporary_directory)
+
+from models.rectangle import Rectangle
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per method.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=1000000)
+    arguments = parser.parse_args()
+
+    dictionaries = [shape.to_dictionary()
+                    for shape in random_rectangles(arguments.count)]
+    loop = best_time(lambda: [Rectangle.create(**dictionary)
+                              for dictionary in dictionaries])
+    bulk = best_time(lambda: Rectangle.create_many(dictionaries))
+    with temporary_directory():
+        Rectangle.save_to_file(Rectangle.create_many(dictionaries))
+        load = best_time(Rectangle.load_from_file)
+
+    rows = [["create() loop", "{:.3f}".format(loop), "1.0x"],
+            ["create_many()", "{:.3f}".format(bulk),
+             "{:.1f}x".format(loop / bulk)],
+            ["load_from_file()", "{:.3f}".format(load), "-"]]
+    print("{} rectangles".format(arguments.count))
+    print_table(["method", "seconds", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Benchmark of the direct JSON encoding of shapes.
+
+Encodes --count shapes with the to_dictionary() + to_json_string()
+pipeline, with encode_json() and with write_json() into a file, checks
+that the texts are identical, and times a full save_to_file_stream(),
+which writes through write_json().
+
+Usage:
+    python3 benchmarks/bench_json_encoding.py [--count 1000000]
+"""
+import argparse
+import io
+
+from _common import (best_time, print_table, random_shapes,
+                     temporary_directory)
+
+from models.base import Base
+
+
+def pipeline(shapes):
+    """
+    Returns the JSON text of shapes through dictionaries.
+
+    Args:
+        shapes (list): Shapes to encode
+
+    Returns:
+        str: JSON text
+    """
+    return Base.to_json_string([shape.to_dictionary() for shape in shapes])
+
+
+def write_file(shapes):
+    """
+    Writes the JSON text of shapes to shapes.json with write_json().
+
+    Args:
+        shapes (list): Shapes to encode
+    """
+    with open("shapes.json", "w") as file:
+        Base.write_json(shapes, file)
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per encoder.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=1000000)
+    arguments = parser.parse_args()
+
+    shapes = random_shapes(arguments.count)
+    buffer = io.StringIO()
+    Base.write_json(shapes, buffer)
+    assert pipeline(shapes) == Base.encode_json(shapes) == buffer.getvalue()
+
+    reference = best_time(lambda: pipeline(shapes))
+    encode = best_time(lambda: Base.encode_json(shapes))
+    with temporary_directory():
+        write = best_time(lambda: write_file(shapes))
+        save = best_time(lambda: Base.save_to_file_stream(shapes))
+    rows = [["to_dictionary + to_json_string", "{:.3f}".format(reference),
+             "1.0x"]]
+    for name, seconds in (("encode_json", encode),
+                          ("write_json to a file", write),
+                          ("save_to_file_stream", save)):
+        rows.append([name, "{:.3f}".format(seconds),
+                     "{:.1f}x".format(reference / seconds)])
+    print("{} shapes".format(arguments.count))
+    print_table(["encoder", "seconds", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
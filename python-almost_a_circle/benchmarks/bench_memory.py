@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""
+Memory benchmark of the shape representations.
+
+Measures with tracemalloc the bytes held per shape once --count
+rectangles are built from freshly parsed JSON values, as a load does:
+    - DictRectangle, the same attributes in a per-instance __dict__, as
+      Rectangle stored them before it had __slots__
+    - Rectangle (slotted)
+    - FlyweightRectangle (id and shared geometry only)
+    - ShapeStore rows (typed arrays, no object per shape)
+
+The shapes repeat --distinct geometries (default: all distinct). With
+few distinct geometries, a flyweight costs its small instance and its
+id only; with mostly distinct ones, the table of geometries makes it
+larger than a Rectangle.
+
+Usage:
+    python3 benchmarks/bench_memory.py [--count 1000000] [--distinct N]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from _common import print_table, random_rectangles
+
+from models.flyweight import FlyweightRectangle
+from models.rectangle import Rectangle
+from models.shape_store import ShapeStore
+
+
+class DictRectangle:
+    """
+    Rectangle attributes kept in a per-instance __dict__.
+    """
+
+    def __init__(self, width, height, x, y, id):
+        """
+        Class constructor for DictRectangle.
+
+        Args:
+            width (int): Width of the rectangle
+            height (int): Height of the rectangle
+            x (int): X coordinate
+            y (int): Y coordinate
+            id (int): ID value
+        """
+        self.id = id
+        self._Rectangle__width = width
+        self._Rectangle__height = height
+        self._Rectangle__x = x
+        self._Rectangle__y = y
+
+
+def measure(build, text):
+    """
+    Returns the memory held by the shapes built from a JSON text.
+
+    Args:
+        build (function): Builds the shapes from a list of rows
+        text (str): JSON list of [width, height, x, y, id] rows
+
+    Returns:
+        int: Bytes allocated and still held once the rows are freed
+    """
+    gc.collect()
+    tracemalloc.start()
+    shapes = build(json.loads(text))
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del shapes
+    return size
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per representation.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--distinct", type=int, default=None,
+                        help="number of distinct geometries")
+    arguments = parser.parse_args()
+
+    pool = random_rectangles(arguments.distinct or arguments.count)
+    text = json.dumps([[shape.width, shape.height, shape.x, shape.y, id]
+                       for id, shape in zip(range(1, arguments.count + 1),
+                                            pool * (arguments.count //
+                                                    len(pool) + 1))])
+    builders = [
+        ("DictRectangle", lambda rows: [DictRectangle(*row)
+                                        for row in rows]),
+        ("Rectangle", lambda rows: [Rectangle(*row) for row in rows]),
+        ("FlyweightRectangle", lambda rows: [FlyweightRectangle(*row)
+                                             for row in rows]),
+        ("ShapeStore", lambda rows: ShapeStore(Rectangle(*row)
+                                               for row in rows)),
+    ]
+    rows = []
+    reference = None
+    for name, build in builders:
+        size = measure(build, text)
+        if reference is None:
+            reference = size
+        rows.append([name, "{:.1f}".format(size / 1e6),
+                     "{:.1f}".format(size / arguments.count),
+                     "{:.2f}".format(size / reference)])
+    print("{} shapes, {} distinct geometries".format(
+        arguments.count, len(pool)))
+    print_table(["representation", "MB", "bytes/shape", "ratio"], rows)
+
+
+if __name__ == "__main__":
+    main()
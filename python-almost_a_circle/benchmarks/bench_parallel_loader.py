@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Scaling benchmark of models.parallel_loader.
+
+Saves --count rectangles as one file and as --shards shard files, then
+loads them with load_from_file() and with load_file() and load_shards()
+for 1, 2, 4, ... workers up to the number of cores. Results include
+pickling the instances back from the workers, which bounds the speedup.
+
+Usage:
+    python3 benchmarks/bench_parallel_loader.py [--count 1000000]
+"""
+import argparse
+import os
+
+from _common import (best_time, print_table, random_rectangles,
+                     temporary_directory)
+
+from models import parallel_loader
+from models.rectangle import Rectangle
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per number of workers.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    arguments = parser.parse_args()
+
+    shapes = random_rectangles(arguments.count)
+    with temporary_directory():
+        Rectangle.save_to_file(shapes)
+        os.mkdir("shards")
+        shards = []
+        step = -(-len(shapes) // arguments.shards)
+        for start in range(0, len(shapes), step):
+            Rectangle.save_to_file(shapes[start:start + step])
+            shards.append(os.path.join("shards", "{}.json".format(start)))
+            os.replace("Rectangle.json", shards[-1])
+        Rectangle.save_to_file(shapes)
+        del shapes
+
+        serial = best_time(Rectangle.load_from_file, 1)
+        rows = [["load_from_file()", "{:.3f}".format(serial), "1.0x",
+                 "-", "-"]]
+        workers = 1
+        while workers <= arguments.max_workers:
+            one_file = best_time(lambda: parallel_loader.load_file(
+                Rectangle, workers=workers), 1)
+            sharded = best_time(lambda: parallel_loader.load_shards(
+                Rectangle, shards, workers), 1)
+            rows.append(["{} workers".format(workers),
+                         "{:.3f}".format(one_file),
+                         "{:.1f}x".format(serial / one_file),
+                         "{:.3f}".format(sharded),
+                         "{:.1f}x".format(serial / sharded)])
+            workers *= 2
+    print("{} rectangles, {} shards, {} cores".format(
+        arguments.count, len(shards), os.cpu_count()))
+    print_table(["loader", "one file s", "speedup", "shards s", "speedup"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
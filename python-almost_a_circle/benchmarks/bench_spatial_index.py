@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Benchmark of models.spatial_index against a linear scan.
+
+Builds a SpatialIndex over --count shapes, then runs --queries overlap,
+containment and 10-nearest queries at random places, with the index and
+with a scan of every shape, and checks that both give the same shapes.
+
+Usage:
+    python3 benchmarks/bench_spatial_index.py [--count 100000]
+"""
+import argparse
+import heapq
+import math
+import random
+import time
+
+from _common import SEED, best_time, print_table, random_shapes
+
+from models.spatial_index import SpatialIndex
+
+
+def distance(shape, x, y):
+    """
+    Returns the distance from a point to a shape, as nearest() does.
+
+    Args:
+        shape (Rectangle): Shape
+        x (int): X coordinate of the point
+        y (int): Y coordinate of the point
+
+    Returns:
+        float: 0 inside the shape, else the distance to its closest edge
+    """
+    dx = max(shape.x - x, 0, x - shape.x - shape.width)
+    dy = max(shape.y - y, 0, y - shape.y - shape.height)
+    return math.hypot(dx, dy)
+
+
+def scan_overlapping(shapes, x, y, width, height):
+    """
+    Returns the shapes overlapping a box by scanning all of them.
+
+    Args:
+        shapes (list): Shapes to scan
+        x, y, width, height (int): The box
+
+    Returns:
+        list: Overlapping shapes
+    """
+    return [shape for shape in shapes
+            if shape.x < x + width and x < shape.x + shape.width
+            and shape.y < y + height and y < shape.y + shape.height]
+
+
+def scan_containing(shapes, x, y):
+    """
+    Returns the shapes containing a point by scanning all of them.
+
+    Args:
+        shapes (list): Shapes to scan
+        x, y (int): The point
+
+    Returns:
+        list: Shapes containing the point
+    """
+    return [shape for shape in shapes
+            if shape.x <= x < shape.x + shape.width
+            and shape.y <= y < shape.y + shape.height]
+
+
+def scan_nearest(shapes, x, y, k):
+    """
+    Returns the k shapes closest to a point by scanning all of them.
+
+    Args:
+        shapes (list): Shapes to scan
+        x, y (int): The point
+        k (int): Number of shapes
+
+    Returns:
+        list: The k closest shapes, closest first
+    """
+    return heapq.nsmallest(k, shapes, key=lambda shape: distance(shape,
+                                                                 x, y))
+
+
+def run(queries, function):
+    """
+    Runs function on every query and returns the results and the time.
+
+    Args:
+        queries (list): Argument tuples
+        function (function): Query function
+
+    Returns:
+        tuple: (list of results, seconds per query)
+    """
+    start = time.perf_counter()
+    results = [function(*query) for query in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    """
+    Runs the benchmark and prints one row per query type.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=100)
+    arguments = parser.parse_args()
+
+    shapes = random_shapes(arguments.count)
+    extent = max(shape.x + shape.width for shape in shapes)
+    build = best_time(lambda: SpatialIndex(shapes), 1)
+    index = SpatialIndex(shapes)
+
+    generator = random.Random(SEED)
+    points = [(generator.randrange(extent), generator.randrange(extent))
+              for _ in range(arguments.queries)]
+    boxes = [(x, y, 256, 256) for x, y in points]
+    cases = [
+        ("overlapping 256x256", boxes, index.overlapping,
+         lambda *box: scan_overlapping(shapes, *box), False),
+        ("containing", points, index.containing,
+         lambda x, y: scan_containing(shapes, x, y), False),
+        ("nearest k=10", points, lambda x, y: index.nearest(x, y, 10),
+         lambda x, y: scan_nearest(shapes, x, y, 10), True),
+    ]
+    rows = []
+    for name, queries, indexed, scan, ordered in cases:
+        found, indexed_time = run(queries, indexed)
+        expected, scan_time = run(queries, scan)
+        for query, got, want in zip(queries, found, expected):
+            if ordered:
+                # Ties may be broken differently: compare distances
+                assert ([distance(shape, *query) for shape in got]
+                        == [distance(shape, *query) for shape in want])
+            else:
+                assert sorted(map(id, got)) == sorted(map(id, want))
+        rows.append([name, "{:.1f}".format(indexed_time * 1e6),
+                     "{:.1f}".format(scan_time * 1e6),
+                     "{:.0f}x".format(scan_time / indexed_time)])
+    print("{} shapes, index built in {:.3f} s".format(arguments.count,
+                                                       build))
+    print_table(["query", "index us", "scan us", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,8 @@
 Models package initialization file.
 This file makes the models directory a Python package.
 """
+import os
+
+if os.environ.get("MODELS_PROFILE"):
+    from models import profiling
+    profiling.enable()
@@ -0,0 +1,237 @@
+#!/usr/bin/python3
+"""
+Aggregate module.
+Contains the ShapeAggregator class computing total area, bounding box,
+size histogram and area percentiles of many shapes in a single pass,
+and functions building one from a list of shapes, a ShapeStore or a
+saved <Class name>.json file.
+"""
+from collections import Counter
+from operator import add, mul
+import os
+
+from models import compressed
+from models.base import _iter_json_list
+from models.shape_store import ShapeStore
+
+
+class ShapeAggregator:
+    """
+    Single-pass accumulator of geometry statistics.
+
+    Every statistic is updated as each shape is added, so one pass over
+    the data gives all of them. Areas are kept as a histogram (area ->
+    count) rather than a list, so percentiles are exact while memory only
+    grows with the number of distinct areas.
+
+    Attributes:
+        count (int): Number of shapes added
+        total_area (int): Sum of the areas
+        sizes (Counter): Number of shapes per (width, height)
+        areas (Counter): Number of shapes per area
+        _min_x (int): Smallest x
+        _min_y (int): Smallest y
+        _max_x (int): Largest x + width
+        _max_y (int): Largest y + height
+    """
+
+    def __init__(self):
+        """
+        Class constructor for ShapeAggregator.
+        """
+        self.count = 0
+        self.total_area = 0
+        self.sizes = Counter()
+        self.areas = Counter()
+        self._min_x = None
+        self._min_y = None
+        self._max_x = None
+        self._max_y = None
+
+    def add(self, width, height, x=0, y=0):
+        """
+        Adds the geometry of one shape.
+
+        Args:
+            width (int): Width of the shape
+            height (int): Height of the shape
+            x (int, optional): X coordinate. Defaults to 0.
+            y (int, optional): Y coordinate. Defaults to 0.
+        """
+        area = width * height
+        self.count += 1
+        self.total_area += area
+        self.sizes[(width, height)] += 1
+        self.areas[area] += 1
+        if self.count == 1:
+            self._min_x = x
+            self._min_y = y
+            self._max_x = x + width
+            self._max_y = y + height
+            return
+        if x < self._min_x:
+            self._min_x = x
+        if y < self._min_y:
+            self._min_y = y
+        if x + width > self._max_x:
+            self._max_x = x + width
+        if y + height > self._max_y:
+            self._max_y = y + height
+
+    def add_shape(self, shape):
+        """
+        Adds a Rectangle or Square instance.
+
+        Args:
+            shape (Rectangle): Shape to add
+        """
+        self.add(shape.width, shape.height, shape.x, shape.y)
+
+    def add_columns(self, widths, heights, xs, ys):
+        """
+        Adds many shapes given as parallel columns.
+
+        Each statistic is computed with one builtin call over the columns
+        (sum, min, max, Counter) instead of a Python loop per shape.
+
+        Args:
+            widths (sequence): Widths of the shapes
+            heights (sequence): Heights of the shapes
+            xs (sequence): X coordinates of the shapes
+            ys (sequence): Y coordinates of the shapes
+        """
+        if not len(widths):
+            return
+        areas = list(map(mul, widths, heights))
+        bounds = (min(xs), min(ys),
+                  max(map(add, xs, widths)), max(map(add, ys, heights)))
+        if self.count:
+            bounds = (min(bounds[0], self._min_x), min(bounds[1], self._min_y),
+                      max(bounds[2], self._max_x), max(bounds[3], self._max_y))
+        self._min_x, self._min_y, self._max_x, self._max_y = bounds
+        self.count += len(areas)
+        self.total_area += sum(areas)
+        self.sizes.update(zip(widths, heights))
+        self.areas.update(areas)
+
+    def bounding_box(self):
+        """
+        Returns the smallest box containing all the shapes.
+
+        Returns:
+            tuple: (x, y, width, height) of the box, or None if no shape
+                   was added
+        """
+        if not self.count:
+            return None
+        return (self._min_x, self._min_y,
+                self._max_x - self._min_x, self._max_y - self._min_y)
+
+    def percentile(self, p):
+        """
+        Returns the p-th percentile of the areas (nearest-rank method).
+
+        Args:
+            p (float): Percentile, between 0 and 100
+
+        Returns:
+            int: Smallest area such that at least p percent of the shapes
+                 have an area lower or equal, or None if no shape was added
+
+        Raises:
+            ValueError: If p is not between 0 and 100
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("p must be between 0 and 100")
+        if not self.count:
+            return None
+        rank = max(1, -(-p * self.count // 100))
+        seen = 0
+        for area in sorted(self.areas):
+            seen += self.areas[area]
+            if seen >= rank:
+                return area
+        return area
+
+    def to_dictionary(self, percentiles=(50, 90, 99)):
+        """
+        Returns all the statistics as a dictionary.
+
+        Args:
+            percentiles (iterable, optional): Area percentiles to include.
+                                              Defaults to (50, 90, 99).
+
+        Returns:
+            dict: Dictionary with keys 'count', 'total_area',
+                  'bounding_box', 'sizes' and 'percentiles'
+        """
+        return {
+            "count": self.count,
+            "total_area": self.total_area,
+            "bounding_box": self.bounding_box(),
+            "sizes": dict(self.sizes),
+            "percentiles": {p: self.percentile(p) for p in percentiles}
+        }
+
+
+def aggregate(shapes):
+    """
+    Returns a ShapeAggregator over a list of shapes or a ShapeStore.
+
+    A ShapeStore is aggregated directly from its columns.
+
+    Args:
+        shapes (iterable): Rectangle or Square instances, or a ShapeStore
+
+    Returns:
+        ShapeAggregator: Statistics of the shapes
+    """
+    aggregator = ShapeAggregator()
+    if isinstance(shapes, ShapeStore):
+        aggregator.add_columns(shapes._widths, shapes._heights,
+                               shapes._xs, shapes._ys)
+    else:
+        for shape in shapes:
+            aggregator.add_shape(shape)
+    return aggregator
+
+
+def aggregate_file(cls, filename=None):
+    """
+    Returns a ShapeAggregator over a file written by save_to_file().
+
+    The file is streamed: dictionaries are decoded one at a time and no
+    instance is created, so the file does not need to fit in memory.
+    Square dictionaries ('size') are read as width = height = size.
+    Compressed files are decompressed as they are read (see
+    models.compressed).
+
+    Args:
+        cls (type): Class that saved the file, e.g. Rectangle
+        filename (str, optional): Path of the file, its extension giving
+                                  the codec. Defaults to the file
+                                  load_from_file() reads.
+
+    Returns:
+        ShapeAggregator: Statistics of the saved shapes; empty if the file
+                         doesn't exist
+    """
+    if filename is None:
+        filename, codec = compressed.find(cls.__name__ + ".json")
+    else:
+        codec = compressed.codec_of(filename)
+    aggregator = ShapeAggregator()
+    if filename is None or not os.path.exists(filename):
+        return aggregator
+
+    add_geometry = aggregator.add
+    with compressed.open_text(filename, codec) as file:
+        for dictionary in _iter_json_list(file, 65536):
+            if "size" in dictionary:
+                width = height = dictionary["size"]
+            else:
+                width = dictionary.get("width", 1)
+                height = dictionary.get("height", 1)
+            add_geometry(width, height,
+                         dictionary.get("x", 0), dictionary.get("y", 0))
+    return aggregator
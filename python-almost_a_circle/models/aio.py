@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""
+Aio module.
+Contains the asyncio versions of the file methods, used by
+Base.asave_to_file(), Base.aload_from_file() and Base.aiter_from_file().
+
+All the blocking work (file I/O, JSON encoding and decoding, building
+instances) runs in a worker thread, one chunk of instances at a time, so
+the event loop only waits for the end of each chunk and serves other
+tasks in between. Each call has its own single-thread executor, so its
+chunks and its cleanup run in order even after a cancellation.
+
+The instances being saved must not be changed by other tasks until
+the save is done, since they are encoded from the worker thread.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from models.base import Base, _collect
+from models.durable import atomic_write
+
+
+class _Worker:
+    """
+    Runs functions one at a time in a private thread for a coroutine.
+
+    Attributes:
+        _loop (asyncio.AbstractEventLoop): Running event loop
+        _executor (ThreadPoolExecutor): Single-thread executor
+    """
+
+    def __init__(self):
+        """
+        Class constructor for _Worker.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def run(self, function, *args):
+        """
+        Runs function(*args) in the worker thread.
+
+        Args:
+            function (function): Blocking function
+            *args: Its arguments
+
+        Returns:
+            asyncio.Future: Future of the result
+        """
+        return self._loop.run_in_executor(self._executor, function, *args)
+
+    def close(self):
+        """
+        Lets the thread exit once its queued functions are done.
+        """
+        self._executor.shutdown(wait=False)
+
+
+def _write_chunk(file, iterator, chunk_size, first):
+    """
+    Encodes and writes the next chunk of instances.
+
+    Args:
+        file (file): Text stream to write to
+        iterator (iterator): Instances still to write
+        chunk_size (int): Maximum number of instances to write
+        first (bool): True if no instance was written yet
+
+    Returns:
+        int: Number of instances written, 0 at the end of iterator
+    """
+    records = [obj.to_json_record() for obj in islice(iterator, chunk_size)]
+    if records:
+        file.write(("" if first else ", ") + ", ".join(records))
+    return len(records)
+
+
+async def save_to_file(cls, list_objs, chunk_size=4096, durability="close"):
+    """
+    Writes list_objs to <Class name>.json without blocking the event loop.
+
+    The file content is the same as with save_to_file(), and it is
+    replaced atomically in the same way: if the task is cancelled or
+    fails before all the instances are written, the old file is left
+    untouched. Once they are, the rename is always completed. Like
+    save_to_file(), a completed save removes the log and clears the
+    dirty marks of the saved instances.
+
+    Args:
+        cls (type): Base subclass naming the file
+        list_objs (iterable): Instances to save, or None
+        chunk_size (int, optional): Instances encoded per step.
+                                    Defaults to 4096.
+        durability (str, optional): "none", "close" or "periodic".
+                                    Defaults to "close".
+    """
+    worker = _Worker()
+    filename = cls.__name__ + ".json"
+    writer = atomic_write(filename, "w", durability)
+    iterator = iter(list_objs if list_objs is not None else ())
+    # Only the dirty instances are kept, as in save_to_file_stream()
+    saved = []
+    dirty = Base._trackers.get(cls.__name__)
+    if dirty:
+        iterator = _collect(iterator, dirty, saved)
+    try:
+        file = await worker.run(writer.__enter__)
+        try:
+            await worker.run(file.write, "[")
+            first = True
+            while await worker.run(_write_chunk, file, iterator,
+                                   chunk_size, first):
+                first = False
+            await worker.run(file.write, "]")
+        except BaseException as error:
+            # Queued after the running chunk: removes the temporary file
+            await asyncio.shield(worker.run(
+                writer.__exit__, type(error), error, error.__traceback__))
+            raise
+        await asyncio.shield(worker.run(writer.__exit__, None, None, None))
+        await asyncio.shield(worker.run(cls._snapshot_saved, saved))
+    finally:
+        worker.close()
+
+
+async def iter_chunks(cls, chunk_size=4096):
+    """
+    Yields the instances of <Class name>.json by chunks.
+
+    Args:
+        cls (type): Base subclass to build
+        chunk_size (int, optional): Instances built per step.
+                                    Defaults to 4096.
+
+    Yields:
+        list: Up to chunk_size instances of cls, in file order
+    """
+    worker = _Worker()
+    # The synchronous generator only ever runs in the worker thread
+    iterator = cls.iter_from_file()
+    try:
+        while True:
+            chunk = await worker.run(list, islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        await asyncio.shield(worker.run(iterator.close))
+        worker.close()
+
+
+async def iter_from_file(cls, chunk_size=4096):
+    """
+    Yields the instances of <Class name>.json one at a time.
+
+    Args:
+        cls (type): Base subclass to build
+        chunk_size (int, optional): Instances built per step.
+                                    Defaults to 4096.
+
+    Yields:
+        Instance of cls for each dictionary of the file
+    """
+    chunks = iter_chunks(cls, chunk_size)
+    try:
+        async for chunk in chunks:
+            for obj in chunk:
+                yield obj
+    finally:
+        await chunks.aclose()
+
+
+async def load_from_file(cls, chunk_size=4096):
+    """
+    Returns the instances of <Class name>.json.
+
+    Args:
+        cls (type): Base subclass to build
+        chunk_size (int, optional): Instances built per step.
+                                    Defaults to 4096.
+
+    Returns:
+        list: List of instances of cls. Empty if the file doesn't exist.
+    """
+    instances = []
+    chunks = iter_chunks(cls, chunk_size)
+    try:
+        async for chunk in chunks:
+            instances.extend(chunk)
+    finally:
+        await chunks.aclose()
+    return instances
@@ -4,6 +4,9 @@ Base module.
 Contains the Base class which manages id attribute for all future classes.
 """
 import json
+import threading
+
+from models.durable import atomic_write, check_policy
 
 
 class Base:
@@ -16,9 +19,53 @@ class Base:
 
     Attributes:
         __nb_objects (int): Private class attribute to count instances
+        __nb_objects_lock (threading.Lock): Lock protecting __nb_objects
+        __id_allocator: Optional allocator replacing __nb_objects
+                        (see models.id_allocator)
+        __storage: Storage backend used by save() and load()
+                   (see models.storage), None for the default
+                   JSONFileStorage
+        __durability (str): Default durability policy of save_to_file()
+                            (see models.durable)
+        _trackers (dict): Maps the names of the classes whose changes are
+                          tracked to their dirty instances (instance ->
+                          id before its first change)
+        _registry (dict): Maps type tags to the subclasses rebuilt by
+                          load_tagged(); filled in by __init_subclass__
+        _tag (str): Type tag written by save_tagged(). Defaults to the
+                    class name; a subclass setting it to an existing tag
+                    (e.g. a view on a Rectangle) is saved as that class
+                    and not registered.
+        _dummy_args (tuple): Constructor arguments of the dummy instance
+                             built by create()
+        id (int): Identity of the instance, stored in the _id slot
+
+    Note:
+        Base and its subclasses declare __slots__, so instances have no
+        per-instance __dict__. Subclasses that add attributes must list
+        them in their own __slots__ (or leave __slots__ out to get a
+        __dict__ back).
     """
 
+    __slots__ = ("_id", "__weakref__")
+
     __nb_objects = 0
+    __nb_objects_lock = threading.Lock()
+    __id_allocator = None
+    __storage = None
+    __durability = "close"
+    _trackers = {}
+    _registry = {}
+    _dummy_args = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Registers each new subclass under its type tag.
+        """
+        super().__init_subclass__(**kwargs)
+        if "_tag" not in cls.__dict__:
+            cls._tag = cls.__name__
+            Base._registry[cls._tag] = cls
 
     def __init__(self, id=None):
         """
@@ -29,10 +76,228 @@ class Base:
                                auto-increment __nb_objects and use that value.
         """
         if id is not None:
-            self.id = id
+            self._id = id
         else:
+            self._id = Base._next_id()
+
+    @property
+    def id(self):
+        """
+        Getter for id attribute.
+
+        Returns:
+            int: Identity of the instance
+        """
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        """
+        Setter for id attribute.
+
+        The change is tracked like the other attributes, so the old id
+        is known when the instance is saved by save_dirty().
+
+        Args:
+            value (int): Id value to set
+        """
+        if Base._trackers:
+            self._mark_dirty()
+        self._id = value
+
+    @staticmethod
+    def _next_id():
+        """
+        Increments __nb_objects and returns the new value.
+
+        Used by the constructor and by code that creates shapes without
+        going through __init__ (e.g. ShapeStore), so that every shape
+        gets its id from the same counter. The increment is done under a
+        lock, so threads creating shapes never get the same id. If an
+        allocator was set with set_id_allocator(), it is used instead.
+
+        Returns:
+            int: The next available id
+        """
+        allocator = Base.__id_allocator
+        if allocator is not None:
+            return allocator.next_id()
+        with Base.__nb_objects_lock:
             Base.__nb_objects += 1
-            self.id = Base.__nb_objects
+            return Base.__nb_objects
+
+    @staticmethod
+    def reserve_ids(count):
+        """
+        Reserves a block of consecutive ids for batch creation.
+
+        Args:
+            count (int): Number of ids to reserve
+
+        Returns:
+            range: The reserved ids, which no other instance will get
+
+        Raises:
+            ValueError: If count < 0
+
+        Example:
+            ids = Base.reserve_ids(3)
+            rects = [Rectangle(1, 1, id=i) for i in ids]
+        """
+        if count < 0:
+            raise ValueError("count must be >= 0")
+        allocator = Base.__id_allocator
+        if allocator is not None:
+            return allocator.reserve(count)
+        with Base.__nb_objects_lock:
+            start = Base.__nb_objects + 1
+            Base.__nb_objects += count
+        return range(start, start + count)
+
+    @staticmethod
+    def set_id_allocator(allocator):
+        """
+        Replaces the __nb_objects counter with an id allocator.
+
+        The allocator must provide next_id(), reserve(count),
+        skip_to(start) and last_id(), like IdAllocator or FileIdAllocator
+        from models.id_allocator. Use a FileIdAllocator on a shared file
+        so that several processes creating shapes in parallel never get
+        the same id.
+
+        No id is handed out twice across a switch: the new allocator
+        skips the ids already given by __nb_objects, and __nb_objects
+        moves past the ids given by the allocator it replaces.
+
+        Args:
+            allocator: The allocator to use, or None to go back to
+                       __nb_objects
+        """
+        with Base.__nb_objects_lock:
+            previous = Base.__id_allocator
+            if previous is not None:
+                Base.__nb_objects = max(Base.__nb_objects, previous.last_id())
+            if allocator is not None:
+                allocator.skip_to(Base.__nb_objects + 1)
+            Base.__id_allocator = allocator
+
+    # ========================================================================
+    # Change tracking
+    # ========================================================================
+
+    def _mark_dirty(self):
+        """
+        Records that the instance changed, if its class is tracked.
+
+        Setters and update() call this (behind an "if Base._trackers"
+        test, so it costs nothing while no class is tracked), before the
+        change. The id the instance had at its first change is kept, so
+        an id change is saved correctly.
+        """
+        dirty = Base._trackers.get(type(self).__name__)
+        if dirty is not None and self not in dirty:
+            dirty[self] = self.id
+
+    @classmethod
+    def _forget_dirty(cls, instances):
+        """
+        Removes instances from the dirty set of the class.
+
+        Used by the loaders: an instance just read from a file has not
+        changed since it was saved.
+
+        Args:
+            instances (iterable): Instances to forget
+        """
+        dirty = Base._trackers.get(cls.__name__)
+        if dirty:
+            for obj in instances:
+                dirty.pop(obj, None)
+
+    @classmethod
+    def _snapshot_saved(cls, instances):
+        """
+        Records that instances were fully saved to a JSON file.
+
+        The <Class name>.jsonl log only holds changes older than the new
+        snapshot, so it is removed (load_from_log() would replay them
+        over it), and the saved instances are no longer dirty.
+
+        Args:
+            instances (iterable): Instances written to the snapshot
+        """
+        import os
+
+        filename = cls.__name__ + ".jsonl"
+        if os.path.exists(filename):
+            os.remove(filename)
+        cls._forget_dirty(instances)
+
+    @classmethod
+    def track_changes(cls, enabled=True):
+        """
+        Starts or stops tracking the changes of the instances of the class.
+
+        While tracking is on, creating an instance, calling a setter
+        (id included) or update() marks the instance dirty, and
+        save_dirty() writes only the dirty instances. A JSON
+        save_to_file() or save_to_file_stream() clears the marks of the
+        instances it saves. Tracking is per class: Rectangle and Square
+        are tracked separately.
+
+        Args:
+            enabled (bool, optional): True to start, False to stop and
+                                      drop the dirty set. Defaults to True.
+        """
+        if enabled:
+            Base._trackers.setdefault(cls.__name__, {})
+        else:
+            Base._trackers.pop(cls.__name__, None)
+
+    @classmethod
+    def dirty(cls):
+        """
+        Returns the instances of the class changed since the last save.
+
+        Returns:
+            list: Dirty instances, in the order of their first change.
+                  Empty if the class is not tracked.
+        """
+        return list(Base._trackers.get(cls.__name__, ()))
+
+    @classmethod
+    def save_dirty(cls):
+        """
+        Saves only the instances changed since the last save.
+
+        Each dirty instance is appended to the <Class name>.jsonl log as
+        an update record (see log_update()), then the dirty set is
+        cleared. The cost depends on the number of changed instances,
+        not on the total. load_from_log() reads the result and
+        compact() folds it into <Class name>.json.
+
+        Returns:
+            int: Number of instances written
+
+        Raises:
+            ValueError: If the class is not tracked
+        """
+        dirty = Base._trackers.get(cls.__name__)
+        if dirty is None:
+            raise ValueError("{} changes are not tracked".format(cls.__name__))
+        if not dirty:
+            return 0
+
+        filename = cls.__name__ + ".jsonl"
+        with open(filename, "a") as file:
+            file.write("".join(
+                json.dumps({"op": "update", "id": old_id,
+                            "data": obj.to_dictionary()}) + "\n"
+                for obj, old_id in dirty.items()
+            ))
+        count = len(dirty)
+        dirty.clear()
+        return count
 
     @staticmethod
     def to_json_string(list_dictionaries):
@@ -98,6 +363,72 @@ class Base:
             return []
         return json.loads(json_string)
 
+    # ========================================================================
+    # Direct JSON encoding
+    # ========================================================================
+
+    def to_json_record(self):
+        """
+        Returns the JSON text of the dictionary representation.
+
+        This default version is json.dumps(self.to_dictionary()).
+        Rectangle and Square override it to format their attributes
+        directly, without building the dictionary.
+
+        Returns:
+            str: JSON object text
+        """
+        return json.dumps(self.to_dictionary())
+
+    @staticmethod
+    def encode_json(list_objs):
+        """
+        Returns the JSON string of a list of instances.
+
+        The result is exactly
+        to_json_string([obj.to_dictionary() for obj in list_objs]),
+        but each object writes its own text with to_json_record(), so no
+        dictionary is built.
+
+        Args:
+            list_objs (list): Instances that inherit from Base, or None
+
+        Returns:
+            str: JSON string representation of the list
+        """
+        if not list_objs:
+            return "[]"
+        records = [obj.to_json_record() for obj in list_objs]
+        return "[" + ", ".join(records) + "]"
+
+    @staticmethod
+    def write_json(list_objs, file, chunk_size=4096):
+        """
+        Writes the JSON string of a list of instances to a text stream.
+
+        Writes the same text as encode_json(), chunk_size objects at a
+        time, so the full string is never built.
+
+        Args:
+            list_objs (iterable): Instances that inherit from Base, or None
+            file (file): Text stream to write to
+            chunk_size (int, optional): Objects encoded per write.
+                                        Defaults to 4096.
+        """
+        file.write("[")
+        if list_objs is not None:
+            chunk = []
+            separator = ""
+            for obj in list_objs:
+                chunk.append(obj.to_json_record())
+                if len(chunk) == chunk_size:
+                    file.write(separator + ", ".join(chunk))
+                    separator = ", "
+                    chunk = []
+            if chunk:
+                file.write(separator + ", ".join(chunk))
+        file.write("]")
+
     @classmethod
     def create(cls, **dictionary):
         """
@@ -128,16 +459,9 @@ class Base:
             This method uses the update() method internally, so it supports
             the same attribute names and validation as update().
         """
-        # Create a "dummy" instance with mandatory attributes
-        if cls.__name__ == "Rectangle":
-            # Rectangle needs width and height as mandatory parameters
-            dummy = cls(1, 1)  # Create with dummy width=1, height=1
-        elif cls.__name__ == "Square":
-            # Square needs size as mandatory parameter
-            dummy = cls(1)  # Create with dummy size=1
-        else:
-            # For Base or other classes, create without parameters
-            dummy = cls()
+        # Create a "dummy" instance with the mandatory attributes the
+        # class declares (e.g. width=1, height=1 for Rectangle)
+        dummy = cls(*cls._dummy_args)
 
         # Use the update method to apply real values from dictionary
         # **dictionary expands the dictionary as keyword arguments
@@ -146,18 +470,67 @@ class Base:
         return dummy
 
     @classmethod
-    def load_from_file(cls):
+    def create_many(cls, list_dictionaries):
+        """
+        Returns a list of instances built from a list of dictionaries.
+
+        This default version simply calls create() for each dictionary.
+        Rectangle and Square override it with a faster bulk constructor.
+
+        Args:
+            list_dictionaries (iterable): Dictionaries of attributes
+
+        Returns:
+            list: List of instances of the calling class
+        """
+        return [cls.create(**dictionary) for dictionary in list_dictionaries]
+
+    @classmethod
+    def load_from_file(cls, file_format="json", lazy=False, cache_size=4096,
+                       compression=None):
         """
         Returns a list of instances loaded from a JSON file.
 
         This method loads instances from a JSON file named after the class.
         It reads the file, converts the JSON string to a list of dictionaries,
-        and then creates instances using the create method.
+        and then creates instances using the create_many method.
+
+        With file_format="binary", the instances are loaded from the
+        <Class name>.bin file written by save_to_file(..., "binary"),
+        which is memory-mapped and decoded without any JSON parsing.
+
+        With lazy=True, nothing is decoded up front: a LazyShapeList
+        (see models.lazy) is returned, which supports len(), indexing and
+        slicing and only builds the instances that are accessed, keeping
+        at most cache_size of them.
+
+        JSON files can be compressed (see models.compressed). The codec is
+        given by compression. Without it, <Class name>.json is read if it
+        exists, else the one of .json.gz, .json.bz2 and .json.xz that
+        exists. The file is decompressed and decoded as it is read.
+
+        Args:
+            file_format (str, optional): "json" or "binary".
+                                         Defaults to "json".
+            lazy (bool, optional): True to return a LazyShapeList.
+                                   Defaults to False.
+            cache_size (int, optional): Instances cached by the
+                                        LazyShapeList. Defaults to 4096.
+            compression (str, optional): "gzip", "bz2" or "lzma".
+                                         Defaults to None (from the
+                                         extension).
 
         Returns:
             list: List of instances of the calling class. If the file doesn't
                   exist, returns an empty list.
 
+        Raises:
+            ValueError: If compression is used with lazy=True or the
+                        binary format, if a lazy JSON load only finds a
+                        compressed file, or if compression is None,
+                        <Class name>.json doesn't exist and several
+                        compressed variants do
+
         File format:
             The filename will be: <Class name>.json
             Examples: Rectangle.json, Square.json
@@ -168,13 +541,54 @@ class Base:
 
         Note:
             This method uses from_json_string() to parse the JSON data and
-            create() to instantiate objects from dictionaries.
+            create_many() to instantiate objects from dictionaries. For
+            Rectangle and Square, unlike create(), this takes no id from
+            the Base counter for records that have an id, whatever the
+            format of the file.
         """
         import os
+        from models import binary_format, compressed
+
+        if compression is not None and (lazy or file_format != "json"):
+            raise ValueError("compression only applies to JSON files "
+                             "loaded eagerly")
+
+        if lazy:
+            from models.lazy import LazyShapeList
+
+            if file_format == "binary":
+                filename = cls.__name__ + binary_format.EXTENSION
+                if not os.path.exists(filename):
+                    return []
+            else:
+                filename, codec = compressed.find(cls.__name__ + ".json")
+                if filename is None:
+                    return []
+                if codec is not None:
+                    # Records are found by offset, which needs a plain file
+                    raise ValueError("lazy=True needs an uncompressed file: "
+                                     "{}".format(filename))
+            return LazyShapeList(cls, filename, file_format, cache_size)
+
+        if file_format == "binary":
+            filename = cls.__name__ + binary_format.EXTENSION
+            if not os.path.exists(filename):
+                return []
+            _, list_dictionaries = binary_format.load_binary(filename)
+            return cls.create_many(list_dictionaries)
+        if file_format != "json":
+            raise ValueError("Unknown file format: {}".format(file_format))
 
         # Generate filename based on class name
         filename = cls.__name__ + ".json"
 
+        path, compression = compressed.find(filename, compression)
+        if compression is not None:
+            with compressed.open_text(path, compression) as file:
+                instances = cls.create_many(_iter_json_list(file, 65536))
+            cls._forget_dirty(instances)
+            return instances
+
         # Check if file exists
         if not os.path.exists(filename):
             return []
@@ -186,13 +600,29 @@ class Base:
         # Convert JSON string to list of dictionaries
         list_dictionaries = cls.from_json_string(json_string)
 
-        # Create instances from dictionaries using create method
-        instances = [cls.create(**dictionary) for dictionary in list_dictionaries]
+        # Create instances from dictionaries in bulk
+        instances = cls.create_many(list_dictionaries)
+        cls._forget_dirty(instances)
 
         return instances
 
+    @staticmethod
+    def set_durability(durability):
+        """
+        Sets the default durability policy of the methods writing files.
+
+        Args:
+            durability (str): "none", "close" or "periodic"
+                              (see models.durable)
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        Base.__durability = check_policy(durability)
+
     @classmethod
-    def save_to_file(cls, list_objs):
+    def save_to_file(cls, list_objs, file_format="json", durability=None,
+                     compression=None):
         """
         Writes the JSON string representation of list_objs to a file.
 
@@ -200,10 +630,39 @@ class Base:
         is automatically generated based on the class name. If the file
         already exists, it will be overwritten.
 
+        The file is replaced atomically (see models.durable): the content
+        is written to a temporary file, synced according to durability,
+        then renamed, so a crash or a concurrent load_from_file() never
+        sees a half-written file.
+
+        With compression, the JSON text is compressed as it is written to
+        <Class name>.json plus the codec extension (see models.compressed).
+        The other variants of the file (plain or with another codec) are
+        left as they are; loads read <Class name>.json first unless given
+        the codec.
+
+        A JSON save, compressed or not, is a new snapshot for
+        load_from_log(): the <Class name>.jsonl log is removed and the
+        saved instances are no longer dirty (see track_changes()). Binary
+        saves, which load_from_log() doesn't read, leave both untouched.
+
+        With file_format="binary", the instances are written to
+        <Class name>.bin as fixed-width integer records instead (see
+        models.binary_format), which is smaller and much faster to load.
+        A sidecar <Class name>.idx index is written too, for
+        get_from_file().
+
         Args:
             list_objs (list): List of instances that inherit from Base
                              (e.g., list of Rectangle or Square instances)
                              If None, saves an empty list
+            file_format (str, optional): "json" or "binary".
+                                         Defaults to "json".
+            durability (str, optional): "none", "close" or "periodic".
+                                        Defaults to the policy set with
+                                        set_durability() ("close").
+            compression (str, optional): "gzip", "bz2" or "lzma".
+                                         Defaults to None (no compression).
 
         File format:
             The filename will be: <Class name>.json
@@ -214,11 +673,41 @@ class Base:
             Square.save_to_file([square1])          # Creates Square.json
             Rectangle.save_to_file(None)            # Creates Rectangle.json with []
         """
+        from models import binary_format, compressed
+
+        if durability is None:
+            durability = Base.__durability
+        if compression is not None:
+            if file_format != "json":
+                raise ValueError("compression only applies to JSON files")
+            filename = (cls.__name__ + ".json"
+                        + compressed.CODECS[compressed.check_codec(
+                            compression)])
+            with atomic_write(filename, "wb", durability) as raw:
+                with compressed.writer(raw, compression) as file:
+                    # Only the dirty instances are kept, like in a stream
+                    saved = []
+                    dirty = Base._trackers.get(cls.__name__)
+                    if dirty and list_objs is not None:
+                        list_objs = _collect(list_objs, dirty, saved)
+                    cls.write_json(list_objs, file)
+            cls._snapshot_saved(saved)
+            return
+        if file_format == "binary":
+            filename = cls.__name__ + binary_format.EXTENSION
+            binary_format.save_binary(
+                filename, cls.__name__, list_objs,
+                cls.__name__ + binary_format.INDEX_EXTENSION,
+                durability=durability)
+            return
+        if file_format != "json":
+            raise ValueError("Unknown file format: {}".format(file_format))
+
         # Generate filename based on class name
         filename = cls.__name__ + ".json"
 
-        # Open file for writing (overwrites if exists)
-        with open(filename, "w") as file:
+        # Write a temporary file, then rename it over the old one
+        with atomic_write(filename, "w", durability) as file:
             if list_objs is None:
                 # If list_objs is None, save empty list
                 file.write("[]")
@@ -227,3 +716,612 @@ class Base:
                 list_dictionaries = [obj.to_dictionary() for obj in list_objs]
                 json_string = cls.to_json_string(list_dictionaries)
                 file.write(json_string)
+        cls._snapshot_saved(list_objs if list_objs is not None else ())
+
+    @classmethod
+    def get_from_file(cls, id):
+        """
+        Returns the instance with the given id from the binary file.
+
+        Only the index slots and the record of that id are read from
+        <Class name>.idx and <Class name>.bin (both memory-mapped), so the
+        cost does not depend on the number of saved instances.
+
+        Args:
+            id (int): Id of the instance
+
+        Returns:
+            Instance of the calling class, or None if there is no binary
+            file or no instance with that id
+
+        Raises:
+            ValueError: If the index doesn't match the binary file (see
+                        binary_format.find_record())
+
+        Example:
+            Rectangle.save_to_file(rects, "binary")
+            rect = Rectangle.get_from_file(12)
+        """
+        import os
+        from models import binary_format
+
+        filename = cls.__name__ + binary_format.EXTENSION
+        index_filename = cls.__name__ + binary_format.INDEX_EXTENSION
+        if not (os.path.exists(filename) and os.path.exists(index_filename)):
+            return None
+
+        dictionary = binary_format.find_record(filename, index_filename, id)
+        if dictionary is None:
+            return None
+        return cls.create_many([dictionary])[0]
+
+    # ========================================================================
+    # Storage backends
+    # ========================================================================
+
+    @staticmethod
+    def set_storage(storage):
+        """
+        Sets the storage backend used by save() and load().
+
+        Args:
+            storage: A backend from models.storage, e.g.
+                     SQLiteStorage("shapes.db"), or None to go back to
+                     the default JSONFileStorage
+        """
+        Base.__storage = storage
+
+    @staticmethod
+    def _storage():
+        """
+        Returns the storage backend used by save() and load().
+
+        The default JSONFileStorage is only created, and models.storage
+        only imported, on first use.
+
+        Returns:
+            The backend set with set_storage(), or a JSONFileStorage
+        """
+        if Base.__storage is None:
+            from models.storage import JSONFileStorage
+
+            Base.__storage = JSONFileStorage()
+        return Base.__storage
+
+    @classmethod
+    def save(cls, list_objs):
+        """
+        Saves list_objs with the current storage backend.
+
+        With the default backend this is the same as save_to_file().
+
+        Args:
+            list_objs (list): Instances to save, or None
+        """
+        Base._storage().save(cls, list_objs)
+
+    @classmethod
+    def load(cls, where=None):
+        """
+        Loads instances with the current storage backend.
+
+        Args:
+            where (iterable, optional): (field, operator, value) filters.
+                                        The SQLite backend runs them as
+                                        SQL, the JSON backend in Python.
+
+        Returns:
+            list: List of instances of the calling class
+
+        Example:
+            Base.set_storage(SQLiteStorage("shapes.db"))
+            Rectangle.save(rects)
+            wide = Rectangle.load([("width", ">", 100)])
+        """
+        return Base._storage().load(cls, where)
+
+    @classmethod
+    def save_to_file_stream(cls, iterable):
+        """
+        Writes the JSON representation of the objects of iterable to a file,
+        one object at a time.
+
+        Unlike save_to_file(), no list of dictionaries and no full JSON
+        string is ever built: each object is converted and written as soon
+        as it is produced, so iterable can be a generator over more shapes
+        than would fit in memory. The file content is exactly the same as
+        the one written by save_to_file(), so load_from_file() can read it,
+        and it is replaced atomically in the same way. Like a JSON
+        save_to_file(), it removes the log and clears the dirty marks of
+        the saved instances.
+
+        Args:
+            iterable (iterable): Instances that inherit from Base.
+                                 If None, saves an empty list
+
+        File format:
+            The filename will be: <Class name>.json
+
+        Examples:
+            Rectangle.save_to_file_stream(rect for rect in rectangles)
+        """
+        filename = cls.__name__ + ".json"
+
+        # Only the dirty instances are kept, the iterable may be huge
+        saved = []
+        dirty = Base._trackers.get(cls.__name__)
+        if dirty and iterable is not None:
+            iterable = _collect(iterable, dirty, saved)
+
+        with atomic_write(filename, "w", Base.__durability) as file:
+            cls.write_json(iterable, file)
+        cls._snapshot_saved(saved)
+
+    @classmethod
+    def iter_from_file(cls, chunk_size=65536, compression=None):
+        """
+        Yields instances loaded from a JSON file, one at a time.
+
+        The file is read in chunks of chunk_size characters and each
+        dictionary of the JSON list is decoded and turned into an instance
+        as soon as it is complete, so peak memory does not depend on the
+        size of the file. Reads files written by save_to_file() as well as
+        save_to_file_stream(). Compressed files are found and decompressed
+        as in load_from_file().
+
+        Args:
+            chunk_size (int, optional): Number of characters read at a time.
+                                        Defaults to 65536.
+            compression (str, optional): "gzip", "bz2" or "lzma".
+                                         Defaults to None (from the
+                                         extension).
+
+        Yields:
+            Instance of the calling class for each dictionary of the file.
+            Nothing if the file doesn't exist or is empty.
+
+        Raises:
+            ValueError: If the file is not a JSON list
+
+        Examples:
+            for rect in Rectangle.iter_from_file():
+                print(rect)
+        """
+        from models import compressed
+
+        filename, compression = compressed.find(cls.__name__ + ".json",
+                                                compression)
+        if filename is None:
+            return
+
+        with compressed.open_text(filename, compression) as file:
+            for dictionary in _iter_json_list(file, chunk_size):
+                obj = cls.create_many((dictionary,))[0]
+                cls._forget_dirty((obj,))
+                yield obj
+
+    # ========================================================================
+    # Asyncio persistence
+    # ========================================================================
+
+    @classmethod
+    async def asave_to_file(cls, list_objs, chunk_size=4096, durability=None):
+        """
+        Coroutine version of save_to_file().
+
+        Encoding and file I/O run in a worker thread, chunk_size
+        instances at a time, so the event loop keeps serving other tasks
+        (see models.aio). The file content is the same as with
+        save_to_file(), and a cancelled save leaves the old file intact.
+
+        Args:
+            list_objs (iterable): Instances that inherit from Base, or None
+            chunk_size (int, optional): Instances encoded per step.
+                                        Defaults to 4096.
+            durability (str, optional): "none", "close" or "periodic".
+                                        Defaults to the policy set with
+                                        set_durability() ("close").
+
+        Examples:
+            await Rectangle.asave_to_file([rect1, rect2])
+        """
+        from models import aio
+
+        if durability is None:
+            durability = Base.__durability
+        await aio.save_to_file(cls, list_objs, chunk_size, durability)
+
+    @classmethod
+    async def aload_from_file(cls, chunk_size=4096):
+        """
+        Coroutine version of load_from_file().
+
+        The file is read and decoded in a worker thread, chunk_size
+        instances at a time (see models.aio).
+
+        Args:
+            chunk_size (int, optional): Instances built per step.
+                                        Defaults to 4096.
+
+        Returns:
+            list: List of instances of the calling class. If the file doesn't
+                  exist, returns an empty list.
+
+        Examples:
+            rectangles = await Rectangle.aload_from_file()
+        """
+        from models import aio
+
+        return await aio.load_from_file(cls, chunk_size)
+
+    @classmethod
+    def aiter_from_file(cls, chunk_size=4096):
+        """
+        Asynchronous iterator version of iter_from_file().
+
+        Args:
+            chunk_size (int, optional): Instances built per step in the
+                                        worker thread. Defaults to 4096.
+
+        Returns:
+            async iterator: Instances of the calling class, in file order
+
+        Examples:
+            async for rect in Rectangle.aiter_from_file():
+                print(rect)
+        """
+        from models import aio
+
+        return aio.iter_from_file(cls, chunk_size)
+
+    # ========================================================================
+    # Polymorphic persistence
+    # ========================================================================
+
+    @classmethod
+    def save_tagged(cls, list_objs, durability=None):
+        """
+        Writes instances of any subclasses to one JSON file.
+
+        Each record is the JSON representation of the instance with a
+        "type" key first, holding the type tag of its class (the class
+        name, see _registry). A mixed list of Rectangle and Square
+        instances is saved with a single sequential write, and rebuilt
+        with load_tagged(). The file is replaced atomically, like in
+        save_to_file().
+
+        Args:
+            list_objs (iterable): Instances that inherit from the calling
+                                  class, or None
+            durability (str, optional): "none", "close" or "periodic".
+                                        Defaults to the policy set with
+                                        set_durability() ("close").
+
+        File format:
+            The filename will be: <Class name>.mixed.json
+            Example: [{"type": "Square", "id": 1, "size": 2, ...}, ...]
+
+        Examples:
+            Base.save_tagged([rect, square])  # Creates Base.mixed.json
+        """
+        if durability is None:
+            durability = Base.__durability
+        filename = cls.__name__ + ".mixed.json"
+
+        with atomic_write(filename, "w", durability) as file:
+            file.write("[")
+            if list_objs is not None:
+                separator = ""
+                for obj in list_objs:
+                    file.write('{}{{"type": {}, {}'.format(
+                        separator, json.dumps(obj._tag),
+                        obj.to_json_record()[1:]))
+                    separator = ", "
+            file.write("]")
+
+    @classmethod
+    def load_tagged(cls):
+        """
+        Returns the instances saved by save_tagged(), each of its own class.
+
+        The file is read in one streaming pass. The class of each record
+        is looked up by its type tag in _registry; consecutive records of
+        the same class are built together with that class' create_many().
+
+        Returns:
+            list: Instances in saved order. If the file doesn't exist,
+                  returns an empty list.
+
+        Raises:
+            ValueError: If a record has no type tag, an unknown one, or one
+                        of a class that doesn't inherit from the calling
+                        class
+        """
+        import os
+        from itertools import groupby
+
+        filename = cls.__name__ + ".mixed.json"
+        if not os.path.exists(filename):
+            return []
+
+        instances = []
+        with open(filename, "r") as file:
+            for tag, records in groupby(_iter_json_list(file, 65536),
+                                        key=_pop_tag):
+                subclass = Base._registry.get(tag)
+                if subclass is None or not issubclass(subclass, cls):
+                    raise ValueError("Unknown type for {}: {}".format(
+                        cls.__name__, tag))
+                batch = subclass.create_many(records)
+                subclass._forget_dirty(batch)
+                instances.extend(batch)
+        return instances
+
+    # ========================================================================
+    # Append-only log persistence
+    # ========================================================================
+
+    @classmethod
+    def _append_to_log(cls, record):
+        """
+        Appends one record as a JSON line to the log file of the class.
+
+        Args:
+            record (dict): Record to append
+        """
+        filename = cls.__name__ + ".jsonl"
+
+        with open(filename, "a") as file:
+            file.write(json.dumps(record) + "\n")
+
+    @classmethod
+    def log_create(cls, obj):
+        """
+        Records the creation of obj in the log file.
+
+        Only one line is appended to <Class name>.jsonl, whatever the
+        number of objects already saved.
+
+        Args:
+            obj (Base): Instance to record
+
+        Examples:
+            rect = Rectangle(2, 3)
+            Rectangle.log_create(rect)
+        """
+        cls._append_to_log({"op": "create", "data": obj.to_dictionary()})
+
+    @classmethod
+    def log_update(cls, obj, *args, **kwargs):
+        """
+        Calls obj.update() and records the result in the log file.
+
+        The record stores the id obj had before the update and its full
+        dictionary after it, so replaying it twice is harmless and an id
+        change is replayed correctly.
+
+        Args:
+            obj (Base): Instance to update
+            *args: Passed to obj.update()
+            **kwargs: Passed to obj.update()
+
+        Examples:
+            Rectangle.log_update(rect, width=10)
+        """
+        old_id = obj.id
+        obj.update(*args, **kwargs)
+        cls._append_to_log({"op": "update", "id": old_id,
+                            "data": obj.to_dictionary()})
+
+    @classmethod
+    def log_delete(cls, obj):
+        """
+        Records the deletion of obj in the log file.
+
+        Args:
+            obj (Base): Instance to delete
+
+        Examples:
+            Rectangle.log_delete(rect)
+        """
+        cls._append_to_log({"op": "delete", "id": obj.id})
+
+    @classmethod
+    def load_from_log(cls, compression=None):
+        """
+        Returns a list of instances rebuilt from the snapshot and the log.
+
+        The snapshot (the JSON file written by save_to_file() or compact())
+        is read first, then every record of <Class name>.jsonl is replayed
+        on top of it in order. A last line cut by a crash in the middle of
+        a write is ignored and removed from the log.
+
+        The snapshot is found as in load_from_file(): after a compressed
+        save, pass its codec when <Class name>.json exists too.
+
+        Args:
+            compression (str, optional): "gzip", "bz2" or "lzma".
+                                         Defaults to None (from the
+                                         extension).
+
+        Returns:
+            list: List of instances of the calling class
+
+        Raises:
+            ValueError: If a line other than the last one is invalid, or
+                        if the snapshot can't be found (see
+                        models.compressed.find())
+        """
+        import os
+        from models import compressed
+
+        dictionaries = {}
+
+        filename, compression = compressed.find(cls.__name__ + ".json",
+                                                compression)
+        if filename is not None:
+            with compressed.open_text(filename, compression) as file:
+                for dictionary in _iter_json_list(file, 65536):
+                    dictionaries[dictionary["id"]] = dictionary
+
+        filename = cls.__name__ + ".jsonl"
+        if os.path.exists(filename):
+            valid_size = 0
+            torn = False
+            with open(filename, "r") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Only a torn last write is tolerated
+                        if line.endswith("\n"):
+                            raise ValueError("Invalid log record in {}"
+                                             .format(filename))
+                        torn = True
+                        break
+                    valid_size += len(line.encode("utf-8"))
+                    if record["op"] == "create":
+                        data = record["data"]
+                        dictionaries[data["id"]] = data
+                    elif record["op"] == "update":
+                        data = record["data"]
+                        if record["id"] != data["id"]:
+                            dictionaries.pop(record["id"], None)
+                        dictionaries[data["id"]] = data
+                    elif record["op"] == "delete":
+                        dictionaries.pop(record["id"], None)
+            if torn:
+                # Drop the torn line so the next append starts cleanly
+                os.truncate(filename, valid_size)
+
+        instances = cls.create_many(dictionaries.values())
+        cls._forget_dirty(instances)
+        return instances
+
+    @classmethod
+    def compact(cls, compression=None):
+        """
+        Rewrites the snapshot from the log and empties the log.
+
+        The snapshot is rewritten with the codec it was read with (see
+        load_from_log()). It is fully written before the log is removed,
+        so a crash in between only means the same records are replayed
+        again by the next load_from_log().
+
+        Args:
+            compression (str, optional): "gzip", "bz2" or "lzma".
+                                         Defaults to None (from the
+                                         extension).
+
+        Returns:
+            list: List of instances of the calling class, as saved
+        """
+        from models import compressed
+
+        if compression is None:
+            _, compression = compressed.find(cls.__name__ + ".json")
+        instances = cls.load_from_log(compression)
+        if compression is None:
+            cls.save_to_file_stream(instances)
+        else:
+            cls.save_to_file(instances, compression=compression)
+        return instances
+
+
+def _collect(iterable, dirty, saved):
+    """
+    Yields the objects of iterable, appending the dirty ones to saved.
+
+    Args:
+        iterable (iterable): Objects being saved
+        dirty (dict): Dirty set of their class
+        saved (list): List receiving the dirty objects
+
+    Yields:
+        Each object of iterable
+    """
+    for obj in iterable:
+        if obj in dirty:
+            saved.append(obj)
+        yield obj
+
+
+def _pop_tag(record):
+    """
+    Removes and returns the type tag of a record written by save_tagged().
+
+    Args:
+        record (dict): Decoded record
+
+    Returns:
+        str: The type tag
+
+    Raises:
+        ValueError: If the record has no type tag
+    """
+    try:
+        return record.pop("type")
+    except (KeyError, AttributeError):
+        raise ValueError("Record without type tag: {}".format(record))
+
+
+def _iter_json_list(file, chunk_size):
+    """
+    Yields the items of the JSON list stored in file, one at a time.
+
+    Args:
+        file (file): Text file opened for reading
+        chunk_size (int): Number of characters read at a time
+
+    Yields:
+        Each decoded item of the list
+
+    Raises:
+        ValueError: If the content is not a JSON list
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and separators, reading more data when needed
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                if started:
+                    raise ValueError("Unterminated JSON list")
+                return
+            buffer = file.read(chunk_size)
+            pos = 0
+            eof = buffer == ""
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Expecting a JSON list")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            end = None
+        if end is None or (end == len(buffer) and not eof):
+            # The item may continue in the next chunk
+            if eof:
+                raise ValueError("Invalid JSON list item")
+            chunk = file.read(chunk_size)
+            eof = chunk == ""
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        yield item
+        pos = end
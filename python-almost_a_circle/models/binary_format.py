@@ -0,0 +1,276 @@
+#!/usr/bin/python3
+"""
+Binary format module.
+Contains the functions reading and writing the compact binary shape
+files used by Base.save_to_file() and Base.load_from_file() when
+file_format="binary".
+
+File layout:
+    - 4 bytes: magic b"SHPB"
+    - 4 bytes: header length n (unsigned little-endian)
+    - n bytes: JSON header {"class": <name>, "fields": [<names>],
+               "format": <struct format of one record>, "count": <records>}
+    - padding up to a multiple of 8 bytes
+    - count fixed-width records, one signed 64 bits little-endian integer
+      per field, in the order of "fields"
+
+Each data file can have a sidecar index file mapping ids to record
+numbers, so one record can be found without reading the others:
+    - 4 bytes: magic b"SHPI"
+    - 4 bytes: zero padding
+    - 8 bytes: number of slots (a power of two)
+    - one (id, record number + 1) pair of signed 64 bits integers per
+      slot; record number + 1 is 0 for an empty slot. The slot of an id
+      is found by multiplicative hashing and linear probing.
+"""
+from array import array
+import json
+import mmap
+import struct
+import sys
+
+from models.durable import atomic_write
+
+MAGIC = b"SHPB"
+INDEX_MAGIC = b"SHPI"
+EXTENSION = ".bin"
+INDEX_EXTENSION = ".idx"
+_PREFIX = struct.Struct("<4sI")
+_INDEX_PREFIX = struct.Struct("<4s4xQ")
+_SLOT = struct.Struct("<qq")
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def _header_size(header):
+    """
+    Returns the offset of the first record for a given JSON header.
+
+    Args:
+        header (bytes): Encoded JSON header
+
+    Returns:
+        int: Size of magic, length, header and padding
+    """
+    size = _PREFIX.size + len(header)
+    return size + (-size) % 8
+
+
+def save_binary(filename, class_name, list_objs, index_filename=None,
+                chunk_size=4096, durability="close"):
+    """
+    Writes list_objs to filename in the binary format.
+
+    The fields are the keys of the first object's to_dictionary(). The
+    records are packed chunk_size at a time, so only one chunk of
+    encoded records is in memory at once.
+
+    Args:
+        filename (str): Path of the file to write
+        class_name (str): Class name stored in the header
+        list_objs (list): Instances to save, or None for no instance
+        index_filename (str, optional): If given, path of the sidecar
+                                        index written with save_index()
+        chunk_size (int, optional): Records packed per write.
+                                    Defaults to 4096.
+        durability (str, optional): Policy of models.durable used to
+                                    replace both files atomically.
+                                    Defaults to "close".
+
+    Raises:
+        ValueError: If a value is not an integer fitting in 64 bits
+    """
+    list_objs = list(list_objs) if list_objs is not None else []
+    fields = list(list_objs[0].to_dictionary()) if list_objs else []
+    record = struct.Struct("<{}q".format(len(fields)))
+    header = json.dumps({"class": class_name, "fields": fields,
+                         "format": record.format, "count": len(list_objs)})
+    header = header.encode("utf-8")
+    padding = _header_size(header) - _PREFIX.size - len(header)
+
+    pack = record.pack
+    with atomic_write(filename, "wb", durability) as file:
+        file.write(_PREFIX.pack(MAGIC, len(header)) + header + b"\0" * padding)
+        for start in range(0, len(list_objs), chunk_size):
+            chunk = []
+            for obj in list_objs[start:start + chunk_size]:
+                dictionary = obj.to_dictionary()
+                try:
+                    chunk.append(pack(*[dictionary[key] for key in fields]))
+                except (struct.error, KeyError) as error:
+                    raise ValueError("cannot store {} in binary format: {}"
+                                     .format(obj, error))
+            file.write(b"".join(chunk))
+
+    if index_filename is not None:
+        save_index(index_filename, [obj.id for obj in list_objs],
+                   durability)
+
+
+def read_header(buffer):
+    """
+    Decodes the header of a binary shape file.
+
+    Args:
+        buffer (bytes-like): Content of the file, or at least its beginning
+
+    Returns:
+        tuple: (header dict, offset of the first record)
+
+    Raises:
+        ValueError: If the buffer does not start with a valid header
+    """
+    if len(buffer) < _PREFIX.size:
+        raise ValueError("Not a binary shape file")
+    magic, length = _PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary shape file")
+    header = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + length]))
+    return header, _header_size(b"\0" * length)
+
+
+def load_binary(filename):
+    """
+    Returns the records of a binary shape file as dictionaries.
+
+    The file is memory-mapped and the records are unpacked with
+    struct.iter_unpack directly from the mapping: there is no text
+    parsing at all.
+
+    Args:
+        filename (str): Path of the file to read
+
+    Returns:
+        tuple: (class name, list of dictionaries)
+
+    Raises:
+        ValueError: If the file is not a valid binary shape file
+    """
+    with open(filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header, offset = read_header(data)
+            fields = header["fields"]
+            end = offset + header["count"] * struct.calcsize(header["format"])
+            if end > len(data):
+                raise ValueError("Truncated binary shape file")
+            if not fields:
+                return header["class"], []
+            view = memoryview(data)[offset:end]
+            try:
+                dictionaries = [dict(zip(fields, values)) for values
+                                in struct.iter_unpack(header["format"], view)]
+            finally:
+                view.release()
+    return header["class"], dictionaries
+
+
+def _slot(id, bits):
+    """
+    Returns the first slot to probe for id in a table of 2 ** bits slots.
+
+    Args:
+        id (int): Id to look for
+        bits (int): Number of bits of the slot number
+
+    Returns:
+        int: Slot number
+    """
+    return ((id * _HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+
+
+def save_index(filename, ids, durability="close"):
+    """
+    Writes the sidecar index mapping each id to its record number.
+
+    The table has at least twice as many slots as ids, so a lookup
+    probes about two slots on average. When an id appears several times,
+    the first record wins.
+
+    Args:
+        filename (str): Path of the index file to write
+        ids (list): Id of each record, in record order
+        durability (str, optional): Policy of models.durable used to
+                                    replace the file atomically.
+                                    Defaults to "close".
+    """
+    bits = 3
+    while (1 << bits) < 2 * len(ids):
+        bits += 1
+    mask = (1 << bits) - 1
+    table = array("q", bytes(_SLOT.size << bits))
+
+    for record, id in enumerate(ids):
+        slot = _slot(id, bits)
+        while table[2 * slot + 1]:
+            if table[2 * slot] == id:
+                break
+            slot = (slot + 1) & mask
+        else:
+            table[2 * slot] = id
+            table[2 * slot + 1] = record + 1
+
+    if sys.byteorder != "little":
+        table.byteswap()
+    with atomic_write(filename, "wb", durability) as file:
+        file.write(_INDEX_PREFIX.pack(INDEX_MAGIC, 1 << bits))
+        table.tofile(file)
+
+
+def find_record(filename, index_filename, id):
+    """
+    Returns the record with the given id, reading only what it needs.
+
+    Both files are memory-mapped: the index slots on the probe path and
+    the one record are the only pages touched, whatever the file size.
+
+    save_binary() replaces the data file and the index one after the
+    other, so after a crash in between, or while another process saves,
+    the index may not match the data file. The record found is checked
+    against the data file (in bounds and with the requested id), so a
+    mismatch raises ValueError instead of returning another shape.
+
+    Args:
+        filename (str): Path of the data file
+        index_filename (str): Path of its sidecar index
+        id (int): Id of the record
+
+    Returns:
+        dict: The record as a dictionary, or None if id is not in the index
+
+    Raises:
+        ValueError: If a file is not valid, or if the index doesn't match
+                    the data file
+    """
+    with open(index_filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            if len(index) < _INDEX_PREFIX.size:
+                raise ValueError("Not a binary shape index")
+            magic, slots = _INDEX_PREFIX.unpack_from(index, 0)
+            if (magic != INDEX_MAGIC or slots & (slots - 1)
+                    or len(index) < _INDEX_PREFIX.size + slots * _SLOT.size):
+                raise ValueError("Not a binary shape index")
+            bits = slots.bit_length() - 1
+            slot = _slot(id, bits)
+            # A valid index always has empty slots: bound the probe anyway
+            for _ in range(slots):
+                key, record = _SLOT.unpack_from(
+                    index, _INDEX_PREFIX.size + slot * _SLOT.size)
+                if not record:
+                    return None
+                if key == id:
+                    break
+                slot = (slot + 1) & (slots - 1)
+            else:
+                return None
+
+    with open(filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header, offset = read_header(data)
+            size = struct.calcsize(header["format"])
+            start = offset + (record - 1) * size
+            if record > header["count"] or start + size > len(data):
+                raise ValueError("Index does not match {}".format(filename))
+            values = struct.unpack_from(header["format"], data, start)
+    fields = header["fields"]
+    if "id" not in fields or values[fields.index("id")] != id:
+        raise ValueError("Index does not match {}".format(filename))
+    return dict(zip(fields, values))
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Canvas module.
+Contains functions drawing many Rectangle and Square instances onto one
+shared canvas.
+"""
+import sys
+
+
+def render_shapes(shapes):
+    """
+    Returns the text of all shapes drawn with '#' on one shared canvas.
+
+    The canvas is a single buffer as large as the union of the shapes,
+    starting at (0, 0). Each row of each shape is filled with one slice
+    assignment, so drawing does not depend on print() or on building
+    one string per row. Trailing spaces are removed from every line.
+
+    Args:
+        shapes (iterable): Rectangle or Square instances
+
+    Returns:
+        str: The canvas, one line per row ending with a new line.
+             Empty string if there are no shapes.
+
+    Example:
+        render_shapes([Rectangle(2, 1), Rectangle(1, 2, 3, 1)])
+        # Returns: "##\\n   #\\n   #\\n"
+    """
+    shapes = list(shapes)
+    if not shapes:
+        return ""
+
+    columns = max(shape.x + shape.width for shape in shapes)
+    rows = max(shape.y + shape.height for shape in shapes)
+    line = columns + 1
+
+    canvas = bytearray(b" " * columns + b"\n") * rows
+    for shape in shapes:
+        fill = b"#" * shape.width
+        start = shape.y * line + shape.x
+        for row in range(shape.height):
+            offset = start + row * line
+            canvas[offset:offset + shape.width] = fill
+
+    return "".join(
+        text.rstrip(" ") + "\n"
+        for text in canvas.decode("ascii").split("\n")[:-1]
+    )
+
+
+def display_shapes(shapes, file=None):
+    """
+    Writes all shapes drawn with '#' on one shared canvas to a stream.
+
+    Args:
+        shapes (iterable): Rectangle or Square instances
+        file (file, optional): Text stream to write to.
+                               Defaults to sys.stdout.
+    """
+    if file is None:
+        file = sys.stdout
+    file.write(render_shapes(shapes))
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Collision module.
+Contains a sort-and-sweep engine finding all pairs of overlapping shapes
+and all pairs where one shape contains another, for lists of Rectangle
+and Square instances or for columnar data such as a ShapeStore.
+"""
+from bisect import bisect_left, insort
+import heapq
+
+from models.shape_store import ShapeStore
+
+
+def collide_columns(xs, ys, widths, heights):
+    """
+    Returns overlapping and containing pairs of shapes given as columns.
+
+    A shape covers [x, x + width) x [y, y + height), so shapes that only
+    share an edge do not overlap. A shape contains another when the
+    second one lies entirely inside the first (identical shapes contain
+    each other).
+
+    Shapes are swept in x order. The shapes still crossing the sweep
+    line are kept sorted by y, so each new shape is only compared with
+    the active shapes whose y range can reach it (found by bisection
+    using the tallest shape). With shapes of similar sizes this is
+    O(n log n + k) for k pairs.
+
+    Args:
+        xs (sequence): X coordinates
+        ys (sequence): Y coordinates
+        widths (sequence): Widths, all > 0
+        heights (sequence): Heights, all > 0
+
+    Returns:
+        tuple: (overlapping, containing) where overlapping is a sorted
+               list of (i, j) index pairs with i < j, and containing a
+               sorted list of (outer, inner) index pairs
+    """
+    count = len(xs)
+    if count < 2:
+        return [], []
+    x_ends = [x + width for x, width in zip(xs, widths)]
+    y_ends = [y + height for y, height in zip(ys, heights)]
+    tallest = max(heights)
+
+    overlapping = []
+    containing = []
+    active = []
+    expiry = []
+    for i in sorted(range(count), key=xs.__getitem__):
+        x0 = xs[i]
+        y0 = ys[i]
+        x1 = x_ends[i]
+        y1 = y_ends[i]
+
+        # Drop the shapes that end before the sweep line
+        while expiry and expiry[0][0] <= x0:
+            _, j = heapq.heappop(expiry)
+            del active[bisect_left(active, (ys[j], j))]
+
+        # Active shapes overlap i on x; check y on those that can reach it
+        low = bisect_left(active, (y0 - tallest, -1))
+        high = bisect_left(active, (y1, -1))
+        for _, j in active[low:high]:
+            if y_ends[j] <= y0:
+                continue
+            overlapping.append((j, i) if j < i else (i, j))
+            if (xs[j] <= x0 and x1 <= x_ends[j]
+                    and ys[j] <= y0 and y1 <= y_ends[j]):
+                containing.append((j, i))
+            if (x0 <= xs[j] and x_ends[j] <= x1
+                    and y0 <= ys[j] and y_ends[j] <= y1):
+                containing.append((i, j))
+
+        insort(active, (y0, i))
+        heapq.heappush(expiry, (x1, i))
+
+    overlapping.sort()
+    containing.sort()
+    return overlapping, containing
+
+
+def collide(shapes):
+    """
+    Returns overlapping and containing pairs among Rectangle and Square
+    instances.
+
+    A ShapeStore is read directly from its columns and the pairs hold
+    views on its shapes.
+
+    Args:
+        shapes (iterable): Rectangle or Square instances, or a ShapeStore
+
+    Returns:
+        tuple: (overlapping, containing) where overlapping is a list of
+               (shape, other) pairs in input order and containing a list
+               of (outer, inner) pairs
+
+    Example:
+        overlapping, containing = collide(Rectangle.load_from_file())
+    """
+    if isinstance(shapes, ShapeStore):
+        overlapping, containing = collide_columns(
+            shapes._xs, shapes._ys, shapes._widths, shapes._heights)
+    else:
+        shapes = list(shapes)
+        overlapping, containing = collide_columns(
+            [shape.x for shape in shapes], [shape.y for shape in shapes],
+            [shape.width for shape in shapes],
+            [shape.height for shape in shapes])
+    return ([(shapes[i], shapes[j]) for i, j in overlapping],
+            [(shapes[i], shapes[j]) for i, j in containing])
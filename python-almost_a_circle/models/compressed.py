@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+"""
+Compressed module.
+Contains the helpers reading and writing compressed JSON shape files for
+Base.save_to_file(), Base.load_from_file() and Base.iter_from_file().
+
+Codecs, all from the standard library, and their file extensions:
+    - "gzip": .json.gz
+    - "bz2": .json.bz2
+    - "lzma": .json.xz
+
+Text goes through the compressor as it is written and comes out of the
+decompressor as it is read, so the uncompressed JSON text is never held
+in memory as a whole.
+
+gzip uses level 6 (as the gzip command does) rather than the module
+default of 9, which is much slower for very little gain on shape files.
+
+Each codec module is imported on first use, so importing this module
+stays cheap and works on a Python built without some of them.
+"""
+from contextlib import contextmanager
+import importlib
+import io
+import os
+
+CODECS = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "lzma": ".xz",
+}
+
+
+def check_codec(codec):
+    """
+    Validates a codec name.
+
+    Args:
+        codec (str): Codec name
+
+    Returns:
+        str: The codec name
+
+    Raises:
+        ValueError: If the codec is unknown
+    """
+    if codec not in CODECS:
+        raise ValueError("Unknown compression: {}".format(codec))
+    return codec
+
+
+def codec_of(filename):
+    """
+    Returns the codec matching the extension of filename.
+
+    Args:
+        filename (str): File name
+
+    Returns:
+        str: Codec name, or None for an uncompressed file
+    """
+    for codec, extension in CODECS.items():
+        if filename.endswith(extension):
+            return codec
+    return None
+
+
+def variants(filename):
+    """
+    Returns the paths a shape file can be saved under.
+
+    Args:
+        filename (str): Name of the uncompressed file, e.g. Square.json
+
+    Returns:
+        list: filename, then filename with each codec extension
+    """
+    return [filename] + [filename + extension
+                         for extension in CODECS.values()]
+
+
+def find(filename, compression=None):
+    """
+    Returns the saved file for filename and its codec.
+
+    Saves never remove the other variants of a file, so several of them
+    can exist. With a codec, only that variant is looked for. Without
+    one, filename itself is preferred, then the only compressed variant
+    that exists; rather than guess which of several compressed variants
+    is current, the caller has to name the codec.
+
+    Args:
+        filename (str): Name of the uncompressed file, e.g. Square.json
+        compression (str, optional): "gzip", "bz2" or "lzma".
+                                     Defaults to None (from the
+                                     extension).
+
+    Returns:
+        tuple: (path, codec), codec being None for filename itself, or
+               (None, None) if no file exists
+
+    Raises:
+        ValueError: If the codec is unknown, or if compression is None,
+                    filename doesn't exist and several compressed
+                    variants do
+    """
+    if compression is not None:
+        path = filename + CODECS[check_codec(compression)]
+        if not os.path.exists(path):
+            return None, None
+        return path, compression
+    if os.path.exists(filename):
+        return filename, None
+    existing = [path for path in variants(filename)[1:]
+                if os.path.exists(path)]
+    if not existing:
+        return None, None
+    if len(existing) > 1:
+        raise ValueError("Several saved variants: {}; pass compression="
+                         .format(", ".join(existing)))
+    return existing[0], codec_of(existing[0])
+
+
+@contextmanager
+def writer(file, codec):
+    """
+    Context manager compressing text written to a binary stream.
+
+    The compressor is closed at the end of the with block, which writes
+    its trailer; file itself is left open.
+
+    Args:
+        file (file): Binary stream receiving the compressed data
+        codec (str): "gzip", "bz2" or "lzma"
+
+    Yields:
+        io.TextIOWrapper: UTF-8 text stream to write to
+
+    Raises:
+        ValueError: If the codec is unknown
+        ImportError: If Python was built without the codec module
+    """
+    # Codec names are also the names of their modules
+    module = importlib.import_module(check_codec(codec))
+    if codec == "gzip":
+        compressor = module.GzipFile(filename="", mode="wb", fileobj=file,
+                                     compresslevel=6, mtime=0)
+    elif codec == "bz2":
+        compressor = module.BZ2File(file, "wb")
+    else:
+        compressor = module.LZMAFile(file, "wb")
+    with io.TextIOWrapper(compressor, encoding="utf-8") as text:
+        yield text
+
+
+def open_text(filename, codec):
+    """
+    Opens a plain or compressed file for reading as text.
+
+    Args:
+        filename (str): Path of the file
+        codec (str): "gzip", "bz2" or "lzma", or None for a plain file
+
+    Returns:
+        file: UTF-8 text stream of the decompressed content
+
+    Raises:
+        ValueError: If the codec is unknown
+        ImportError: If Python was built without the codec module
+    """
+    if codec is None:
+        return open(filename, "r")
+    module = importlib.import_module(check_codec(codec))
+    return module.open(filename, "rt", encoding="utf-8")
@@ -0,0 +1,397 @@
+#!/usr/bin/python3
+"""
+Diff module.
+Contains a streaming diff and merge engine for shape files: it finds the
+shapes added, removed and modified (by id) between two files, writes
+them as a compact patch, applies a patch to a file, and merges two
+files, without loading any file as a whole.
+
+Every file is read as a stream of records sorted by id. A file that is
+already sorted (as written by apply_patch() or merge_files()) is read
+directly; otherwise it is sorted externally: runs of run_size records
+are sorted in memory and spilled to temporary files, then merged. When
+an id appears several times in a file, its last record wins. Shape
+files can be plain or compressed JSON (see models.compressed).
+
+A patch is a JSON lines file, sorted by id, with one operation per line:
+    {"op": "add", "data": {...}}                 new (or replaced) record
+    {"op": "remove", "id": <id>}                 removed record
+    {"op": "modify", "id": <id>, "changes": {...}}  changed fields only
+
+Example:
+    diff_files("old/Square.json", "Square.json", "Square.patch")
+    apply_patch("old/Square.json", "Square.patch")
+"""
+import heapq
+import json
+import os
+import tempfile
+
+from models import compressed
+from models.base import _iter_json_list
+from models.durable import atomic_write
+
+
+def _open_shapes(filename):
+    """
+    Opens a plain or compressed shape file for reading as text.
+
+    Args:
+        filename (str): Path of the file
+
+    Returns:
+        file: Text stream of the JSON content
+    """
+    codec = compressed.codec_of(filename)
+    if codec is None:
+        return open(filename, "r")
+    return compressed.open_text(filename, codec)
+
+
+def _read_records(filename):
+    """
+    Yields the records of a shape file in file order.
+
+    Args:
+        filename (str): Path of the file. A missing file has no record.
+
+    Yields:
+        dict: Each record
+    """
+    if not os.path.exists(filename):
+        return
+    with _open_shapes(filename) as file:
+        yield from _iter_json_list(file, 65536)
+
+
+def _is_sorted(filename):
+    """
+    Tells whether the ids of a shape file are strictly increasing.
+
+    Args:
+        filename (str): Path of the file
+
+    Returns:
+        bool: True if the file can be merged without sorting
+    """
+    previous = None
+    for record in _read_records(filename):
+        if previous is not None and record["id"] <= previous:
+            return False
+        previous = record["id"]
+    return True
+
+
+def _spill(records):
+    """
+    Sorts records by id and writes them to a temporary file.
+
+    Args:
+        records (list): Records of one run, in file order
+
+    Returns:
+        file: Temporary file holding one JSON record per line, sorted by
+              id (stable, so duplicates keep their file order)
+    """
+    records.sort(key=lambda record: record["id"])
+    run = tempfile.TemporaryFile("w+")
+    for record in records:
+        run.write(json.dumps(record) + "\n")
+    run.seek(0)
+    return run
+
+
+def sorted_records(filename, run_size=100000):
+    """
+    Yields the records of a shape file sorted by id.
+
+    At most run_size records are held in memory at once.
+
+    Args:
+        filename (str): Path of the file
+        run_size (int, optional): Records sorted in memory per run.
+                                  Defaults to 100000.
+
+    Yields:
+        dict: Each record, by increasing id; the last record wins for
+              ids appearing several times
+
+    Raises:
+        ValueError: If run_size <= 0
+    """
+    if run_size <= 0:
+        raise ValueError("run_size must be > 0")
+    if _is_sorted(filename):
+        yield from _read_records(filename)
+        return
+
+    runs = []
+    try:
+        records = []
+        for record in _read_records(filename):
+            records.append(record)
+            if len(records) == run_size:
+                runs.append(_spill(records))
+                records = []
+        if records:
+            runs.append(_spill(records))
+
+        # heapq.merge keeps earlier runs first on equal ids
+        pending = None
+        for record in heapq.merge(*(map(json.loads, run) for run in runs),
+                                  key=lambda record: record["id"]):
+            if pending is not None and pending["id"] != record["id"]:
+                yield pending
+            pending = record
+        if pending is not None:
+            yield pending
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _join(left, right):
+    """
+    Joins two record streams sorted by id.
+
+    Args:
+        left (iterator): Records sorted by id
+        right (iterator): Records sorted by id
+
+    Yields:
+        tuple: (left record, right record) for each id of either stream,
+               by increasing id; None for a missing side
+    """
+    left = iter(left)
+    right = iter(right)
+    a = next(left, None)
+    b = next(right, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a["id"] < b["id"]):
+            yield a, None
+            a = next(left, None)
+        elif a is None or b["id"] < a["id"]:
+            yield None, b
+            b = next(right, None)
+        else:
+            yield a, b
+            a = next(left, None)
+            b = next(right, None)
+
+
+def diff(old_records, new_records):
+    """
+    Yields the patch operations turning one record stream into another.
+
+    Args:
+        old_records (iterable): Records sorted by id
+        new_records (iterable): Records sorted by id
+
+    Yields:
+        dict: Patch operations, by increasing id
+    """
+    for old, new in _join(old_records, new_records):
+        if old is None:
+            yield {"op": "add", "data": new}
+        elif new is None:
+            yield {"op": "remove", "id": old["id"]}
+        elif old != new:
+            if old.keys() != new.keys():
+                # Other fields (e.g. a Square became a Rectangle)
+                yield {"op": "add", "data": new}
+            else:
+                yield {"op": "modify", "id": new["id"],
+                       "changes": {key: value for key, value in new.items()
+                                   if old[key] != value}}
+
+
+def diff_files(old_filename, new_filename, patch_filename, run_size=100000):
+    """
+    Writes the patch turning one shape file into another.
+
+    Args:
+        old_filename (str): Path of the original shape file
+        new_filename (str): Path of the changed shape file
+        patch_filename (str): Path of the patch file to write
+        run_size (int, optional): Records sorted in memory per run when a
+                                  file is not sorted. Defaults to 100000.
+
+    Returns:
+        dict: Number of operations: {"added": n, "removed": n,
+              "modified": n}
+    """
+    counts = {"add": 0, "remove": 0, "modify": 0}
+    with atomic_write(patch_filename) as patch:
+        for operation in diff(sorted_records(old_filename, run_size),
+                              sorted_records(new_filename, run_size)):
+            counts[operation["op"]] += 1
+            patch.write(json.dumps(operation) + "\n")
+    return {"added": counts["add"], "removed": counts["remove"],
+            "modified": counts["modify"]}
+
+
+def read_patch(patch_filename):
+    """
+    Yields the operations of a patch file.
+
+    Args:
+        patch_filename (str): Path of the patch file
+
+    Yields:
+        dict: Each operation
+
+    Raises:
+        ValueError: If an operation is unknown or the ids are not
+                    strictly increasing
+    """
+    previous = None
+    with open(patch_filename, "r") as file:
+        for line in file:
+            operation = json.loads(line)
+            if operation.get("op") not in ("add", "remove", "modify"):
+                raise ValueError("Invalid patch operation: {}".format(
+                    line.strip()))
+            id = (operation["data"]["id"] if operation["op"] == "add"
+                  else operation["id"])
+            if previous is not None and id <= previous:
+                raise ValueError("Patch ids are not sorted: {}".format(id))
+            previous = id
+            yield operation
+
+
+def patch(records, operations):
+    """
+    Yields the records of a stream with patch operations applied.
+
+    Args:
+        records (iterable): Records sorted by id
+        operations (iterable): Patch operations sorted by id
+
+    Yields:
+        dict: Patched records, by increasing id
+    """
+    keyed = ((operation["data"] if operation["op"] == "add"
+              else {"id": operation["id"], "_op": operation})
+             for operation in operations)
+    for record, change in _join(records, keyed):
+        if change is None:
+            yield record
+            continue
+        operation = change.pop("_op", None)
+        if operation is None:
+            yield change
+        elif operation["op"] == "modify" and record is not None:
+            record = dict(record)
+            record.update(operation["changes"])
+            yield record
+
+
+def _write_list(file, records):
+    """
+    Writes records to a text stream as a JSON list, like save_to_file().
+
+    Args:
+        file (file): Text stream to write to
+        records (iterable): Records to write
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    file.write("[")
+    for record in records:
+        file.write((", " if count else "") + json.dumps(record))
+        count += 1
+    file.write("]")
+    return count
+
+
+def _write_records(filename, records):
+    """
+    Atomically writes records as a JSON list, like save_to_file().
+
+    The file is compressed when its extension names a codec of
+    models.compressed (e.g. Square.json.gz).
+
+    Args:
+        filename (str): Path of the file to write
+        records (iterable): Records to write
+
+    Returns:
+        int: Number of records written
+    """
+    codec = compressed.codec_of(filename)
+    if codec is None:
+        with atomic_write(filename) as file:
+            return _write_list(file, records)
+    with atomic_write(filename, "wb") as raw:
+        with compressed.writer(raw, codec) as file:
+            return _write_list(file, records)
+
+
+def apply_patch(filename, patch_filename, output_filename=None,
+                run_size=100000):
+    """
+    Applies a patch file to a shape file.
+
+    The result is sorted by id and written atomically as a JSON list,
+    readable by load_from_file(), compressed if the extension of the
+    output file names a codec. A modify or remove of a missing
+    id is ignored.
+
+    Args:
+        filename (str): Path of the shape file to patch
+        patch_filename (str): Path of the patch written by diff_files()
+        output_filename (str, optional): Path of the result.
+                                         Defaults to filename.
+        run_size (int, optional): Records sorted in memory per run when
+                                  filename is not sorted.
+                                  Defaults to 100000.
+
+    Returns:
+        int: Number of records written
+
+    Raises:
+        ValueError: If the patch is invalid
+    """
+    if output_filename is None:
+        output_filename = filename
+    return _write_records(output_filename,
+                          patch(sorted_records(filename, run_size),
+                                read_patch(patch_filename)))
+
+
+def merge_files(left_filename, right_filename, output_filename,
+                prefer="right", run_size=100000):
+    """
+    Writes the union of two shape files, by id.
+
+    Args:
+        left_filename (str): Path of the first shape file
+        right_filename (str): Path of the second shape file
+        output_filename (str): Path of the merged file (may be one of
+                               the inputs, it is replaced atomically),
+                               compressed if its extension names a codec
+        prefer (str, optional): "left" or "right", the side whose record
+                                is kept for an id present in both.
+                                Defaults to "right".
+        run_size (int, optional): Records sorted in memory per run when a
+                                  file is not sorted. Defaults to 100000.
+
+    Returns:
+        int: Number of records written
+
+    Raises:
+        ValueError: If prefer is not "left" or "right"
+    """
+    if prefer not in ("left", "right"):
+        raise ValueError("prefer must be 'left' or 'right'")
+    joined = _join(sorted_records(left_filename, run_size),
+                   sorted_records(right_filename, run_size))
+    if prefer == "right":
+        records = (right if right is not None else left
+                   for left, right in joined)
+    else:
+        records = (left if left is not None else right
+                   for left, right in joined)
+    return _write_records(output_filename, records)
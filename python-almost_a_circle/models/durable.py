@@ -0,0 +1,324 @@
+#!/usr/bin/python3
+"""
+Durable module.
+Contains the crash-safe write path used by save_to_file() and the other
+methods replacing a whole shape file, and GroupCommit, which coalesces
+many saves made within a short time window into one write per class.
+
+A file is never written in place: the new content is streamed to a
+temporary file in the same directory, synced to disk according to the
+durability policy, then renamed over the old file. The rename is atomic,
+so a crash leaves either the old or the new file, and a concurrent
+reader never sees a partly written one.
+
+Durability policies:
+    - "none": no fsync. The rename still protects against a crash of
+      the process, but a power loss can lose the new content.
+    - "close": the file is synced once before the rename, and the
+      directory after it. This is the default.
+    - "periodic": like "close", and while the file is being written it
+      is also synced every sync_interval seconds from a background
+      thread, so dirty pages never pile up and the last sync is short.
+"""
+from contextlib import contextmanager
+import os
+import stat
+import threading
+
+POLICIES = ("none", "close", "periodic")
+
+
+def check_policy(durability):
+    """
+    Validates a durability policy.
+
+    Args:
+        durability (str): Policy name
+
+    Returns:
+        str: The policy
+
+    Raises:
+        ValueError: If the policy is unknown
+    """
+    if durability not in POLICIES:
+        raise ValueError("Unknown durability policy: {}".format(durability))
+    return durability
+
+
+def _sync_directory(path):
+    """
+    Syncs a directory, making a rename inside it durable.
+
+    Args:
+        path (str): Directory path
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories can't be opened on some platforms
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _new_file_mode():
+    """
+    Returns the permissions open() would give a new file.
+
+    The umask is read from /proc where available, since the only
+    portable way to get it (setting it and back) is not thread-safe.
+
+    Returns:
+        int: 0o666 without the bits of the umask
+    """
+    try:
+        with open("/proc/self/status", "r") as status:
+            for line in status:
+                if line.startswith("Umask:"):
+                    return 0o666 & ~int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _periodic_sync(fd, interval, stop):
+    """
+    Syncs fd every interval seconds until stop is set.
+
+    Args:
+        fd (int): File descriptor to sync
+        interval (float): Seconds between two syncs
+        stop (threading.Event): Set when the file is complete
+    """
+    while not stop.wait(interval):
+        os.fsync(fd)
+
+
+@contextmanager
+def atomic_write(filename, mode="w", durability="close", sync_interval=1.0):
+    """
+    Context manager replacing filename atomically.
+
+    Yields a file object on a temporary file next to filename. If the
+    with block completes, the temporary file is synced according to
+    durability and renamed to filename; if it raises, the temporary file
+    is removed and filename is left untouched. The new file gets the
+    permissions of the file it replaces, or those of a file created by
+    open() if there was none.
+
+    Args:
+        filename (str): Path of the file to replace
+        mode (str, optional): "w" or "wb". Defaults to "w".
+        durability (str, optional): "none", "close" or "periodic".
+                                    Defaults to "close".
+        sync_interval (float, optional): Seconds between syncs with the
+                                         "periodic" policy. Defaults to 1.
+
+    Yields:
+        file: The open temporary file
+
+    Raises:
+        ValueError: If durability is unknown
+
+    Example:
+        with atomic_write("Rectangle.json") as file:
+            file.write("[]")
+    """
+    # tempfile imports shutil, which imports bz2 and lzma: only on use
+    import tempfile
+
+    check_policy(durability)
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temporary = tempfile.mkstemp(
+        dir=directory, prefix="." + os.path.basename(filename) + ".",
+        suffix=".tmp")
+    stop = None
+    syncer = None
+    try:
+        with os.fdopen(fd, mode) as file:
+            if durability == "periodic":
+                stop = threading.Event()
+                syncer = threading.Thread(target=_periodic_sync,
+                                          args=(fd, sync_interval, stop),
+                                          daemon=True)
+                syncer.start()
+            try:
+                yield file
+                file.flush()
+            finally:
+                if syncer is not None:
+                    stop.set()
+                    syncer.join()
+            try:
+                mode = stat.S_IMODE(os.stat(filename).st_mode)
+            except FileNotFoundError:
+                mode = _new_file_mode()
+            # mkstemp() creates the file readable by its owner only
+            os.chmod(temporary, mode)
+            if durability != "none":
+                os.fsync(file.fileno())
+        os.replace(temporary, filename)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+    if durability != "none":
+        _sync_directory(directory)
+
+
+class GroupCommit:
+    """
+    Coalesces the saves made within a time window into one write.
+
+    save_to_file() replaces the whole file, so when the same class is
+    saved several times in a row only the last list matters. The first
+    save() of a batch starts a timer of window seconds; the saves made
+    until it fires only replace the pending list of their class, then
+    one flush writes each class once, with one sync per file. Callers
+    block until the write holding their list is done (group commit), so
+    a return from save() still means the list is on disk.
+
+    Instances are encoded when the batch is written, not when save() is
+    called.
+
+    Attributes:
+        window (float): Seconds a batch stays open
+        file_format (str): Format passed to save_to_file()
+        durability (str): Policy passed to save_to_file()
+        _condition (threading.Condition): Protects the attributes below
+        _pending (dict): Class -> list of the batch being filled
+        _batch (int): Number of the batch being filled
+        _written (int): Number of the last batch written
+        _waiters (dict): (batch number, class) -> number of callers
+                         waiting for that write
+        _errors (dict): (batch number, class) -> exception of a failed
+                        write, kept until its waiters have read it
+        _timer (threading.Timer): Timer of the open batch, or None
+        _flush_lock (threading.Lock): Serializes the writes
+    """
+
+    def __init__(self, window=0.01, file_format="json", durability="close"):
+        """
+        Class constructor for GroupCommit.
+
+        Args:
+            window (float, optional): Seconds a batch stays open.
+                                      Defaults to 0.01.
+            file_format (str, optional): "json" or "binary".
+                                         Defaults to "json".
+            durability (str, optional): "none", "close" or "periodic".
+                                        Defaults to "close".
+
+        Raises:
+            ValueError: If window < 0 or durability is unknown
+        """
+        if window < 0:
+            raise ValueError("window must be >= 0")
+        self.window = window
+        self.file_format = file_format
+        self.durability = check_policy(durability)
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._batch = 1
+        self._written = 0
+        self._waiters = {}
+        self._errors = {}
+        self._timer = None
+        self._flush_lock = threading.Lock()
+
+    def save(self, cls, list_objs, wait=True):
+        """
+        Adds list_objs to the open batch as the new content of cls.
+
+        Args:
+            cls (type): Base subclass whose file is written
+            list_objs (list): Instances to save, or None
+            wait (bool, optional): True to block until the batch is
+                                   written. Defaults to True.
+
+        Raises:
+            Exception: The error of the write of cls, if it failed (only
+                       when wait is True)
+        """
+        with self._condition:
+            self._pending[cls] = (list(list_objs) if list_objs is not None
+                                  else None)
+            batch = self._batch
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            if not wait:
+                return
+            key = (batch, cls)
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+            try:
+                while self._written < batch:
+                    self._condition.wait()
+            finally:
+                waiters = self._waiters.pop(key) - 1
+                if waiters:
+                    self._waiters[key] = waiters
+                    error = self._errors.get(key)
+                else:
+                    error = self._errors.pop(key, None)
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """
+        Writes the open batch now.
+        """
+        with self._flush_lock:
+            with self._condition:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = self._pending
+                batch = self._batch
+                self._pending = {}
+                self._batch += 1
+
+            errors = {}
+            for cls, list_objs in pending.items():
+                try:
+                    cls.save_to_file(list_objs, self.file_format,
+                                     self.durability)
+                except Exception as exception:
+                    errors[cls] = exception
+
+            with self._condition:
+                for cls, error in errors.items():
+                    # Nobody waits for saves made with wait=False
+                    if (batch, cls) in self._waiters:
+                        self._errors[(batch, cls)] = error
+                self._written = batch
+                self._condition.notify_all()
+
+    def close(self):
+        """
+        Writes the open batch, if any.
+        """
+        self.flush()
+
+    def __enter__(self):
+        """
+        Returns the committer itself, to be used in a with statement.
+
+        Returns:
+            GroupCommit: self
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Writes the open batch at the end of a with statement.
+        """
+        self.close()
@@ -0,0 +1,421 @@
+#!/usr/bin/python3
+"""
+Flyweight module.
+Contains FlyweightRectangle and FlyweightSquare, opt-in variants of
+Rectangle and Square whose geometry is an interned object shared by all
+the instances with the same width, height, x and y.
+"""
+import weakref
+
+from models import compressed
+from models.base import Base, _iter_json_list
+from models.rectangle import Rectangle
+from models.square import Square
+
+
+class _Geometry:
+    """
+    Immutable width, height, x and y shared by flyweight instances.
+
+    Attributes:
+        width (int): Width of the shape
+        height (int): Height of the shape
+        x (int): X coordinate of the shape
+        y (int): Y coordinate of the shape
+    """
+
+    __slots__ = ("width", "height", "x", "y", "__weakref__")
+
+    def __init__(self, width, height, x, y):
+        """
+        Class constructor for _Geometry.
+
+        Args:
+            width (int): Validated width
+            height (int): Validated height
+            x (int): Validated x coordinate
+            y (int): Validated y coordinate
+        """
+        self.width = width
+        self.height = height
+        self.x = x
+        self.y = y
+
+
+class FlyweightRectangle(Base):
+    """
+    Rectangle whose geometry is shared with identical rectangles.
+
+    Instead of holding its own width, height, x and y, an instance holds
+    one geometry object taken from a class-wide table, so a million
+    rectangles with ten distinct geometries hold ten geometries. They
+    are never changed: a setter or update() validates the new values
+    and points the instance to the geometry matching them, leaving the
+    other instances untouched (copy-on-write). The table only holds weak
+    references, so a geometry no instance uses any more is dropped.
+
+    The class doesn't inherit the four slots of Rectangle: an instance
+    only holds its id and its geometry, which makes it 24 bytes smaller
+    than a Rectangle, and the ints of the geometry are only stored once
+    per distinct geometry. It is registered as a virtual subclass of
+    Rectangle, so isinstance() checks accept it, and reuses the Rectangle
+    methods that only go through the public attributes (area, display,
+    __str__, to_dictionary, create_many, update_many...), which behave
+    the same. With mostly distinct geometries, the table costs more
+    than it saves: use Rectangle then.
+
+    Attributes:
+        _geometry (_Geometry): Shared geometry
+        _geometries (weakref.WeakValueDictionary): Class-wide table of
+            the geometries in use, by (width, height, x, y)
+    """
+
+    __slots__ = ("_geometry",)
+
+    _geometries = weakref.WeakValueDictionary()
+
+    # Positional arguments of update()
+    _update_order = ("id", "width", "height", "x", "y")
+
+    # Saved by save_tagged() as a plain Rectangle
+    _tag = "Rectangle"
+
+    # Dummy width and height used by Base.create()
+    _dummy_args = Rectangle._dummy_args
+
+    validate_integer = staticmethod(Rectangle.validate_integer)
+    area = Rectangle.area
+    display = Rectangle.display
+    render = Rectangle.render
+    __str__ = Rectangle.__str__
+    to_dictionary = Rectangle.to_dictionary
+    create_many = classmethod(Rectangle.create_many.__func__)
+    validate_changes = classmethod(Rectangle.validate_changes.__func__)
+    update_many = classmethod(Rectangle.update_many.__func__)
+
+    def __init__(self, width, height, x=0, y=0, id=None):
+        """
+        Class constructor for FlyweightRectangle.
+
+        Args:
+            width (int): Width of the rectangle
+            height (int): Height of the rectangle
+            x (int, optional): X coordinate. Defaults to 0.
+            y (int, optional): Y coordinate. Defaults to 0.
+            id (int, optional): ID value. Defaults to None.
+
+        Raises:
+            TypeError: If width, height, x, or y is not an integer
+            ValueError: If width or height <= 0, or if x or y < 0
+        """
+        super().__init__(id)
+        validate = self.validate_integer
+        self._geometry = self._intern(validate("width", width),
+                                      validate("height", height),
+                                      validate("x", x),
+                                      validate("y", y))
+        if Base._trackers:
+            self._mark_dirty()
+
+    @classmethod
+    def _intern(cls, width, height, x, y):
+        """
+        Returns the shared geometry with the given values.
+
+        Args:
+            width (int): Validated width
+            height (int): Validated height
+            x (int): Validated x coordinate
+            y (int): Validated y coordinate
+
+        Returns:
+            _Geometry: The geometry from the table, added if missing
+        """
+        key = (width, height, x, y)
+        geometry = cls._geometries.get(key)
+        if geometry is None:
+            geometry = _Geometry(width, height, x, y)
+            cls._geometries[key] = geometry
+        return geometry
+
+    @classmethod
+    def distinct_geometries(cls):
+        """
+        Returns the number of distinct geometries in use.
+
+        Returns:
+            int: Size of the shared table
+        """
+        return len(cls._geometries)
+
+    def _set_geometry(self, width, height, x, y):
+        """
+        Points the instance to the geometry with the given values.
+
+        Args:
+            width (int): Validated width
+            height (int): Validated height
+            x (int): Validated x coordinate
+            y (int): Validated y coordinate
+        """
+        self._geometry = self._intern(width, height, x, y)
+        if Base._trackers:
+            self._mark_dirty()
+
+    @property
+    def width(self):
+        """
+        Getter for width attribute.
+
+        Returns:
+            int: Width of the rectangle
+        """
+        return self._geometry.width
+
+    @width.setter
+    def width(self, value):
+        """
+        Setter for width attribute with validation.
+
+        Args:
+            value (int): Width value to set
+        """
+        value = self.validate_integer("width", value)
+        geometry = self._geometry
+        self._set_geometry(value, geometry.height, geometry.x, geometry.y)
+
+    @property
+    def height(self):
+        """
+        Getter for height attribute.
+
+        Returns:
+            int: Height of the rectangle
+        """
+        return self._geometry.height
+
+    @height.setter
+    def height(self, value):
+        """
+        Setter for height attribute with validation.
+
+        Args:
+            value (int): Height value to set
+        """
+        value = self.validate_integer("height", value)
+        geometry = self._geometry
+        self._set_geometry(geometry.width, value, geometry.x, geometry.y)
+
+    @property
+    def x(self):
+        """
+        Getter for x coordinate attribute.
+
+        Returns:
+            int: X coordinate of the rectangle
+        """
+        return self._geometry.x
+
+    @x.setter
+    def x(self, value):
+        """
+        Setter for x coordinate attribute with validation.
+
+        Args:
+            value (int): X coordinate value to set
+        """
+        value = self.validate_integer("x", value)
+        geometry = self._geometry
+        self._set_geometry(geometry.width, geometry.height, value, geometry.y)
+
+    @property
+    def y(self):
+        """
+        Getter for y coordinate attribute.
+
+        Returns:
+            int: Y coordinate of the rectangle
+        """
+        return self._geometry.y
+
+    @y.setter
+    def y(self, value):
+        """
+        Setter for y coordinate attribute with validation.
+
+        Args:
+            value (int): Y coordinate value to set
+        """
+        value = self.validate_integer("y", value)
+        geometry = self._geometry
+        self._set_geometry(geometry.width, geometry.height, geometry.x, value)
+
+    @classmethod
+    def _build(cls, id, width, height, x, y):
+        """
+        Returns a new instance from already validated values.
+
+        Args:
+            id (int): ID value
+            width (int): Validated width
+            height (int): Validated height
+            x (int): Validated x coordinate
+            y (int): Validated y coordinate
+
+        Returns:
+            Instance of the calling class
+        """
+        obj = cls.__new__(cls)
+        obj._id = id
+        obj._geometry = cls._intern(width, height, x, y)
+        return obj
+
+    def _set_validated(self, values):
+        """
+        Applies changes returned by validate_changes().
+
+        Only the final geometry is looked up, whatever the number of
+        values changed.
+
+        Args:
+            values (dict): Validated changes
+        """
+        if "id" in values:
+            self.id = values["id"]
+        geometry = self._geometry
+        self._set_geometry(values.get("width", geometry.width),
+                           values.get("height", geometry.height),
+                           values.get("x", geometry.x),
+                           values.get("y", geometry.y))
+
+    def update(self, *args, **kwargs):
+        """
+        Assigns arguments to attributes using *args and **kwargs.
+
+        Same arguments as the update() of the non-flyweight class, but
+        the changes are validated first and applied at once: the
+        geometry is looked up a single time, and nothing is changed if
+        a value is invalid.
+
+        Args:
+            *args: New values, in the order of _update_order
+            **kwargs: Attribute names and new values, used if no *args
+
+        Raises:
+            TypeError: If a new value is not an integer
+            ValueError: If a new value is out of range
+        """
+        if args:
+            changes = dict(zip(self._update_order, args))
+        else:
+            changes = kwargs
+        self._set_validated(self.validate_changes(changes))
+
+    @classmethod
+    def create(cls, **dictionary):
+        """
+        Returns an instance with all attributes already set.
+
+        Same as Base.create(), built with create_many().
+
+        Args:
+            **dictionary: Attribute names and values
+
+        Returns:
+            Instance of the calling class
+        """
+        return cls.create_many([dictionary])[0]
+
+
+class FlyweightSquare(FlyweightRectangle):
+    """
+    Square whose geometry is shared with identical squares.
+
+    The geometry storage comes from FlyweightRectangle, while size,
+    __str__, to_dictionary and create_many come from Square. It is
+    registered as a virtual subclass of Square.
+    """
+
+    __slots__ = ()
+
+    _tag = "Square"
+
+    _update_order = ("id", "size", "x", "y")
+
+    # Dummy size used by Base.create()
+    _dummy_args = Square._dummy_args
+
+    size = Square.size
+    __str__ = Square.__str__
+    to_dictionary = Square.to_dictionary
+    create_many = classmethod(Square.create_many.__func__)
+
+    def __init__(self, size, x=0, y=0, id=None):
+        """
+        Class constructor for FlyweightSquare.
+
+        Args:
+            size (int): Size of the square (both width and height)
+            x (int, optional): X coordinate. Defaults to 0.
+            y (int, optional): Y coordinate. Defaults to 0.
+            id (int, optional): ID value. Defaults to None.
+        """
+        super().__init__(size, size, x, y, id)
+
+    @classmethod
+    def validate_changes(cls, changes):
+        """
+        Validates a set of attribute changes once, without applying it.
+
+        Same as Square.validate_changes(): 'size' is validated once and
+        used for both width and height.
+
+        Args:
+            changes (dict): Attribute names and new values
+
+        Returns:
+            dict: The validated changes, with keys among 'id', 'width',
+                  'height', 'x' and 'y'
+
+        Raises:
+            TypeError: If size, x, or y is not an integer
+            ValueError: If size <= 0, or if x or y < 0
+        """
+        values = super().validate_changes(changes)
+        if "size" in changes:
+            size = cls.validate_integer("width", changes["size"])
+            values["width"] = size
+            values["height"] = size
+        return values
+
+
+Rectangle.register(FlyweightRectangle)
+Square.register(FlyweightSquare)
+
+
+def load_from_file(cls):
+    """
+    Returns the instances saved by cls.save_to_file() as flyweights.
+
+    The JSON file of cls (Rectangle or Square), found and decompressed as
+    in cls.load_from_file(), is streamed and each record is built
+    directly as a FlyweightRectangle or a FlyweightSquare. Flyweights can
+    be saved back with cls.save_to_file(), since they have the same
+    to_dictionary().
+
+    Args:
+        cls (type): Rectangle or Square
+
+    Returns:
+        list: List of FlyweightRectangle or FlyweightSquare instances.
+              Empty if the file doesn't exist.
+    """
+    if issubclass(cls, Square):
+        flyweight = FlyweightSquare
+    else:
+        flyweight = FlyweightRectangle
+    filename, codec = compressed.find(cls.__name__ + ".json")
+    if filename is None:
+        return []
+    with compressed.open_text(filename, codec) as file:
+        return flyweight.create_many(_iter_json_list(file, 65536))
@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+"""
+Id allocator module.
+Contains allocators that Base can use to hand out ids safely from several
+threads (IdAllocator) or several processes (FileIdAllocator).
+"""
+import os
+import threading
+
+from models.durable import _new_file_mode
+
+
+class IdAllocator:
+    """
+    Thread-safe id allocator.
+
+    Ids are handed out in increasing order from a counter protected by a
+    lock. The lock is only held for an addition, so threads creating
+    shapes in parallel barely wait on each other, and reserve() takes a
+    whole block of ids for one lock acquisition.
+
+    Attributes:
+        _next (int): Next id to hand out
+        _lock (threading.Lock): Lock protecting _next
+    """
+
+    def __init__(self, start=1):
+        """
+        Class constructor for IdAllocator.
+
+        Args:
+            start (int, optional): First id to hand out. Defaults to 1.
+        """
+        self._next = start
+        self._lock = threading.Lock()
+
+    def next_id(self):
+        """
+        Returns a new id.
+
+        Returns:
+            int: An id never returned before by this allocator
+        """
+        with self._lock:
+            value = self._next
+            self._next += 1
+        return value
+
+    def reserve(self, count):
+        """
+        Reserves a block of consecutive ids.
+
+        Args:
+            count (int): Number of ids to reserve
+
+        Returns:
+            range: The reserved ids
+
+        Raises:
+            ValueError: If count < 0
+        """
+        if count < 0:
+            raise ValueError("count must be >= 0")
+        with self._lock:
+            start = self._next
+            self._next += count
+        return range(start, start + count)
+
+    def skip_to(self, start):
+        """
+        Makes sure no id lower than start is handed out from now on.
+
+        Base.set_id_allocator() calls it so that an allocator never hands
+        out an id the Base counter already gave.
+
+        Args:
+            start (int): Lowest id allowed
+        """
+        with self._lock:
+            self._next = max(self._next, start)
+
+    def last_id(self):
+        """
+        Returns an id at least as high as every id handed out.
+
+        Base.set_id_allocator() calls it to move the Base counter past
+        the ids of the allocator it stops using.
+
+        Returns:
+            int: Highest id handed out or reserved, 0 if none
+        """
+        with self._lock:
+            return self._next - 1
+
+
+class FileIdAllocator(IdAllocator):
+    """
+    Process-safe id allocator backed by a file.
+
+    The file holds the next free id. A process takes a block of
+    block_size ids at a time by locking the file (fcntl.flock), reading
+    the value, writing it back increased, and unlocking. Ids of the block
+    are then handed out locally, so the file is only touched once per
+    block. Several processes sharing the same file never get the same id,
+    but ids are not in creation order across processes.
+
+    Attributes:
+        path (str): Path of the counter file
+        block_size (int): Number of ids taken from the file at a time
+        _end (int): End (excluded) of the local block
+    """
+
+    def __init__(self, path, block_size=1000):
+        """
+        Class constructor for FileIdAllocator.
+
+        Args:
+            path (str): Path of the counter file, created if missing
+            block_size (int, optional): Number of ids taken from the file
+                                        at a time. Defaults to 1000.
+
+        Raises:
+            ValueError: If block_size <= 0
+        """
+        if block_size <= 0:
+            raise ValueError("block_size must be > 0")
+        super().__init__(0)
+        self.path = path
+        self.block_size = block_size
+        self._end = 0
+
+    def _open(self):
+        """
+        Opens the counter file, creating it with the value 1 if missing.
+
+        The file is created with its content in place (written to a
+        temporary file, then linked to path), so it is never seen empty:
+        an empty counter file can only be a damaged one.
+
+        Returns:
+            int: File descriptor open for reading and writing
+        """
+        import tempfile
+
+        try:
+            return os.open(self.path, os.O_RDWR)
+        except FileNotFoundError:
+            pass
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temporary = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write("1")
+                file.flush()
+                os.fsync(file.fileno())
+            os.chmod(temporary, 0o644 & _new_file_mode())
+            try:
+                # Unlike a rename, never replaces a file made meanwhile
+                os.link(temporary, self.path)
+            except FileExistsError:
+                pass
+        finally:
+            os.remove(temporary)
+        return os.open(self.path, os.O_RDWR)
+
+    def _update_file(self, change):
+        """
+        Rewrites the counter file under an exclusive lock.
+
+        The new value is written over the old one before the file is cut
+        to its length, then synced: since the value never decreases, a
+        crash at any point leaves either value in the file, never an
+        empty or shorter one.
+
+        Args:
+            change (function): Takes the next free id read from the file
+                               and returns the value to write back, not
+                               lower than the one read
+
+        Returns:
+            int: The next free id read from the file
+
+        Raises:
+            ValueError: If the file doesn't hold a positive integer
+        """
+        import fcntl
+
+        fd = self._open()
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            content = os.read(fd, 32).strip()
+            if not content.isdigit() or int(content) <= 0:
+                raise ValueError("Invalid id counter file: {}".format(
+                    self.path))
+            start = int(content)
+            data = str(change(start)).encode("ascii")
+            os.pwrite(fd, data, 0)
+            os.ftruncate(fd, len(data))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return start
+
+    def _take(self, count):
+        """
+        Takes count consecutive ids from the counter file.
+
+        Args:
+            count (int): Number of ids to take
+
+        Returns:
+            int: The first id taken
+        """
+        return self._update_file(lambda start: start + count)
+
+    def next_id(self):
+        """
+        Returns a new id, taking a new block from the file when needed.
+
+        Returns:
+            int: An id never returned before by any allocator sharing
+                 the same file
+        """
+        with self._lock:
+            if self._next >= self._end:
+                self._next = self._take(self.block_size)
+                self._end = self._next + self.block_size
+            value = self._next
+            self._next += 1
+        return value
+
+    def reserve(self, count):
+        """
+        Reserves a block of consecutive ids directly from the file.
+
+        Args:
+            count (int): Number of ids to reserve
+
+        Returns:
+            range: The reserved ids
+
+        Raises:
+            ValueError: If count < 0
+        """
+        if count < 0:
+            raise ValueError("count must be >= 0")
+        with self._lock:
+            start = self._take(count)
+        return range(start, start + count)
+
+    def skip_to(self, start):
+        """
+        Makes sure no id lower than start is handed out from now on, by
+        this process or any other sharing the file.
+
+        Args:
+            start (int): Lowest id allowed
+        """
+        with self._lock:
+            self._update_file(lambda value: max(value, start))
+            if self._next < start:
+                # Drop the rest of the local block
+                self._next = self._end = 0
+
+    def last_id(self):
+        """
+        Returns an id at least as high as every id handed out by the
+        allocators sharing the file.
+
+        Returns:
+            int: The next free id of the file minus one
+        """
+        with self._lock:
+            return self._update_file(lambda value: value) - 1
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+"""
+Lazy module.
+Contains the LazyShapeList class returned by load_from_file(lazy=True):
+a read-only sequence over a saved shape file that only decodes the
+records actually accessed.
+"""
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+import json
+import mmap
+import re
+import struct
+
+from models import binary_format
+
+_RECORD_START = re.compile(rb"\{")
+
+
+class LazyShapeList(Sequence):
+    """
+    Read-only sequence of the instances saved in a shape file.
+
+    The file is memory-mapped. Only the position of each record is known
+    up front: for a JSON file, one C-level scan collects the offset of
+    every "{" (shape dictionaries are flat, so there is one per record);
+    for a binary file, positions follow from the fixed record size and
+    nothing is scanned at all. An instance is decoded and built the
+    first time its index is accessed, then kept in a LRU cache of
+    cache_size instances, so memory follows the working set.
+
+    Attributes:
+        cls (type): Base subclass of the instances
+        cache_size (int): Maximum number of cached instances
+        _file (file): The open shape file
+        _data (mmap.mmap): Memory map of the file, None if it is empty
+        _starts (array): Offset of each JSON record (JSON files only)
+        _format (str): struct format of a record (binary files only)
+        _fields (list): Field names of a record (binary files only)
+        _offset (int): Offset of the first record (binary files only)
+        _length (int): Number of records
+        _cache (OrderedDict): Index -> instance, least recently used first
+    """
+
+    def __init__(self, cls, filename, file_format="json", cache_size=4096):
+        """
+        Class constructor for LazyShapeList.
+
+        Args:
+            cls (type): Base subclass of the saved instances
+            filename (str): Path of the file written by save_to_file()
+            file_format (str, optional): "json" or "binary".
+                                         Defaults to "json".
+            cache_size (int, optional): Maximum number of cached instances.
+                                        Defaults to 4096.
+
+        Raises:
+            ValueError: If file_format is unknown, cache_size <= 0 or the
+                        file is not valid
+        """
+        if file_format not in ("json", "binary"):
+            raise ValueError("Unknown file format: {}".format(file_format))
+        if cache_size <= 0:
+            raise ValueError("cache_size must be > 0")
+        self.cls = cls
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._file = open(filename, "rb")
+        self._data = None
+        self._starts = array("q")
+        self._format = None
+        self._length = 0
+
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file: no record
+            return
+
+        if file_format == "binary":
+            header, self._offset = binary_format.read_header(self._data)
+            self._fields = header["fields"]
+            self._format = header["format"]
+            self._length = header["count"] if self._fields else 0
+        else:
+            self._starts.extend(
+                match.start() for match in _RECORD_START.finditer(self._data))
+            self._length = len(self._starts)
+
+    def close(self):
+        """
+        Releases the memory map and the file.
+        """
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def __enter__(self):
+        """
+        Returns the list itself, to be used in a with statement.
+
+        Returns:
+            LazyShapeList: self
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Closes the list at the end of a with statement.
+        """
+        self.close()
+
+    def __len__(self):
+        """
+        Returns the number of saved instances.
+
+        Returns:
+            int: Number of records in the file
+        """
+        return self._length
+
+    def _decode(self, index):
+        """
+        Decodes the record at index and builds its instance.
+
+        Args:
+            index (int): Record number, already in range
+
+        Returns:
+            Instance of cls
+        """
+        if self._format is not None:
+            values = struct.unpack_from(
+                self._format, self._data,
+                self._offset + index * struct.calcsize(self._format))
+            dictionary = dict(zip(self._fields, values))
+        else:
+            start = self._starts[index]
+            end = self._data.find(b"}", start) + 1
+            dictionary = json.loads(self._data[start:end])
+        return self.cls.create_many([dictionary])[0]
+
+    def __getitem__(self, index):
+        """
+        Returns the instance at index, or a list of instances for a slice.
+
+        Args:
+            index (int or slice): Position(s), negative values count from
+                                  the end
+
+        Returns:
+            Instance of cls, or list of instances for a slice
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("LazyShapeList index out of range")
+
+        cache = self._cache
+        obj = cache.get(index)
+        if obj is not None:
+            cache.move_to_end(index)
+            return obj
+        obj = self._decode(index)
+        cache[index] = obj
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return obj
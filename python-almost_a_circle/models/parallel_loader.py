@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+"""
+Parallel loader module.
+Contains functions loading shape files with a pool of worker processes:
+either many shard files, or one large file split into chunks.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import json
+import mmap
+import os
+
+from models import compressed
+
+
+def _load_shard(cls, filename):
+    """
+    Returns the instances of one shard file.
+
+    Runs in a worker process.
+
+    Args:
+        cls (type): Base subclass to build
+        filename (str): Path of a JSON file written by save_to_file(),
+                        compressed or not (from its extension)
+
+    Returns:
+        list: Instances of cls, in file order
+    """
+    if not os.path.exists(filename):
+        return []
+    with compressed.open_text(filename, compressed.codec_of(filename)) as file:
+        return cls.create_many(cls.from_json_string(file.read()))
+
+
+def _load_chunk(cls, filename, start, end):
+    """
+    Returns the instances of the bytes [start, end) of a JSON file.
+
+    Runs in a worker process. The chunk is a run of complete dictionaries
+    of the JSON list, possibly with the opening "[" or the closing "]"
+    and with a leading ", " separator.
+
+    Args:
+        cls (type): Base subclass to build
+        filename (str): Path of a JSON file written by save_to_file()
+        start (int): Offset of the first byte of the chunk
+        end (int): Offset of the byte after the chunk
+
+    Returns:
+        list: Instances of cls, in file order
+    """
+    with open(filename, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8").strip()
+    if text.startswith("["):
+        text = text[1:]
+    if text.endswith("]"):
+        text = text[:-1]
+    text = text.strip().lstrip(",")
+    return cls.create_many(json.loads("[" + text + "]"))
+
+
+def _chunk_bounds(filename, chunks):
+    """
+    Splits a JSON file written by save_to_file() into byte ranges.
+
+    Boundaries are moved forward to the next "}, {" separator, which
+    only appears between two dictionaries since shape dictionaries are
+    flat and hold integers. A file whose values contain that text fails
+    to parse instead of loading wrong data.
+
+    Args:
+        filename (str): Path of the file
+        chunks (int): Wanted number of ranges
+
+    Returns:
+        list: List of (start, end) offsets covering the whole file
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for k in range(1, chunks):
+                target = max(size * k // chunks, bounds[-1])
+                position = data.find(b"}, {", target)
+                if position == -1:
+                    break
+                if position + 1 > bounds[-1]:
+                    bounds.append(position + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _run(tasks, workers):
+    """
+    Runs tasks in a process pool and concatenates results in task order.
+
+    Args:
+        tasks (list): List of (function, *args) tuples
+        workers (int): Number of worker processes; 1 runs the tasks in
+                       the current process
+
+    Returns:
+        list: Concatenation of the lists returned by the tasks
+    """
+    instances = []
+    if workers == 1 or len(tasks) <= 1:
+        for function, *args in tasks:
+            instances.extend(function(*args))
+        return instances
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, *args)
+                   for function, *args in tasks]
+        for future in futures:
+            instances.extend(future.result())
+    return instances
+
+
+def load_shards(cls, filenames, workers=None):
+    """
+    Returns the instances of many shard files, loaded in parallel.
+
+    Each shard is parsed, validated and built by a worker process with
+    cls.create_many(). Results are merged in the order of filenames, and
+    each shard keeps its own order. Missing shards are skipped, and
+    compressed ones are decompressed (see models.compressed).
+
+    Args:
+        cls (type): Base subclass to build, e.g. Rectangle
+        filenames (list): Paths of JSON files written by save_to_file()
+        workers (int, optional): Number of worker processes.
+                                 Defaults to os.cpu_count().
+
+    Returns:
+        list: Instances of cls
+
+    Raises:
+        ValueError: If workers <= 0
+
+    Example:
+        rects = load_shards(Rectangle, glob.glob("shards/*.json"), 8)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError("workers must be > 0")
+    return _run([(_load_shard, cls, filename) for filename in filenames],
+                workers)
+
+
+def load_file(cls, filename=None, workers=None):
+    """
+    Returns the instances of one large JSON file, loaded in parallel.
+
+    The file is split into one byte range per worker on dictionary
+    boundaries, and each range is parsed and built by a worker process.
+    Results are merged in file order. A compressed file can't be split
+    at byte offsets: it is loaded as a single shard in this process.
+
+    Args:
+        cls (type): Base subclass to build, e.g. Rectangle
+        filename (str, optional): Path of a JSON file written by
+                                  save_to_file(), its extension giving
+                                  the codec. Defaults to the file
+                                  load_from_file() reads.
+        workers (int, optional): Number of worker processes.
+                                 Defaults to os.cpu_count().
+
+    Returns:
+        list: Instances of cls. Empty if the file doesn't exist.
+
+    Raises:
+        ValueError: If workers <= 0
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError("workers must be > 0")
+    if filename is None:
+        filename, codec = compressed.find(cls.__name__ + ".json")
+        if filename is None:
+            return []
+    else:
+        codec = compressed.codec_of(filename)
+    if not os.path.exists(filename):
+        return []
+    if codec is not None:
+        return _load_shard(cls, filename)
+    return _run([(_load_chunk, cls, filename, start, end)
+                 for start, end in _chunk_bounds(filename, workers)],
+                workers)
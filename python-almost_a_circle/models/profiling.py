@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+"""
+Profiling module.
+Contains optional call counters and timing histograms for the hot
+operations of the models package: saving, loading, creating and
+updating shapes, and the validation and JSON steps inside them.
+
+Profiling is off by default and then costs nothing: enable() replaces
+the measured methods with timed wrappers, and disable() puts the
+original methods back. It can be turned on:
+    - for the whole process, with the MODELS_PROFILE environment variable
+      set to a non-empty value before the models package is imported
+    - around some code, with the profile() context manager
+    - by hand, with enable() and disable()
+
+Example:
+    from models import profiling
+
+    with profiling.profile():
+        Rectangle.save_to_file(rects)
+        Rectangle.load_from_file()
+    profiling.report()
+"""
+from collections import Counter
+from contextlib import contextmanager
+import functools
+import sys
+import time
+
+from models.base import Base
+from models.rectangle import Rectangle
+from models.square import Square
+
+# (class, method name) pairs measured when profiling is on. Inclusive
+# times nest: save_to_file includes to_dictionary and to_json_string,
+# the rest of it being file I/O.
+TARGETS = (
+    (Base, "save_to_file"),
+    (Base, "load_from_file"),
+    (Base, "create"),
+    (Base, "to_json_string"),
+    (Base, "from_json_string"),
+    (Rectangle, "update"),
+    (Square, "update"),
+    (Rectangle, "to_dictionary"),
+    (Square, "to_dictionary"),
+    (Rectangle, "validate_integer"),
+)
+
+_stats = {}
+_originals = []
+
+
+def _timed(label, function):
+    """
+    Returns function wrapped to record its calls under label.
+
+    Args:
+        label (str): Name of the operation in the report
+        function (function): Function to measure
+
+    Returns:
+        function: The wrapper
+    """
+    clock = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = clock() - start
+            entry = _stats.get(label)
+            if entry is None:
+                entry = _stats[label] = [0, 0, 0, Counter()]
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+            # Power-of-two buckets: bucket b holds calls under 2 ** b ns
+            entry[3][elapsed.bit_length()] += 1
+
+    return wrapper
+
+
+def is_enabled():
+    """
+    Tells whether profiling is on.
+
+    Returns:
+        bool: True if the timed wrappers are installed
+    """
+    return bool(_originals)
+
+
+def enable():
+    """
+    Installs the timed wrappers on every method of TARGETS.
+
+    Does nothing if profiling is already on. Statistics collected before
+    are kept.
+    """
+    if _originals:
+        return
+    for cls, name in TARGETS:
+        raw = cls.__dict__[name]
+        label = "{}.{}".format(cls.__name__, name)
+        if isinstance(raw, classmethod):
+            wrapped = classmethod(_timed(label, raw.__func__))
+        elif isinstance(raw, staticmethod):
+            wrapped = staticmethod(_timed(label, raw.__func__))
+        else:
+            wrapped = _timed(label, raw)
+        _originals.append((cls, name, raw))
+        setattr(cls, name, wrapped)
+
+
+def disable():
+    """
+    Puts the original methods back. Statistics are kept.
+    """
+    while _originals:
+        cls, name, raw = _originals.pop()
+        setattr(cls, name, raw)
+
+
+def reset():
+    """
+    Clears all statistics.
+    """
+    _stats.clear()
+
+
+@contextmanager
+def profile():
+    """
+    Context manager turning profiling on inside a with block.
+
+    Profiling is turned back off at the end of the block, unless it was
+    already on before.
+    """
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def stats():
+    """
+    Returns the collected statistics.
+
+    Returns:
+        dict: Maps each operation to a dictionary with keys 'calls',
+              'total_ns', 'max_ns' and 'histogram' (upper bound in ns ->
+              number of calls)
+    """
+    return {
+        label: {
+            "calls": calls,
+            "total_ns": total,
+            "max_ns": longest,
+            "histogram": {1 << bucket: buckets[bucket]
+                          for bucket in sorted(buckets)}
+        }
+        for label, (calls, total, longest, buckets) in _stats.items()
+    }
+
+
+def report(file=None):
+    """
+    Writes a table of the collected statistics, slowest total first.
+
+    Args:
+        file (file, optional): Text stream to write to.
+                               Defaults to sys.stdout.
+    """
+    if file is None:
+        file = sys.stdout
+    file.write("{:<28}{:>10}{:>12}{:>12}{:>12}\n".format(
+        "operation", "calls", "total ms", "mean us", "max us"))
+    entries = sorted(_stats.items(), key=lambda item: -item[1][1])
+    for label, (calls, total, longest, buckets) in entries:
+        file.write("{:<28}{:>10}{:>12.3f}{:>12.3f}{:>12.3f}\n".format(
+            label, calls, total / 1e6, total / calls / 1e3, longest / 1e3))
+        file.write("    " + " ".join(
+            "<{}us:{}".format(_format_bound(1 << bucket), buckets[bucket])
+            for bucket in sorted(buckets)) + "\n")
+
+
+def _format_bound(nanoseconds):
+    """
+    Formats a histogram bucket bound in microseconds.
+
+    Args:
+        nanoseconds (int): Bound in nanoseconds
+
+    Returns:
+        str: Bound in microseconds, without useless decimals
+    """
+    return "{:g}".format(nanoseconds / 1e3)
@@ -3,11 +3,17 @@
 Rectangle module.
 Contains the Rectangle class that inherits from Base.
 """
+from abc import ABCMeta
+from collections.abc import Mapping
+import json
 
 from models.base import Base
 
+_GEOMETRY = frozenset(("width", "height", "x", "y"))
+_JSON_RECORD = '{"id": %d, "width": %d, "height": %d, "x": %d, "y": %d}'
 
-class Rectangle(Base):
+
+class Rectangle(Base, metaclass=ABCMeta):
     """
     Rectangle class that inherits from Base.
 
@@ -22,6 +28,13 @@ class Rectangle(Base):
         __y (int): Y coordinate position
     """
 
+    # ABCMeta lets the flyweight variants (see models.flyweight) register
+    # as virtual subclasses without inheriting these slots
+    __slots__ = ("__width", "__height", "__x", "__y")
+
+    # Dummy width and height used by Base.create()
+    _dummy_args = (1, 1)
+
     def __init__(self, width, height, x=0, y=0, id=None):
         """
         Class constructor for Rectangle.
@@ -47,6 +60,40 @@ class Rectangle(Base):
         self.x = x
         self.y = y
 
+    # ========================================================================
+    # Shared validation
+    # ========================================================================
+
+    @staticmethod
+    def validate_integer(name, value):
+        """
+        Validates a value for one of the Rectangle attributes.
+
+        width and height must be strictly positive, x and y must be
+        positive or zero. Every setter goes through this method, so
+        other code working on raw values (stores, bulk loaders) gets
+        exactly the same error messages.
+
+        Args:
+            name (str): Attribute name ('width', 'height', 'x' or 'y')
+            value (int): Value to validate
+
+        Returns:
+            int: The validated value
+
+        Raises:
+            TypeError: If value is not an integer
+            ValueError: If value is out of range for the attribute
+        """
+        if not isinstance(value, int):
+            raise TypeError("{} must be an integer".format(name))
+        if name in ("width", "height"):
+            if value <= 0:
+                raise ValueError("{} must be > 0".format(name))
+        elif value < 0:
+            raise ValueError("{} must be >= 0".format(name))
+        return value
+
     # ========================================================================
     # Width property (getter and setter with validation)
     # ========================================================================
@@ -73,11 +120,9 @@ class Rectangle(Base):
             TypeError: If value is not an integer
             ValueError: If value is <= 0
         """
-        if not isinstance(value, int):
-            raise TypeError("width must be an integer")
-        if value <= 0:
-            raise ValueError("width must be > 0")
-        self.__width = value
+        self.__width = self.validate_integer("width", value)
+        if Base._trackers:
+            self._mark_dirty()
 
     # ========================================================================
     # Height property (getter and setter with validation)
@@ -105,11 +150,9 @@ class Rectangle(Base):
             TypeError: If value is not an integer
             ValueError: If value is <= 0
         """
-        if not isinstance(value, int):
-            raise TypeError("height must be an integer")
-        if value <= 0:
-            raise ValueError("height must be > 0")
-        self.__height = value
+        self.__height = self.validate_integer("height", value)
+        if Base._trackers:
+            self._mark_dirty()
 
     # ========================================================================
     # X property (getter and setter with validation)
@@ -137,11 +180,9 @@ class Rectangle(Base):
             TypeError: If value is not an integer
             ValueError: If value is < 0
         """
-        if not isinstance(value, int):
-            raise TypeError("x must be an integer")
-        if value < 0:
-            raise ValueError("x must be >= 0")
-        self.__x = value
+        self.__x = self.validate_integer("x", value)
+        if Base._trackers:
+            self._mark_dirty()
 
     # ========================================================================
     # Y property (getter and setter with validation)
@@ -169,11 +210,9 @@ class Rectangle(Base):
             TypeError: If value is not an integer
             ValueError: If value is < 0
         """
-        if not isinstance(value, int):
-            raise TypeError("y must be an integer")
-        if value < 0:
-            raise ValueError("y must be >= 0")
-        self.__y = value
+        self.__y = self.validate_integer("y", value)
+        if Base._trackers:
+            self._mark_dirty()
 
     # ========================================================================
     # Area method
@@ -196,7 +235,7 @@ class Rectangle(Base):
     # Display method - IMPROVED VERSION (with x and y handling)
     # ========================================================================
 
-    def display(self):
+    def display(self, file=None):
         """
         Prints the Rectangle instance with the character '#' to stdout.
 
@@ -205,6 +244,13 @@ class Rectangle(Base):
         - y: prints y empty lines before the rectangle
         - x: prints x spaces before each row of '#' characters
 
+        The output is written in chunks of many rows instead of one
+        print() per row, so large rectangles only take a few writes.
+
+        Args:
+            file (file, optional): Text stream to write to.
+                                   Defaults to sys.stdout.
+
         Example:
             For Rectangle(2, 3, 2, 2), output will be:
             (empty line)
@@ -213,13 +259,34 @@ class Rectangle(Base):
               ##
               ##
         """
-        # Print y empty lines for vertical offset
-        for i in range(self.y):
-            print()
+        import sys
+
+        if file is None:
+            file = sys.stdout
+
+        # Write y empty lines for vertical offset
+        if self.y:
+            file.write("\n" * self.y)
+
+        # Write the rows with x spaces for horizontal offset,
+        # grouping as many rows as fit in about 64 KiB per write
+        row = " " * self.x + "#" * self.width + "\n"
+        rows_per_chunk = max(1, 65536 // len(row))
+        remaining = self.height
+        while remaining > 0:
+            count = min(rows_per_chunk, remaining)
+            file.write(row * count)
+            remaining -= count
+
+    def render(self):
+        """
+        Returns the text printed by display() as a string.
 
-        # Print the rectangle with x spaces for horizontal offset
-        for i in range(self.height):
-            print(" " * self.x + "#" * self.width)
+        Returns:
+            str: The rectangle drawn with '#', including the x and y offsets
+        """
+        return "\n" * self.y + (
+            " " * self.x + "#" * self.width + "\n") * self.height
 
     # ========================================================================
     # String representation method (__str__)
@@ -267,6 +334,8 @@ class Rectangle(Base):
             rect.update(width=10, height=20)  # Uses **kwargs, updates width and height
             rect.update(89, 2, width=10)  # Uses *args only, **kwargs ignored
         """
+        if Base._trackers:
+            self._mark_dirty()
         if args:
             # If args exist and is not empty, use *args and ignore **kwargs
             attributes = ["id", "width", "height", "x", "y"]
@@ -312,3 +381,217 @@ class Rectangle(Base):
             "x": self.x,
             "y": self.y
         }
+
+    def to_json_record(self):
+        """
+        Returns the JSON text of to_dictionary(), without building it.
+
+        The attributes are formatted directly. Values that are not plain
+        integers (e.g. a string id or a bool), and subclasses overriding
+        to_dictionary(), go through json.dumps() so the text is always
+        identical to json.dumps(self.to_dictionary()).
+
+        Returns:
+            str: JSON object text
+        """
+        id = self.id
+        width = self.__width
+        height = self.__height
+        x = self.__x
+        y = self.__y
+        if (type(id) is int and type(width) is int and type(height) is int
+                and type(x) is int and type(y) is int
+                and type(self).to_dictionary is Rectangle.to_dictionary):
+            return _JSON_RECORD % (id, width, height, x, y)
+        return json.dumps(self.to_dictionary())
+
+    # ========================================================================
+    # Bulk construction
+    # ========================================================================
+
+    @classmethod
+    def _build(cls, id, width, height, x, y):
+        """
+        Returns a new instance from already validated values.
+
+        The instance is allocated with __new__ and its private attributes
+        are assigned directly, so neither __init__ nor the property setters
+        run again.
+
+        Args:
+            id (int): ID value
+            width (int): Validated width
+            height (int): Validated height
+            x (int): Validated x coordinate
+            y (int): Validated y coordinate
+
+        Returns:
+            Instance of the calling class
+        """
+        obj = cls.__new__(cls)
+        obj._id = id
+        obj.__width = width
+        obj.__height = height
+        obj.__x = x
+        obj.__y = y
+        return obj
+
+    @classmethod
+    def create_many(cls, list_dictionaries):
+        """
+        Returns a list of instances built from a list of dictionaries.
+
+        This is the bulk counterpart of create(): each field is validated
+        once with validate_integer() and the instance is built directly,
+        without the dummy instance and the update() round trip. Unlike
+        create(), no id is taken from the Base counter for dictionaries
+        that already have an "id" key.
+
+        Missing keys get the same values as with create(): width and
+        height default to 1, x and y to 0, and id to the next id.
+
+        Args:
+            list_dictionaries (iterable): Dictionaries as returned by
+                                          to_dictionary()
+
+        Returns:
+            list: List of instances of the calling class
+
+        Raises:
+            TypeError: If width, height, x, or y is not an integer
+            ValueError: If width or height <= 0, or if x or y < 0
+
+        Example:
+            rects = Rectangle.create_many(Rectangle.from_json_string(data))
+        """
+        validate = cls.validate_integer
+        build = cls._build
+        instances = []
+        for dictionary in list_dictionaries:
+            get = dictionary.get
+            id = get("id")
+            instances.append(build(
+                id if id is not None else cls._next_id(),
+                validate("width", get("width", 1)),
+                validate("height", get("height", 1)),
+                validate("x", get("x", 0)),
+                validate("y", get("y", 0))
+            ))
+        return instances
+
+    # ========================================================================
+    # Batch update
+    # ========================================================================
+
+    @classmethod
+    def validate_changes(cls, changes):
+        """
+        Validates a set of attribute changes once, without applying it.
+
+        Args:
+            changes (dict): Attribute names and new values, as accepted
+                            by update(**changes). Unknown names are
+                            ignored, like update() does.
+
+        Returns:
+            dict: The validated changes, with keys among 'id', 'width',
+                  'height', 'x' and 'y'
+
+        Raises:
+            TypeError: If width, height, x, or y is not an integer
+            ValueError: If width or height <= 0, or if x or y < 0
+        """
+        validate = cls.validate_integer
+        values = {}
+        for key, value in changes.items():
+            if key in _GEOMETRY:
+                values[key] = validate(key, value)
+            elif key == "id":
+                values["id"] = value
+        return values
+
+    def _set_validated(self, values):
+        """
+        Applies changes returned by validate_changes().
+
+        The private attributes are assigned directly, the values being
+        already validated.
+
+        Args:
+            values (dict): Validated changes
+        """
+        if Base._trackers:
+            self._mark_dirty()
+        if "id" in values:
+            self.id = values["id"]
+        if "width" in values:
+            self.__width = values["width"]
+        if "height" in values:
+            self.__height = values["height"]
+        if "x" in values:
+            self.__x = values["x"]
+        if "y" in values:
+            self.__y = values["y"]
+
+    @classmethod
+    def update_many(cls, shapes, changes):
+        """
+        Applies many change sets to a collection of shapes, by id.
+
+        Each change set is validated once, as a whole, with the
+        validate_changes() of the class of its shape, then applied
+        directly. A change set that fails validation is not applied at
+        all (update() would stop in the middle) and is reported instead
+        of raising, so one bad record does not stop the batch. This
+        includes malformed items: an item that is not an (id, changes)
+        pair, or whose changes are not a mapping.
+
+        Args:
+            shapes (iterable): Rectangle or Square instances, or a
+                               ShapeStore
+            changes (iterable): (id, dict of changes) pairs, applied in
+                                order. When several shapes share an id,
+                                the first one is updated.
+
+        Returns:
+            list: (id, exception) pairs for the change sets that were not
+                  applied: KeyError for an unknown id, TypeError or
+                  ValueError for invalid values. An item that is not a
+                  pair is reported as (item, TypeError). Empty if all
+                  succeeded.
+
+        Example:
+            failures = Rectangle.update_many(rects, [(1, {"width": 3}),
+                                                     (2, {"x": -1})])
+            # failures: [(2, ValueError('x must be >= 0'))]
+        """
+        by_id = {}
+        for shape in shapes:
+            by_id.setdefault(shape.id, shape)
+
+        failures = []
+        for item in changes:
+            try:
+                id, change = item
+            except (TypeError, ValueError):
+                failures.append((item, TypeError(
+                    "expected an (id, changes) pair, got {!r}".format(item))))
+                continue
+            try:
+                if not isinstance(change, Mapping):
+                    raise TypeError("changes must be a mapping, got {}"
+                                    .format(type(change).__name__))
+                shape = by_id.get(id)
+                if shape is None:
+                    raise KeyError(id)
+                values = shape.validate_changes(change)
+                # Checks everything before assigning, so it can't be
+                # half-applied
+                shape._set_validated(values)
+            except (KeyError, TypeError, ValueError) as error:
+                failures.append((id, error))
+                continue
+            if values.get("id", id) != id:
+                del by_id[id]
+                by_id.setdefault(shape.id, shape)
+        return failures
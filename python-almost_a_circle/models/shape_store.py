@@ -0,0 +1,384 @@
+#!/usr/bin/python3
+"""
+ShapeStore module.
+Contains the ShapeStore class, a columnar collection of Rectangle and
+Square records, and the lightweight views it hands out.
+"""
+from array import array
+from operator import mul
+
+from models.base import Base
+from models.rectangle import Rectangle
+from models.square import Square
+
+
+class RectangleView(Rectangle):
+    """
+    Rectangle backed by one row of a ShapeStore.
+
+    A view holds no data itself: every property reads from and writes to
+    the columns of its store, with the same validation as Rectangle.
+    Because all the other methods (area, display, __str__, update,
+    to_dictionary) go through the properties, they are simply inherited.
+
+    Attributes:
+        _store (ShapeStore): The store holding the data
+        _index (int): Row of this shape in the store
+    """
+
+    __slots__ = ("_store", "_index")
+
+    # Saved by save_tagged() as a plain Rectangle
+    _tag = "Rectangle"
+
+    # Rectangle.to_json_record() reads the private attributes, which views
+    # don't have: use the generic version going through to_dictionary()
+    to_json_record = Base.to_json_record
+
+    def __init__(self, store, index):
+        """
+        Class constructor for RectangleView.
+
+        Args:
+            store (ShapeStore): The store holding the data
+            index (int): Row of this shape in the store
+
+        Note:
+            Base.__init__ is not called on purpose: a view must not
+            consume an id from the Base counter.
+        """
+        self._store = store
+        self._index = index
+
+    @property
+    def id(self):
+        """
+        Getter for id attribute.
+
+        Returns:
+            int: Id of the shape
+        """
+        return self._store._ids[self._index]
+
+    @id.setter
+    def id(self, value):
+        """
+        Setter for id attribute.
+
+        Args:
+            value (int): Id value to set
+        """
+        self._store._ids[self._index] = value
+
+    @property
+    def width(self):
+        """
+        Getter for width attribute.
+
+        Returns:
+            int: Width of the shape
+        """
+        return self._store._widths[self._index]
+
+    @width.setter
+    def width(self, value):
+        """
+        Setter for width attribute with validation.
+
+        Args:
+            value (int): Width value to set
+        """
+        self._store._widths[self._index] = self.validate_integer(
+            "width", value)
+
+    @property
+    def height(self):
+        """
+        Getter for height attribute.
+
+        Returns:
+            int: Height of the shape
+        """
+        return self._store._heights[self._index]
+
+    @height.setter
+    def height(self, value):
+        """
+        Setter for height attribute with validation.
+
+        Args:
+            value (int): Height value to set
+        """
+        self._store._heights[self._index] = self.validate_integer(
+            "height", value)
+
+    @property
+    def x(self):
+        """
+        Getter for x coordinate attribute.
+
+        Returns:
+            int: X coordinate of the shape
+        """
+        return self._store._xs[self._index]
+
+    @x.setter
+    def x(self, value):
+        """
+        Setter for x coordinate attribute with validation.
+
+        Args:
+            value (int): X coordinate value to set
+        """
+        self._store._xs[self._index] = self.validate_integer("x", value)
+
+    @property
+    def y(self):
+        """
+        Getter for y coordinate attribute.
+
+        Returns:
+            int: Y coordinate of the shape
+        """
+        return self._store._ys[self._index]
+
+    @y.setter
+    def y(self, value):
+        """
+        Setter for y coordinate attribute with validation.
+
+        Args:
+            value (int): Y coordinate value to set
+        """
+        self._store._ys[self._index] = self.validate_integer("y", value)
+
+    def _set_validated(self, values):
+        """
+        Applies changes returned by validate_changes() to the columns.
+
+        Every value, id included, is first checked against the columns
+        of the store, so the changes are applied entirely or not at all.
+
+        Args:
+            values (dict): Validated changes
+
+        Raises:
+            TypeError: If a value is not an integer
+            ValueError: If a value doesn't fit in the columns
+        """
+        store = self._store
+        check = array(store._ids.typecode)
+        for key, value in values.items():
+            try:
+                check.append(value)
+            except TypeError:
+                raise TypeError("{} must be an integer".format(key))
+            except OverflowError:
+                raise ValueError("{} does not fit in the store".format(key))
+        columns = {"id": store._ids, "width": store._widths,
+                   "height": store._heights, "x": store._xs, "y": store._ys}
+        for key, value in values.items():
+            columns[key][self._index] = value
+
+
+class SquareView(RectangleView, Square):
+    """
+    Square backed by one row of a ShapeStore.
+
+    The storage properties come from RectangleView, while size, __str__,
+    update and to_dictionary come from Square.
+    """
+
+    __slots__ = ()
+
+    _tag = "Square"
+
+
+class ShapeStore:
+    """
+    Columnar collection of Rectangle and Square records.
+
+    Instead of keeping one Python object per shape, the store keeps
+    id, width, height, x and y in parallel typed arrays (one machine
+    integer per value) plus one byte telling whether the row is a
+    Square. Indexing or iterating the store returns RectangleView or
+    SquareView objects that behave like Rectangle and Square but are
+    created on demand and write straight back to the columns.
+
+    Attributes:
+        _ids (array): Ids of the shapes
+        _widths (array): Widths of the shapes
+        _heights (array): Heights of the shapes
+        _xs (array): X coordinates of the shapes
+        _ys (array): Y coordinates of the shapes
+        _squares (array): 1 if the row is a Square, 0 otherwise
+    """
+
+    def __init__(self, shapes=None, typecode="q"):
+        """
+        Class constructor for ShapeStore.
+
+        Args:
+            shapes (iterable, optional): Rectangle or Square instances to
+                                         copy into the store
+            typecode (str, optional): array typecode used for the columns.
+                                      Defaults to "q" (signed 64 bits).
+        """
+        self._ids = array(typecode)
+        self._widths = array(typecode)
+        self._heights = array(typecode)
+        self._xs = array(typecode)
+        self._ys = array(typecode)
+        self._squares = array("b")
+        if shapes is not None:
+            self.extend(shapes)
+
+    def __len__(self):
+        """
+        Returns the number of shapes in the store.
+
+        Returns:
+            int: Number of shapes
+        """
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        """
+        Returns a view on the shape at index.
+
+        Args:
+            index (int): Row of the shape, negative values count from the end
+
+        Returns:
+            RectangleView or SquareView: View on the shape
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ShapeStore index out of range")
+        if self._squares[index]:
+            return SquareView(self, index)
+        return RectangleView(self, index)
+
+    def __iter__(self):
+        """
+        Iterates over views on every shape of the store.
+
+        Yields:
+            RectangleView or SquareView: View on each shape, in order
+        """
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, width, height, x=0, y=0, id=None, square=False):
+        """
+        Adds a new shape to the store after validating it.
+
+        Args:
+            width (int): Width of the shape
+            height (int): Height of the shape
+            x (int, optional): X coordinate. Defaults to 0.
+            y (int, optional): Y coordinate. Defaults to 0.
+            id (int, optional): ID value. If None, the next id of Base
+                                is used, like for a regular instance.
+            square (bool, optional): True to store a Square.
+                                     Defaults to False.
+
+        Returns:
+            RectangleView or SquareView: View on the new shape
+
+        Raises:
+            TypeError: If width, height, x, or y is not an integer
+            ValueError: If width or height <= 0, if x or y < 0, or if a
+                        square has different width and height
+        """
+        validate = Rectangle.validate_integer
+        width = validate("width", width)
+        height = validate("height", height)
+        x = validate("x", x)
+        y = validate("y", y)
+        if square and width != height:
+            raise ValueError("width and height of a square must be equal")
+        if id is None:
+            id = Base._next_id()
+        self._ids.append(id)
+        self._widths.append(width)
+        self._heights.append(height)
+        self._xs.append(x)
+        self._ys.append(y)
+        self._squares.append(1 if square else 0)
+        return self[len(self) - 1]
+
+    def add(self, shape):
+        """
+        Copies a Rectangle or Square instance into the store.
+
+        The id of the shape is kept, no new id is consumed.
+
+        Args:
+            shape (Rectangle): Rectangle or Square instance to copy
+
+        Returns:
+            RectangleView or SquareView: View on the copied shape
+        """
+        return self.append(shape.width, shape.height, shape.x, shape.y,
+                           shape.id, isinstance(shape, Square))
+
+    def extend(self, shapes):
+        """
+        Copies every Rectangle or Square instance of shapes into the store.
+
+        Args:
+            shapes (iterable): Rectangle or Square instances to copy
+        """
+        for shape in shapes:
+            self.add(shape)
+
+    def areas(self):
+        """
+        Returns the area of every shape of the store.
+
+        Returns:
+            array: Areas, in the same order as the shapes
+        """
+        return array(self._widths.typecode,
+                     map(mul, self._widths, self._heights))
+
+    def area(self):
+        """
+        Returns the total area of all the shapes of the store.
+
+        The products and the sum run over the columns directly, without
+        creating any view.
+
+        Returns:
+            int: Sum of width * height over the store
+        """
+        return sum(map(mul, self._widths, self._heights))
+
+    def update_many(self, changes):
+        """
+        Applies many change sets to the shapes of the store, by id.
+
+        See Rectangle.update_many(): each change set is validated once and
+        written to the columns, and failures are reported, not raised.
+
+        Args:
+            changes (iterable): (id, dict of changes) pairs
+
+        Returns:
+            list: (id, exception) pairs for the change sets not applied
+        """
+        return Rectangle.update_many(self, changes)
+
+    def to_dictionaries(self):
+        """
+        Returns the dictionary representation of every shape of the store.
+
+        Returns:
+            list: List of dictionaries, as returned by to_dictionary()
+        """
+        return [shape.to_dictionary() for shape in self]
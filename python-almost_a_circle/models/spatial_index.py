@@ -0,0 +1,326 @@
+#!/usr/bin/python3
+"""
+Spatial index module.
+Contains the SpatialIndex class, a uniform grid over Rectangle and Square
+positions that answers overlap, containment and nearest queries without
+scanning every shape.
+"""
+import heapq
+import math
+
+
+class SpatialIndex:
+    """
+    Uniform grid index over Rectangle and Square instances.
+
+    The plane is cut into square cells of cell_size units. Each shape is
+    registered in every cell its area touches, so a query only looks at
+    the shapes of the cells it touches itself. A shape covers the area
+    [x, x + width) x [y, y + height).
+
+    The position of each shape is recorded when it is inserted. When a
+    shape is changed, the index must be told: either use update() which
+    calls shape.update() and moves the shape, or call refresh() after
+    changing it directly.
+
+    Attributes:
+        cell_size (int): Size of a grid cell
+        _cells (dict): Maps (column, row) to the set of shapes in that cell
+        _entries (dict): Maps each shape to (order, x0, y0, x1, y1), its
+                         insertion order and its area when inserted
+        _order (int): Insertion counter, used to return results in
+                      insertion order
+    """
+
+    def __init__(self, shapes=None, cell_size=64):
+        """
+        Class constructor for SpatialIndex.
+
+        Args:
+            shapes (iterable, optional): Rectangle or Square instances to
+                                         insert
+            cell_size (int, optional): Size of a grid cell. Should be close
+                                       to the typical shape size.
+                                       Defaults to 64.
+
+        Raises:
+            TypeError: If cell_size is not an integer
+            ValueError: If cell_size <= 0
+        """
+        if not isinstance(cell_size, int):
+            raise TypeError("cell_size must be an integer")
+        if cell_size <= 0:
+            raise ValueError("cell_size must be > 0")
+        self.cell_size = cell_size
+        self._cells = {}
+        self._entries = {}
+        self._order = 0
+        if shapes is not None:
+            for shape in shapes:
+                self.insert(shape)
+
+    @classmethod
+    def from_file(cls, shape_class, cell_size=64):
+        """
+        Returns an index over the shapes saved in <Class name>.json.
+
+        Args:
+            shape_class (type): Rectangle, Square or another Base subclass
+            cell_size (int, optional): Size of a grid cell. Defaults to 64.
+
+        Returns:
+            SpatialIndex: Index over shape_class.load_from_file()
+        """
+        return cls(shape_class.load_from_file(), cell_size)
+
+    def __len__(self):
+        """
+        Returns the number of shapes in the index.
+
+        Returns:
+            int: Number of shapes
+        """
+        return len(self._entries)
+
+    def __contains__(self, shape):
+        """
+        Tells whether shape is in the index.
+
+        Args:
+            shape (Rectangle): Shape to look for
+
+        Returns:
+            bool: True if shape was inserted and not removed
+        """
+        return shape in self._entries
+
+    def _cell_range(self, x0, y0, x1, y1):
+        """
+        Returns the keys of the cells touched by the area [x0, x1) x [y0, y1).
+
+        Args:
+            x0 (int): Left edge
+            y0 (int): Top edge
+            x1 (int): Right edge (excluded)
+            y1 (int): Bottom edge (excluded)
+
+        Returns:
+            list: List of (column, row) keys
+        """
+        size = self.cell_size
+        columns = range(x0 // size, (x1 - 1) // size + 1)
+        rows = range(y0 // size, (y1 - 1) // size + 1)
+        return [(column, row) for column in columns for row in rows]
+
+    def insert(self, shape):
+        """
+        Adds shape to the index.
+
+        Inserting a shape that is already in the index refreshes it.
+
+        Args:
+            shape (Rectangle): Rectangle or Square instance
+        """
+        if shape in self._entries:
+            self.remove(shape)
+        x0 = shape.x
+        y0 = shape.y
+        x1 = x0 + shape.width
+        y1 = y0 + shape.height
+        self._entries[shape] = (self._order, x0, y0, x1, y1)
+        self._order += 1
+        for key in self._cell_range(x0, y0, x1, y1):
+            self._cells.setdefault(key, set()).add(shape)
+
+    def remove(self, shape):
+        """
+        Removes shape from the index.
+
+        The cells are found from the position recorded at insertion, so
+        this works even if the shape was changed in between.
+
+        Args:
+            shape (Rectangle): Shape to remove
+
+        Raises:
+            KeyError: If shape is not in the index
+        """
+        _, x0, y0, x1, y1 = self._entries.pop(shape)
+        for key in self._cell_range(x0, y0, x1, y1):
+            cell = self._cells[key]
+            cell.discard(shape)
+            if not cell:
+                del self._cells[key]
+
+    def refresh(self, shape):
+        """
+        Moves shape to its current position in the index.
+
+        Call this after changing the position or the size of a shape
+        without going through update().
+
+        Args:
+            shape (Rectangle): Shape already in the index
+        """
+        self.remove(shape)
+        self.insert(shape)
+
+    def update(self, shape, *args, **kwargs):
+        """
+        Calls shape.update() and keeps the index in sync.
+
+        Args:
+            shape (Rectangle): Shape already in the index
+            *args: Passed to shape.update()
+            **kwargs: Passed to shape.update()
+        """
+        shape.update(*args, **kwargs)
+        self.refresh(shape)
+
+    def _sorted(self, shapes):
+        """
+        Returns shapes as a list in insertion order.
+
+        Args:
+            shapes (iterable): Shapes of the index
+
+        Returns:
+            list: The shapes, in the order they were inserted
+        """
+        entries = self._entries
+        return sorted(shapes, key=lambda shape: entries[shape][0])
+
+    def overlapping(self, x, y, width, height):
+        """
+        Returns the shapes overlapping [x, x + width) x [y, y + height).
+
+        Shapes that only share an edge with the box do not overlap it.
+
+        Args:
+            x (int): X coordinate of the box
+            y (int): Y coordinate of the box
+            width (int): Width of the box
+            height (int): Height of the box
+
+        Returns:
+            list: Overlapping shapes, in insertion order
+        """
+        if width <= 0 or height <= 0:
+            return []
+        x1 = x + width
+        y1 = y + height
+        found = set()
+        entries = self._entries
+        size = self.cell_size
+        columns = range(x // size, (x1 - 1) // size + 1)
+        rows = range(y // size, (y1 - 1) // size + 1)
+        if len(columns) * len(rows) > len(self._cells):
+            # Large box: only look at the cells that hold shapes
+            keys = [key for key in self._cells
+                    if key[0] in columns and key[1] in rows]
+        else:
+            keys = self._cell_range(x, y, x1, y1)
+        for key in keys:
+            for shape in self._cells.get(key, ()):
+                if shape in found:
+                    continue
+                _, sx0, sy0, sx1, sy1 = entries[shape]
+                if sx0 < x1 and x < sx1 and sy0 < y1 and y < sy1:
+                    found.add(shape)
+        return self._sorted(found)
+
+    def containing(self, x, y):
+        """
+        Returns the shapes that contain the point (x, y).
+
+        Args:
+            x (int): X coordinate of the point
+            y (int): Y coordinate of the point
+
+        Returns:
+            list: Shapes containing the point, in insertion order
+        """
+        size = self.cell_size
+        entries = self._entries
+        found = []
+        for shape in self._cells.get((x // size, y // size), ()):
+            _, sx0, sy0, sx1, sy1 = entries[shape]
+            if sx0 <= x < sx1 and sy0 <= y < sy1:
+                found.append(shape)
+        return self._sorted(found)
+
+    def nearest(self, x, y, k=1):
+        """
+        Returns the k shapes closest to the point (x, y).
+
+        The distance between a point and a shape is 0 when the shape
+        contains the point, and the euclidean distance to its closest
+        edge otherwise. Cells are visited in rings of growing size
+        around the point, and the search stops as soon as no shape
+        farther away can beat the k shapes found so far. Once the rings
+        have covered more cells than the grid holds (a point far from
+        the shapes), the remaining shapes are scanned directly instead,
+        so the cost never exceeds a scan of the index.
+
+        Args:
+            x (int): X coordinate of the point
+            y (int): Y coordinate of the point
+            k (int, optional): Number of shapes to return. Defaults to 1.
+
+        Returns:
+            list: Up to k shapes, closest first (ties in insertion order)
+        """
+        if k <= 0:
+            return []
+        size = self.cell_size
+        entries = self._entries
+        column = x // size
+        row = y // size
+
+        seen = set()
+        best = []
+
+        def consider(shape):
+            """
+            Keeps shape if it is among the k closest so far.
+            """
+            seen.add(shape)
+            order, sx0, sy0, sx1, sy1 = entries[shape]
+            dx = max(sx0 - x, 0, x - sx1)
+            dy = max(sy0 - y, 0, y - sy1)
+            # Max-heap on (distance, order) through negated keys,
+            # orders are unique so shapes are never compared
+            item = (-math.hypot(dx, dy), -order, shape)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+        radius = 0
+        visited = 0
+        while len(seen) < len(entries):
+            if visited > len(self._cells):
+                for shape in entries:
+                    if shape not in seen:
+                        consider(shape)
+                break
+            if radius == 0:
+                ring = [(column, row)]
+            else:
+                ring = [(c, r)
+                        for c in range(column - radius, column + radius + 1)
+                        for r in (row - radius, row + radius)]
+                ring += [(c, r)
+                         for c in (column - radius, column + radius)
+                         for r in range(row - radius + 1, row + radius)]
+            visited += len(ring)
+            for key in ring:
+                for shape in self._cells.get(key, ()):
+                    if shape not in seen:
+                        consider(shape)
+            # Any shape not seen yet is at least radius * size away
+            if len(best) == k and -best[0][0] <= radius * size:
+                break
+            radius += 1
+
+        return [item[2] for item in sorted(best, reverse=True)]
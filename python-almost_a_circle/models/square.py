@@ -3,8 +3,13 @@
 Square module
 This module contains the Square class that inherits from Rectangle
 """
+import json
+
+from models.base import Base
 from models.rectangle import Rectangle
 
+_JSON_RECORD = '{"id": %d, "size": %d, "x": %d, "y": %d}'
+
 
 class Square(Rectangle):
     """
@@ -23,6 +28,11 @@ class Square(Rectangle):
         - y: Y coordinate position
     """
 
+    __slots__ = ()
+
+    # Dummy size used by Base.create()
+    _dummy_args = (1,)
+
     def __init__(self, size, x=0, y=0, id=None):
         """
         Class constructor for Square.
@@ -123,6 +133,8 @@ class Square(Rectangle):
             This method overrides Rectangle's update() method because Square
             has a different argument order (size instead of width/height).
         """
+        if Base._trackers:
+            self._mark_dirty()
         if args:
             # If args exist and is not empty, use *args and ignore **kwargs
             # Square-specific attribute order: id, size, x, y
@@ -172,3 +184,91 @@ class Square(Rectangle):
             "x": self.x,
             "y": self.y
         }
+
+    def to_json_record(self):
+        """
+        Returns the JSON text of to_dictionary(), without building it.
+
+        Same as Rectangle.to_json_record() with the Square keys.
+
+        Returns:
+            str: JSON object text
+        """
+        id = self.id
+        size = self.width
+        x = self.x
+        y = self.y
+        if (type(id) is int and type(size) is int
+                and type(x) is int and type(y) is int
+                and type(self).to_dictionary is Square.to_dictionary):
+            return _JSON_RECORD % (id, size, x, y)
+        return json.dumps(self.to_dictionary())
+
+    # ========================================================================
+    # Bulk construction (Square-specific)
+    # ========================================================================
+
+    @classmethod
+    def create_many(cls, list_dictionaries):
+        """
+        Returns a list of instances built from a list of dictionaries.
+
+        Same as Rectangle.create_many() but reads 'size' instead of
+        'width' and 'height'. size is validated once and used for both.
+
+        Args:
+            list_dictionaries (iterable): Dictionaries as returned by
+                                          to_dictionary()
+
+        Returns:
+            list: List of Square instances
+
+        Raises:
+            TypeError: If size, x, or y is not an integer
+            ValueError: If size <= 0, or if x or y < 0
+        """
+        validate = cls.validate_integer
+        build = cls._build
+        instances = []
+        for dictionary in list_dictionaries:
+            get = dictionary.get
+            id = get("id")
+            size = validate("width", get("size", 1))
+            instances.append(build(
+                id if id is not None else cls._next_id(),
+                size,
+                size,
+                validate("x", get("x", 0)),
+                validate("y", get("y", 0))
+            ))
+        return instances
+
+    # ========================================================================
+    # Batch update (Square-specific)
+    # ========================================================================
+
+    @classmethod
+    def validate_changes(cls, changes):
+        """
+        Validates a set of attribute changes once, without applying it.
+
+        Same as Rectangle.validate_changes() but also accepts 'size',
+        which is validated once and used for both width and height.
+
+        Args:
+            changes (dict): Attribute names and new values
+
+        Returns:
+            dict: The validated changes, with keys among 'id', 'width',
+                  'height', 'x' and 'y'
+
+        Raises:
+            TypeError: If size, x, or y is not an integer
+            ValueError: If size <= 0, or if x or y < 0
+        """
+        values = super().validate_changes(changes)
+        if "size" in changes:
+            size = cls.validate_integer("width", changes["size"])
+            values["width"] = size
+            values["height"] = size
+        return values
@@ -0,0 +1,228 @@
+#!/usr/bin/python3
+"""
+Storage module.
+Contains the storage backends used by Base.save() and Base.load():
+JSONFileStorage (the default, <Class name>.json files) and SQLiteStorage
+(one indexed table per class in a SQLite database).
+
+A backend is any object with:
+    - save(cls, list_objs): replace the saved instances of cls
+    - load(cls, where=None): return the saved instances of cls, keeping
+      only those matching every (field, operator, value) filter of where
+"""
+import operator
+
+OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _check_filters(where, fields):
+    """
+    Validates filters against the known fields and operators.
+
+    Args:
+        where (iterable): (field, operator, value) filters, or None
+        fields (iterable): Names of the fields that can be filtered
+
+    Returns:
+        list: The filters as a list
+
+    Raises:
+        ValueError: If a field or an operator is unknown
+    """
+    filters = list(where) if where is not None else []
+    for field, op, _ in filters:
+        if field not in fields:
+            raise ValueError("Unknown field: {}".format(field))
+        if op not in OPERATORS:
+            raise ValueError("Unknown operator: {}".format(op))
+    return filters
+
+
+class JSONFileStorage:
+    """
+    Storage backend writing <Class name>.json in the current directory.
+
+    This is the default backend: it uses save_to_file() and
+    load_from_file(), and applies filters in Python after loading.
+    """
+
+    def save(self, cls, list_objs):
+        """
+        Saves list_objs to <Class name>.json.
+
+        Args:
+            cls (type): Base subclass
+            list_objs (list): Instances to save, or None
+        """
+        cls.save_to_file(list_objs)
+
+    def load(self, cls, where=None):
+        """
+        Loads the instances saved in <Class name>.json.
+
+        Args:
+            cls (type): Base subclass
+            where (iterable, optional): (field, operator, value) filters,
+                                        e.g. [("width", ">", 100)]
+
+        Returns:
+            list: Matching instances, in saved order
+
+        Raises:
+            ValueError: If a field or an operator is unknown
+        """
+        instances = cls.load_from_file()
+        if where is None or not instances:
+            return instances
+        filters = _check_filters(where, instances[0].to_dictionary())
+        matching = []
+        for obj in instances:
+            dictionary = obj.to_dictionary()
+            if all(OPERATORS[op](dictionary[field], value)
+                   for field, op, value in filters):
+                matching.append(obj)
+        return matching
+
+
+class SQLiteStorage:
+    """
+    Storage backend keeping one table per class in a SQLite database.
+
+    Each table has one INTEGER column per key of to_dictionary() and one
+    index per column. Saves replace the whole table with a single
+    executemany() inside one explicit transaction (DROP and CREATE
+    included), so a failed save leaves the old rows in place. Filters
+    are turned into a parameterized WHERE clause so that SQLite does
+    the filtering, using the indexes.
+
+    Attributes:
+        path (str): Path of the database file (":memory:" for a private
+                    in-memory database)
+        _connection (sqlite3.Connection): Open connection
+    """
+
+    def __init__(self, path="shapes.db"):
+        """
+        Class constructor for SQLiteStorage.
+
+        Args:
+            path (str, optional): Path of the database file.
+                                  Defaults to "shapes.db".
+        """
+        import sqlite3
+
+        self.path = path
+        # Autocommit mode: save() opens and ends its transaction itself,
+        # since the sqlite3 module would run DROP and CREATE outside one
+        self._connection = sqlite3.connect(path, isolation_level=None)
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        self._connection.close()
+
+    def _columns(self, table):
+        """
+        Returns the column names of a table.
+
+        Args:
+            table (str): Table name
+
+        Returns:
+            list: Column names in table order, empty if the table
+                  doesn't exist
+        """
+        rows = self._connection.execute(
+            "PRAGMA table_info(\"{}\")".format(table)).fetchall()
+        return [row[1] for row in rows]
+
+    def save(self, cls, list_objs):
+        """
+        Replaces the table of cls with list_objs.
+
+        All the rows are built and checked before the table is touched,
+        and the whole replacement runs in one transaction: if anything
+        fails, the saved rows are left as they were.
+
+        Args:
+            cls (type): Base subclass
+            list_objs (list): Instances to save, or None
+
+        Raises:
+            ValueError: If the instances don't all have the same fields
+        """
+        table = cls.__name__
+        dictionaries = ([obj.to_dictionary() for obj in list_objs]
+                        if list_objs is not None else [])
+        fields = (list(dictionaries[0]) if dictionaries
+                  else self._columns(table) or ["id"])
+        rows = []
+        for dictionary in dictionaries:
+            if dictionary.keys() != set(fields):
+                raise ValueError("Cannot save {} in table {} with fields {}"
+                                 .format(dictionary, table, fields))
+            rows.append([dictionary[field] for field in fields])
+        columns = ", ".join("\"{}\" INTEGER".format(field) for field in fields)
+        names = ", ".join("\"{}\"".format(field) for field in fields)
+        marks = ", ".join("?" * len(fields))
+
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            connection.execute("DROP TABLE IF EXISTS \"{}\"".format(table))
+            connection.execute(
+                "CREATE TABLE \"{}\" ({})".format(table, columns))
+            connection.executemany(
+                "INSERT INTO \"{}\" ({}) VALUES ({})".format(
+                    table, names, marks), rows)
+            for field in fields:
+                connection.execute(
+                    "CREATE INDEX \"{0}_{1}\" ON \"{0}\" (\"{1}\")".format(
+                        table, field))
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def load(self, cls, where=None):
+        """
+        Loads the instances of cls, filtering in SQL.
+
+        Args:
+            cls (type): Base subclass
+            where (iterable, optional): (field, operator, value) filters,
+                                        e.g. [("width", ">", 100)]
+
+        Returns:
+            list: Matching instances, in saved order. Empty if nothing was
+                  saved for cls.
+
+        Raises:
+            ValueError: If a field or an operator is unknown
+        """
+        table = cls.__name__
+        fields = self._columns(table)
+        if not fields:
+            return []
+        filters = _check_filters(where, fields)
+
+        query = "SELECT {} FROM \"{}\"".format(
+            ", ".join("\"{}\"".format(field) for field in fields), table)
+        if filters:
+            query += " WHERE " + " AND ".join(
+                "\"{}\" {} ?".format(field, "=" if op == "==" else op)
+                for field, op, _ in filters)
+        query += " ORDER BY rowid"
+
+        rows = self._connection.execute(
+            query, [value for _, _, value in filters])
+        return cls.create_many(dict(zip(fields, row)) for row in rows)
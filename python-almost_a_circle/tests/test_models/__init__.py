@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""
+Unittest package for the models package.
+"""
+import os
+import tempfile
+import unittest
+
+
+class TempDirTestCase(unittest.TestCase):
+    """
+    Test case running each test in a fresh temporary directory.
+    """
+
+    def setUp(self):
+        """
+        Works in a temporary directory.
+        """
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        """
+        Goes back to the original directory.
+        """
+        os.chdir(self.cwd)
+        self.directory.cleanup()
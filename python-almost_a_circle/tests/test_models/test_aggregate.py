@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/aggregate.py.
+"""
+import unittest
+
+from models.aggregate import ShapeAggregator, aggregate, aggregate_file
+from models.rectangle import Rectangle
+from models.shape_store import ShapeStore
+from models.square import Square
+
+from . import TempDirTestCase
+
+
+class TestAggregate(TempDirTestCase):
+    """
+    Tests for ShapeAggregator and the functions building one.
+    """
+
+    def setUp(self):
+        """
+        Works in a temporary directory with a few shapes.
+        """
+        super().setUp()
+        self.shapes = [Rectangle(2, 3, 1, 1, 1), Square(4, 5, 0, 2),
+                       Rectangle(1, 1, 10, 20, 3)]
+
+    def test_statistics(self):
+        """
+        One pass gives count, area, bounding box and percentiles.
+        """
+        result = aggregate(self.shapes)
+        self.assertEqual(result.count, 3)
+        self.assertEqual(result.total_area, 6 + 16 + 1)
+        self.assertEqual(result.bounding_box(), (1, 0, 10, 21))
+        self.assertEqual(result.percentile(50), 6)
+        self.assertEqual(result.percentile(100), 16)
+
+    def test_sources_agree(self):
+        """
+        A list, a ShapeStore and a saved file give the same statistics.
+        """
+        Rectangle.save_to_file(self.shapes)
+        expected = aggregate(self.shapes).to_dictionary()
+        self.assertEqual(aggregate(ShapeStore(self.shapes)).to_dictionary(),
+                         expected)
+        self.assertEqual(aggregate_file(Rectangle).to_dictionary(),
+                         expected)
+
+    def test_empty(self):
+        """
+        An empty aggregator has no bounding box nor percentile.
+        """
+        empty = ShapeAggregator()
+        self.assertIsNone(empty.bounding_box())
+        self.assertIsNone(empty.percentile(50))
+        self.assertEqual(aggregate_file(Square).count, 0)
+        with self.assertRaises(ValueError):
+            empty.percentile(101)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/aio.py.
+"""
+import asyncio
+import os
+import unittest
+
+from models.rectangle import Rectangle
+
+from . import TempDirTestCase
+
+
+class TestAio(TempDirTestCase):
+    """
+    Tests for asave_to_file(), aload_from_file() and aiter_from_file().
+    """
+
+    def setUp(self):
+        """
+        Works in a temporary directory.
+        """
+        super().setUp()
+        self.shapes = [Rectangle(i, 2, 0, 0, i) for i in range(1, 11)]
+
+    def test_same_file_as_save_to_file(self):
+        """
+        asave_to_file() writes the same text as save_to_file().
+        """
+        Rectangle.save_to_file(self.shapes)
+        with open("Rectangle.json") as file:
+            expected = file.read()
+        asyncio.run(Rectangle.asave_to_file(self.shapes, chunk_size=3))
+        with open("Rectangle.json") as file:
+            self.assertEqual(file.read(), expected)
+
+    def test_load_and_iterate(self):
+        """
+        The instances are loaded back in order, whole or one at a time.
+        """
+        Rectangle.save_to_file(self.shapes)
+
+        async def iterate():
+            """
+            Collects the ids yielded by aiter_from_file().
+            """
+            return [r.id async for r in Rectangle.aiter_from_file(3)]
+
+        loaded = asyncio.run(Rectangle.aload_from_file(chunk_size=4))
+        self.assertEqual([r.to_dictionary() for r in loaded],
+                         [r.to_dictionary() for r in self.shapes])
+        self.assertEqual(asyncio.run(iterate()), list(range(1, 11)))
+
+    def test_failed_save_keeps_old_file(self):
+        """
+        A save failing part way leaves the old file and no temporary file.
+        """
+        Rectangle.save_to_file(self.shapes[:1])
+
+        def failing():
+            """
+            Yields a few shapes, then fails.
+            """
+            yield from self.shapes[:5]
+            raise RuntimeError("failed")
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(Rectangle.asave_to_file(failing(), chunk_size=2))
+        self.assertEqual(os.listdir("."), ["Rectangle.json"])
+        self.assertEqual([r.id for r in Rectangle.load_from_file()], [1])
+
+    def test_save_is_a_log_snapshot(self):
+        """
+        Like save_to_file(), a save removes the log and the dirty marks.
+        """
+        Rectangle.track_changes()
+        try:
+            Rectangle.log_update(self.shapes[0], width=5)
+            self.shapes[0].width = 7
+            asyncio.run(Rectangle.asave_to_file(self.shapes, chunk_size=3))
+            self.assertEqual(Rectangle.load_from_log()[0].width, 7)
+            self.assertEqual(Rectangle.dirty(), [])
+        finally:
+            Rectangle.track_changes(False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/base.py.
+"""
+import subprocess
+import sys
+import unittest
+
+from models.rectangle import Rectangle
+from models.square import Square
+
+from . import TempDirTestCase
+
+
+class TestLoad(TempDirTestCase):
+    """
+    Tests for save_to_file() and load_from_file().
+    """
+
+    def test_round_trip(self):
+        """
+        Saved instances are loaded back with the same attributes.
+        """
+        shapes = [Rectangle(2, 3, 4, 5, 10), Rectangle(1, 1, id=11)]
+        Rectangle.save_to_file(shapes)
+        self.assertEqual([r.to_dictionary() for r in
+                          Rectangle.load_from_file()],
+                         [r.to_dictionary() for r in shapes])
+        Square.save_to_file(None)
+        self.assertEqual(Square.load_from_file(), [])
+
+    def test_missing_file(self):
+        """
+        A missing file loads as an empty list.
+        """
+        self.assertEqual(Rectangle.load_from_file(), [])
+
+    def test_load_takes_no_ids(self):
+        """
+        Loading records with ids takes no id from the counter, whatever
+        the path used.
+        """
+        Square.save_to_file([Square(2, id=1), Square(3, id=2)])
+        before = Square(1).id
+        Square.load_from_file()
+        list(Square.iter_from_file())
+        Square.save_to_file([Square(2, id=1)], compression="gzip")
+        Square.load_from_file()
+        self.assertEqual(Square(1).id, before + 1)
+
+    def test_create_many_matches_create(self):
+        """
+        create_many() builds the same instances as create().
+        """
+        dictionaries = [{"id": 5, "width": 2, "height": 3, "x": 1, "y": 0},
+                        {"id": 6, "size": 4, "x": 2, "y": 1}]
+        self.assertEqual(
+            Rectangle.create_many(dictionaries[:1])[0].to_dictionary(),
+            Rectangle.create(**dictionaries[0]).to_dictionary())
+        self.assertEqual(
+            Square.create_many(dictionaries[1:])[0].to_dictionary(),
+            Square.create(**dictionaries[1]).to_dictionary())
+        with self.assertRaises(ValueError):
+            Rectangle.create_many([{"id": 1, "width": 0}])
+
+
+class TestTrackChanges(TempDirTestCase):
+    """
+    Tests for track_changes(), save_dirty() and load_from_log().
+    """
+
+    def setUp(self):
+        """
+        Tracks Rectangle in a temporary directory.
+        """
+        super().setUp()
+        Rectangle.track_changes()
+
+    def tearDown(self):
+        """
+        Stops tracking Rectangle.
+        """
+        Rectangle.track_changes(False)
+        super().tearDown()
+
+    def test_full_save_clears_marks(self):
+        """
+        Instances saved by save_to_file() or save_to_file_stream() are
+        no longer dirty.
+        """
+        shapes = [Rectangle(1, 1, id=1), Rectangle(2, 2, id=2)]
+        Rectangle.save_to_file(shapes)
+        self.assertEqual(Rectangle.save_dirty(), 0)
+        shapes[0].width = 5
+        Rectangle.save_to_file_stream(iter(shapes))
+        self.assertEqual(Rectangle.dirty(), [])
+
+    def test_full_save_supersedes_log(self):
+        """
+        The log written before a full save is not replayed over it.
+        """
+        shape = Rectangle(1, 1, id=1)
+        Rectangle.save_dirty()
+        shape.width = 7
+        Rectangle.save_to_file([shape])
+        self.assertEqual(Rectangle.load_from_log()[0].width, 7)
+
+    def test_id_assignment_is_tracked(self):
+        """
+        Assigning id replaces the old record when the log is replayed.
+        """
+        shape = Rectangle(1, 1, id=1)
+        Rectangle.save_to_file([shape])
+        shape.id = 20
+        self.assertEqual(Rectangle.save_dirty(), 1)
+        self.assertEqual([r.id for r in Rectangle.load_from_log()], [20])
+
+
+class TestImports(unittest.TestCase):
+    """
+    Tests for the modules loaded by importing models.base.
+    """
+
+    def test_optional_modules_not_imported(self):
+        """
+        The modules of optional features are only imported on use.
+        """
+        code = ("import sys, models.rectangle; print(sorted(set(sys.argv[1:])"
+                " & set(sys.modules)))")
+        modules = ["asyncio", "bz2", "concurrent.futures", "gzip", "lzma",
+                   "mmap", "sqlite3"]
+        output = subprocess.run([sys.executable, "-c", code] + modules,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/binary_format.py.
+"""
+import os
+import shutil
+import unittest
+
+from models import binary_format
+from models.rectangle import Rectangle
+from models.square import Square
+
+from . import TempDirTestCase
+
+
+class TestBinaryFormat(TempDirTestCase):
+    """
+    Tests for the binary shape files and their index.
+    """
+
+    def test_round_trip(self):
+        """
+        Saved instances are loaded back with the same attributes.
+        """
+        shapes = [Square(2, 1, 1, 10), Square(3, id=11)]
+        Square.save_to_file(shapes, "binary")
+        self.assertEqual([s.to_dictionary() for s in
+                          Square.load_from_file("binary")],
+                         [s.to_dictionary() for s in shapes])
+
+    def test_get_from_file(self):
+        """
+        One instance is found by id, a missing id gives None.
+        """
+        Rectangle.save_to_file([Rectangle(i, 1, id=i) for i in
+                                range(1, 100)], "binary")
+        self.assertEqual(Rectangle.get_from_file(42).width, 42)
+        self.assertIsNone(Rectangle.get_from_file(500))
+
+    def test_stale_index(self):
+        """
+        An index left from another save never returns another shape.
+        """
+        Rectangle.save_to_file([Rectangle(1, 1, id=1),
+                                Rectangle(2, 2, id=2)], "binary")
+        shutil.copy("Rectangle.idx", "old.idx")
+        Rectangle.save_to_file([Rectangle(3, 3, id=2)], "binary")
+        shutil.copy("old.idx", "Rectangle.idx")
+        with self.assertRaises(ValueError):
+            Rectangle.get_from_file(2)
+        Rectangle.save_to_file([Rectangle(3, 3, id=5),
+                                Rectangle(4, 4, id=6)], "binary")
+        shutil.copy("old.idx", "Rectangle.idx")
+        with self.assertRaises(ValueError):
+            Rectangle.get_from_file(1)
+
+    def test_truncated_index(self):
+        """
+        A truncated index is reported as invalid.
+        """
+        Rectangle.save_to_file([Rectangle(1, 1, id=1)], "binary")
+        os.truncate("Rectangle.idx", 20)
+        with self.assertRaises(ValueError):
+            binary_format.find_record("Rectangle.bin", "Rectangle.idx", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
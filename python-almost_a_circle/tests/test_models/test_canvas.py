@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/canvas.py.
+"""
+import io
+import unittest
+
+from models.canvas import display_shapes, render_shapes
+from models.rectangle import Rectangle
+from models.square import Square
+
+
+class TestCanvas(unittest.TestCase):
+    """
+    Tests for render_shapes() and display_shapes().
+    """
+
+    def test_render(self):
+        """
+        Shapes are drawn at their position on one canvas.
+        """
+        self.assertEqual(render_shapes([Rectangle(2, 1),
+                                        Rectangle(1, 2, 3, 1)]),
+                         "##\n   #\n   #\n")
+
+    def test_overlap(self):
+        """
+        Overlapping shapes are drawn once.
+        """
+        self.assertEqual(render_shapes([Square(2), Square(2, 1, 1)]),
+                         "##\n###\n ##\n")
+
+    def test_empty(self):
+        """
+        No shape gives an empty canvas.
+        """
+        self.assertEqual(render_shapes([]), "")
+
+    def test_display(self):
+        """
+        display_shapes() writes the rendered canvas.
+        """
+        shapes = [Rectangle(3, 2, 1, 1)]
+        output = io.StringIO()
+        display_shapes(shapes, output)
+        self.assertEqual(output.getvalue(), render_shapes(shapes))
+        self.assertEqual(output.getvalue(), "\n ###\n ###\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
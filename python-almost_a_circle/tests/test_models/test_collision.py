@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/collision.py.
+"""
+import random
+import unittest
+
+from models.collision import collide, collide_columns
+from models.rectangle import Rectangle
+from models.shape_store import ShapeStore
+from models.square import Square
+
+
+class TestCollision(unittest.TestCase):
+    """
+    Tests for collide() and collide_columns().
+    """
+
+    def test_pairs(self):
+        """
+        Overlapping and containing pairs are found, touching edges are
+        not an overlap.
+        """
+        outer = Rectangle(10, 10, 0, 0, 1)
+        inner = Square(2, 3, 3, 2)
+        touching = Rectangle(5, 5, 10, 0, 3)
+        overlapping, containing = collide([outer, inner, touching])
+        self.assertEqual(overlapping, [(outer, inner)])
+        self.assertEqual(containing, [(outer, inner)])
+
+    def test_store(self):
+        """
+        A ShapeStore gives the same pairs, as views.
+        """
+        store = ShapeStore([Rectangle(4, 4, 0, 0, 1), Square(4, 2, 2, 2)])
+        overlapping, containing = collide(store)
+        self.assertEqual([(a.id, b.id) for a, b in overlapping], [(1, 2)])
+        self.assertEqual(containing, [])
+
+    def test_matches_nested_loop(self):
+        """
+        The sweep finds exactly the pairs of a quadratic comparison.
+        """
+        generator = random.Random(7)
+        count = 300
+        xs = [generator.randrange(200) for _ in range(count)]
+        ys = [generator.randrange(200) for _ in range(count)]
+        widths = [generator.randint(1, 20) for _ in range(count)]
+        heights = [generator.randint(1, 20) for _ in range(count)]
+        expected = [(i, j) for i in range(count) for j in range(i + 1, count)
+                    if xs[j] < xs[i] + widths[i] and xs[i] < xs[j] + widths[j]
+                    and ys[j] < ys[i] + heights[i]
+                    and ys[i] < ys[j] + heights[j]]
+        overlapping, _ = collide_columns(xs, ys, widths, heights)
+        self.assertEqual(overlapping, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/compressed.py and the compression option of
+save_to_file() and load_from_file().
+"""
+import gzip
+import os
+import unittest
+
+from models import compressed, flyweight, parallel_loader
+from models.aggregate import aggregate_file
+from models.rectangle import Rectangle
+
+from . import TempDirTestCase
+
+
+class TestCompression(TempDirTestCase):
+    """
+    Tests for compressed shape files.
+    """
+
+    def setUp(self):
+        """
+        Works in a temporary directory.
+        """
+        super().setUp()
+        self.shapes = [Rectangle(i + 1, 2, id=i) for i in range(1, 50)]
+
+    def dictionaries(self, shapes):
+        """
+        Returns the dictionaries of shapes.
+        """
+        return [shape.to_dictionary() for shape in shapes]
+
+    def test_round_trip(self):
+        """
+        Each codec gives back the saved shapes, by argument or extension.
+        """
+        for codec, extension in compressed.CODECS.items():
+            Rectangle.save_to_file(self.shapes, compression=codec)
+            self.assertTrue(os.path.exists("Rectangle.json" + extension))
+            self.assertEqual(self.dictionaries(Rectangle.load_from_file()),
+                             self.dictionaries(self.shapes))
+            self.assertEqual(
+                self.dictionaries(Rectangle.load_from_file(compression=codec)),
+                self.dictionaries(self.shapes))
+            self.assertEqual(
+                self.dictionaries(Rectangle.iter_from_file()),
+                self.dictionaries(self.shapes))
+            os.remove("Rectangle.json" + extension)
+
+    def test_same_text_as_plain(self):
+        """
+        The decompressed content is the plain JSON text.
+        """
+        Rectangle.save_to_file(self.shapes)
+        with open("Rectangle.json") as file:
+            plain = file.read()
+        Rectangle.save_to_file(self.shapes, compression="gzip")
+        with gzip.open("Rectangle.json.gz", "rt") as file:
+            self.assertEqual(file.read(), plain)
+
+    def test_save_keeps_other_variants(self):
+        """
+        A save leaves the other variants, and the plain file is read
+        first unless a codec is given.
+        """
+        Rectangle.save_to_file(self.shapes[:1])
+        Rectangle.save_to_file(self.shapes[:2], compression="gzip")
+        self.assertEqual(sorted(os.listdir(".")),
+                         ["Rectangle.json", "Rectangle.json.gz"])
+        self.assertEqual(len(Rectangle.load_from_file()), 1)
+        self.assertEqual(len(Rectangle.load_from_file(compression="gzip")),
+                         2)
+        self.assertEqual(len(list(Rectangle.iter_from_file(
+            compression="gzip"))), 2)
+        Rectangle.save_to_file(self.shapes[:3])
+        self.assertEqual(len(Rectangle.load_from_file(compression="gzip")),
+                         2)
+
+    def test_ambiguous_variants(self):
+        """
+        Several compressed variants without a plain file are not guessed.
+        """
+        Rectangle.save_to_file(self.shapes[:1], compression="bz2")
+        Rectangle.save_to_file(self.shapes[:2], compression="lzma")
+        with self.assertRaises(ValueError):
+            Rectangle.load_from_file()
+        self.assertEqual(len(Rectangle.load_from_file(compression="bz2")), 1)
+
+    def test_log_with_compressed_snapshot(self):
+        """
+        A compressed save is the snapshot of load_from_log() and compact(),
+        which rewrite it with its codec.
+        """
+        Rectangle.save_to_file(self.shapes[:2])
+        Rectangle.log_update(self.shapes[0], width=40)
+        Rectangle.save_to_file(self.shapes[:2], compression="gzip")
+        Rectangle.log_update(self.shapes[1], width=50)
+        expected = self.dictionaries(self.shapes[:2])
+        self.assertEqual(
+            self.dictionaries(Rectangle.load_from_log(compression="gzip")),
+            expected)
+        Rectangle.compact(compression="gzip")
+        self.assertFalse(os.path.exists("Rectangle.jsonl"))
+        self.assertEqual(
+            self.dictionaries(Rectangle.load_from_file(compression="gzip")),
+            expected)
+        os.remove("Rectangle.json")
+        Rectangle.log_delete(self.shapes[0])
+        self.assertEqual(self.dictionaries(Rectangle.compact()),
+                         expected[1:])
+        self.assertEqual(os.listdir("."), ["Rectangle.json.gz"])
+        self.assertEqual(self.dictionaries(Rectangle.load_from_file()),
+                         expected[1:])
+
+    def test_readers_find_compressed_file(self):
+        """
+        The other readers of the class file also read a compressed one.
+        """
+        Rectangle.save_to_file(self.shapes, compression="lzma")
+        expected = self.dictionaries(self.shapes)
+        self.assertEqual(aggregate_file(Rectangle).count, len(self.shapes))
+        self.assertEqual(
+            self.dictionaries(parallel_loader.load_file(Rectangle)), expected)
+        self.assertEqual(
+            self.dictionaries(flyweight.load_from_file(Rectangle)), expected)
+        with self.assertRaises(ValueError):
+            Rectangle.load_from_file(lazy=True)
+
+    def test_invalid_arguments(self):
+        """
+        Unknown codecs and unsupported combinations are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Rectangle.save_to_file(self.shapes, compression="zip")
+        with self.assertRaises(ValueError):
+            Rectangle.save_to_file(self.shapes, "binary", compression="gzip")
+        with self.assertRaises(ValueError):
+            Rectangle.load_from_file(lazy=True, compression="gzip")
+
+
+if __name__ == "__main__":
+    unittest.main()
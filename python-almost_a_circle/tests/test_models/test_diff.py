@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/diff.py.
+"""
+import gzip
+import json
+import unittest
+
+from models.diff import (apply_patch, diff_files, merge_files, read_patch,
+                         sorted_records)
+
+from . import TempDirTestCase
+
+
+def write(filename, records):
+    """
+    Writes records as a JSON list, compressed for a .gz file.
+    """
+    text = json.dumps(records)
+    if filename.endswith(".gz"):
+        with gzip.open(filename, "wt") as file:
+            file.write(text)
+    else:
+        with open(filename, "w") as file:
+            file.write(text)
+
+
+def square(id, size, x=0, y=0):
+    """
+    Returns the dictionary of a square.
+    """
+    return {"id": id, "size": size, "x": x, "y": y}
+
+
+class TestDiff(TempDirTestCase):
+    """
+    Tests for the diff, patch and merge functions.
+    """
+
+    def test_sorted_records_external_sort(self):
+        """
+        Unsorted files are sorted by id, the last duplicate winning.
+        """
+        write("a.json", [square(3, 1), square(1, 1), square(2, 1),
+                         square(1, 5)])
+        self.assertEqual(list(sorted_records("a.json", run_size=2)),
+                         [square(1, 5), square(2, 1), square(3, 1)])
+
+    def test_diff_and_apply(self):
+        """
+        Applying the diff of two files to the first gives the second.
+        """
+        old = [square(i, 1) for i in range(10, 0, -1)]
+        new = [square(i, 2 if i % 3 == 0 else 1) for i in range(2, 13)]
+        write("old.json", old)
+        write("new.json", new)
+        counts = diff_files("old.json", "new.json", "p.jsonl", run_size=3)
+        self.assertEqual(counts, {"added": 2, "removed": 1, "modified": 3})
+        modify = [op for op in read_patch("p.jsonl") if op["op"] == "modify"]
+        self.assertEqual(modify[0], {"op": "modify", "id": 3,
+                                     "changes": {"size": 2}})
+        self.assertEqual(apply_patch("old.json", "p.jsonl"), len(new))
+        with open("old.json") as file:
+            self.assertEqual(json.load(file), new)
+
+    def test_apply_keeps_compression(self):
+        """
+        Patching a compressed file in place keeps it compressed.
+        """
+        write("old.json.gz", [square(1, 1), square(2, 1)])
+        write("new.json", [square(1, 1), square(2, 3)])
+        diff_files("old.json.gz", "new.json", "p.jsonl")
+        apply_patch("old.json.gz", "p.jsonl")
+        with gzip.open("old.json.gz", "rt") as file:
+            self.assertEqual(json.load(file), [square(1, 1), square(2, 3)])
+        self.assertEqual(list(sorted_records("old.json.gz")),
+                         [square(1, 1), square(2, 3)])
+
+    def test_merge(self):
+        """
+        Merging keeps every id and the preferred side on conflicts.
+        """
+        write("left.json", [square(1, 1), square(2, 1)])
+        write("right.json", [square(2, 9), square(3, 1)])
+        self.assertEqual(merge_files("left.json", "right.json", "m.json.gz",
+                                     prefer="left"), 3)
+        self.assertEqual(list(sorted_records("m.json.gz")),
+                         [square(1, 1), square(2, 1), square(3, 1)])
+        with self.assertRaises(ValueError):
+            merge_files("left.json", "right.json", "m.json", prefer="up")
+
+    def test_unsorted_patch(self):
+        """
+        A patch whose ids are not increasing is rejected.
+        """
+        with open("p.jsonl", "w") as file:
+            file.write('{"op": "remove", "id": 2}\n'
+                       '{"op": "remove", "id": 1}\n')
+        with self.assertRaises(ValueError):
+            list(read_patch("p.jsonl"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/durable.py.
+"""
+import os
+import stat
+import threading
+import unittest
+
+from models.durable import GroupCommit, atomic_write
+from models.rectangle import Rectangle
+from models.square import Square
+
+from . import TempDirTestCase
+
+
+class TestAtomicWrite(TempDirTestCase):
+    """
+    Tests for atomic_write().
+    """
+
+    def setUp(self):
+        """
+        Works in a temporary directory with a 022 umask.
+        """
+        super().setUp()
+        self.umask = os.umask(0o022)
+
+    def tearDown(self):
+        """
+        Restores the umask and the original directory.
+        """
+        os.umask(self.umask)
+        super().tearDown()
+
+    def mode(self, filename):
+        """
+        Returns the permission bits of filename.
+        """
+        return stat.S_IMODE(os.stat(filename).st_mode)
+
+    def test_replace(self):
+        """
+        The file is replaced and no temporary file is left.
+        """
+        for policy in ("none", "close", "periodic"):
+            with atomic_write("a.json", durability=policy) as file:
+                file.write(policy)
+            with open("a.json") as file:
+                self.assertEqual(file.read(), policy)
+        self.assertEqual(os.listdir("."), ["a.json"])
+
+    def test_failure_keeps_old_file(self):
+        """
+        An error in the with block leaves the old file untouched.
+        """
+        with atomic_write("a.json") as file:
+            file.write("old")
+        with self.assertRaises(RuntimeError):
+            with atomic_write("a.json") as file:
+                file.write("new")
+                raise RuntimeError
+        with open("a.json") as file:
+            self.assertEqual(file.read(), "old")
+        self.assertEqual(os.listdir("."), ["a.json"])
+
+    def test_unknown_policy(self):
+        """
+        An unknown durability policy is rejected.
+        """
+        with self.assertRaises(ValueError):
+            with atomic_write("a.json", durability="sometimes"):
+                pass
+
+    def test_new_file_mode(self):
+        """
+        A new file gets the permissions of open(), not mkstemp()'s 0600.
+        """
+        with atomic_write("a.json") as file:
+            file.write("[]")
+        self.assertEqual(self.mode("a.json"), 0o644)
+        Rectangle.save_to_file([Rectangle(1, 1, id=1)])
+        self.assertEqual(self.mode("Rectangle.json"), 0o644)
+
+    def test_existing_file_mode(self):
+        """
+        A replaced file keeps its permissions.
+        """
+        with open("a.json", "w") as file:
+            file.write("[]")
+        os.chmod("a.json", 0o640)
+        with atomic_write("a.json") as file:
+            file.write("[1]")
+        self.assertEqual(self.mode("a.json"), 0o640)
+
+
+class Failing(Square):
+    """
+    Square whose saves always fail.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def save_to_file(cls, list_objs, file_format="json", durability=None):
+        """
+        Fails like a full disk.
+        """
+        raise OSError("disk full")
+
+
+class TestGroupCommit(TempDirTestCase):
+    """
+    Tests for GroupCommit.
+    """
+
+    def test_last_save_wins(self):
+        """
+        Saves of one batch are coalesced, the last list being written.
+        """
+        committer = GroupCommit(window=0.05)
+        threads = [threading.Thread(
+            target=committer.save,
+            args=(Rectangle, [Rectangle(1, 1, id=i) for i in range(n)]))
+            for n in (1, 2, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        committer.close()
+        self.assertIn(len(Rectangle.load_from_file()), (1, 2, 3))
+        self.assertEqual(committer._errors, {})
+
+    def test_errors_per_class(self):
+        """
+        A failed write is only reported to the callers of its class,
+        and forgotten once they have read it.
+        """
+        committer = GroupCommit(window=0.05)
+        results = {}
+
+        def save(cls):
+            try:
+                committer.save(cls, [])
+                results[cls] = None
+            except OSError as error:
+                results[cls] = error
+
+        threads = [threading.Thread(target=save, args=(cls,))
+                   for cls in (Rectangle, Failing)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIsNone(results[Rectangle])
+        self.assertIsInstance(results[Failing], OSError)
+        self.assertEqual(committer._errors, {})
+        self.assertEqual(committer._waiters, {})
+
+        committer.save(Failing, [], wait=False)
+        committer.flush()
+        self.assertEqual(committer._errors, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/flyweight.py.
+"""
+import sys
+import unittest
+
+from models.flyweight import FlyweightRectangle, FlyweightSquare
+from models.rectangle import Rectangle
+from models.square import Square
+
+
+class TestFlyweight(unittest.TestCase):
+    """
+    Tests for FlyweightRectangle and FlyweightSquare.
+    """
+
+    def test_shared_geometry(self):
+        """
+        Identical shapes share one geometry, changes are copy-on-write.
+        """
+        first = FlyweightRectangle(300, 400, 500, 600)
+        second = FlyweightRectangle(300, 400, 500, 600)
+        self.assertIs(first._geometry, second._geometry)
+        second.width = 301
+        self.assertEqual(first.width, 300)
+        self.assertEqual(second.width, 301)
+
+    def test_unused_geometries_are_dropped(self):
+        """
+        The table only keeps the geometries still in use.
+        """
+        count = FlyweightRectangle.distinct_geometries()
+        shape = FlyweightRectangle(1, 2)
+        shape.update(width=7, height=9, x=3, y=4)
+        for x in range(1000):
+            shape.x = x
+        self.assertEqual(FlyweightRectangle.distinct_geometries(),
+                         count + 1)
+        del shape
+        self.assertEqual(FlyweightRectangle.distinct_geometries(), count)
+
+    def test_update_is_all_or_nothing(self):
+        """
+        An invalid value leaves the square unchanged.
+        """
+        square = FlyweightSquare(3, 1, 1, 10)
+        square.update(11, 4, 2)
+        self.assertEqual(square.to_dictionary(),
+                         {"id": 11, "size": 4, "x": 2, "y": 1})
+        with self.assertRaises(ValueError):
+            square.update(size=5, x=-1)
+        self.assertEqual(str(square), "[Square] (11) 2/1 - 4")
+
+    def test_smaller_than_rectangle(self):
+        """
+        A flyweight instance only holds its id and geometry, and is
+        smaller than a Rectangle.
+        """
+        self.assertEqual(FlyweightRectangle.__slots__, ("_geometry",))
+        self.assertLess(sys.getsizeof(FlyweightRectangle(1, 1)),
+                        sys.getsizeof(Rectangle(1, 1)))
+
+    def test_virtual_subclasses(self):
+        """
+        Flyweights pass isinstance() checks and behave like the shapes.
+        """
+        square = FlyweightSquare(2, 1, 0, 4)
+        self.assertIsInstance(square, Square)
+        self.assertIsInstance(FlyweightRectangle(1, 1), Rectangle)
+        self.assertNotIsInstance(FlyweightRectangle(1, 1), Square)
+        self.assertEqual(str(square), str(Square(2, 1, 0, 4)))
+        self.assertEqual(square.to_json_record(),
+                         Square(2, 1, 0, 4).to_json_record())
+        self.assertEqual(square.area(), 4)
+
+if __name__ == "__main__":
+    unittest.main()
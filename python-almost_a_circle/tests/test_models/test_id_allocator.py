@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/id_allocator.py.
+"""
+import os
+import tempfile
+import unittest
+
+from models.base import Base
+from models.id_allocator import FileIdAllocator, IdAllocator
+from models.square import Square
+
+
+class TestIdAllocator(unittest.TestCase):
+    """
+    Tests for IdAllocator and FileIdAllocator.
+    """
+
+    def setUp(self):
+        """
+        Works in a private temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Goes back to the Base counter and removes the directory.
+        """
+        Base.set_id_allocator(None)
+        self.directory.cleanup()
+
+    def test_reserve(self):
+        """
+        Reserved ids are consecutive and never handed out again.
+        """
+        allocator = IdAllocator(5)
+        self.assertEqual(list(allocator.reserve(3)), [5, 6, 7])
+        self.assertEqual(allocator.next_id(), 8)
+        self.assertEqual(allocator.last_id(), 8)
+
+    def test_file_allocators_share_ids(self):
+        """
+        Two allocators on the same file never hand out the same id.
+        """
+        path = os.path.join(self.directory.name, "ids")
+        first = FileIdAllocator(path, block_size=3)
+        second = FileIdAllocator(path, block_size=3)
+        ids = [first.next_id(), second.next_id(), first.next_id()]
+        ids.extend(second.reserve(4))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(first.last_id(), 10)
+
+    def test_counter_file(self):
+        """
+        A new file starts at 1 and holds the next free id; a damaged one
+        is an error rather than a restart at 1.
+        """
+        path = os.path.join(self.directory.name, "ids")
+        allocator = FileIdAllocator(path, block_size=3)
+        self.assertEqual(allocator.next_id(), 1)
+        with open(path) as file:
+            self.assertEqual(file.read(), "4")
+        self.assertEqual(os.listdir(self.directory.name), ["ids"])
+        open(path, "w").close()
+        with self.assertRaises(ValueError):
+            FileIdAllocator(path).next_id()
+
+    def test_switch_in_skips_counter_ids(self):
+        """
+        A new allocator doesn't reissue ids given by the Base counter.
+        """
+        given = Square(1).id
+        Base.set_id_allocator(IdAllocator())
+        self.assertGreater(Square(1).id, given)
+
+    def test_switch_out_skips_allocator_ids(self):
+        """
+        The Base counter doesn't reissue ids given by the allocator.
+        """
+        Base.set_id_allocator(IdAllocator(Square(1).id + 1000))
+        given = Square(1).id
+        Base.set_id_allocator(None)
+        self.assertGreater(Square(1).id, given)
+
+    def test_switch_in_file_allocator(self):
+        """
+        A file allocator skips the ids given by the Base counter, in the
+        file too.
+        """
+        given = Square(1).id
+        path = os.path.join(self.directory.name, "ids")
+        Base.set_id_allocator(FileIdAllocator(path))
+        self.assertGreater(Square(1).id, given)
+        self.assertGreater(FileIdAllocator(path).next_id(), given)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/lazy.py.
+"""
+import unittest
+
+from models.rectangle import Rectangle
+from models.square import Square
+
+from . import TempDirTestCase
+
+
+class TestLazyShapeList(TempDirTestCase):
+    """
+    Tests for load_from_file(lazy=True).
+    """
+
+    def setUp(self):
+        """
+        Works in a temporary directory.
+        """
+        super().setUp()
+        self.shapes = [Square(i, i, 0, i) for i in range(1, 21)]
+
+    def check(self, file_format):
+        """
+        Checks length, indexing and slicing on a saved file.
+
+        Args:
+            file_format (str): "json" or "binary"
+        """
+        Square.save_to_file(self.shapes, file_format)
+        with Square.load_from_file(file_format, lazy=True,
+                                   cache_size=4) as shapes:
+            self.assertEqual(len(shapes), 20)
+            self.assertEqual(shapes[3].to_dictionary(),
+                             self.shapes[3].to_dictionary())
+            self.assertEqual(shapes[-1].id, 20)
+            self.assertEqual([s.id for s in shapes[2:8:2]], [3, 5, 7])
+            self.assertEqual(len(shapes._cache), 4)
+            with self.assertRaises(IndexError):
+                shapes[20]
+
+    def test_json(self):
+        """
+        A JSON file is read lazily.
+        """
+        self.check("json")
+
+    def test_binary(self):
+        """
+        A binary file is read lazily.
+        """
+        self.check("binary")
+
+    def test_missing_and_empty(self):
+        """
+        A missing file gives an empty list, an empty one has no record.
+        """
+        self.assertEqual(Rectangle.load_from_file(lazy=True), [])
+        Rectangle.save_to_file([])
+        with Rectangle.load_from_file(lazy=True) as shapes:
+            self.assertEqual(len(shapes), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
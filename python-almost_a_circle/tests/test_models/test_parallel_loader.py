@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/parallel_loader.py.
+"""
+import os
+import unittest
+
+from models import parallel_loader
+from models.rectangle import Rectangle
+from models.square import Square
+
+from . import TempDirTestCase
+
+
+class TestParallelLoader(TempDirTestCase):
+    """
+    Tests for load_file() and load_shards().
+    """
+
+    def test_load_file(self):
+        """
+        Chunks loaded by several workers are merged in file order.
+        """
+        shapes = [Rectangle(i, i + 1, i, 0, i) for i in range(1, 51)]
+        Rectangle.save_to_file(shapes)
+        for workers in (1, 3):
+            loaded = parallel_loader.load_file(Rectangle, workers=workers)
+            self.assertEqual([r.to_dictionary() for r in loaded],
+                             [r.to_dictionary() for r in shapes])
+
+    def test_load_shards(self):
+        """
+        Shards are merged in the given order, missing ones are skipped.
+        """
+        Square.save_to_file([Square(1, id=1), Square(2, id=2)])
+        os.replace("Square.json", "first.json")
+        Square.save_to_file([Square(3, id=3)])
+        loaded = parallel_loader.load_shards(
+            Square, ["Square.json", "missing.json", "first.json"], 2)
+        self.assertEqual([s.id for s in loaded], [3, 1, 2])
+
+    def test_invalid_workers(self):
+        """
+        A worker count <= 0 is rejected.
+        """
+        with self.assertRaises(ValueError):
+            parallel_loader.load_file(Rectangle, workers=0)
+        with self.assertRaises(ValueError):
+            parallel_loader.load_shards(Rectangle, [], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
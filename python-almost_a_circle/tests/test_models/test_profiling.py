@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/profiling.py.
+"""
+import io
+import unittest
+
+from models import profiling
+from models.rectangle import Rectangle
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Tests for the optional call counters.
+    """
+
+    def setUp(self):
+        """
+        Starts from empty statistics.
+        """
+        self.was_enabled = profiling.is_enabled()
+        profiling.disable()
+        profiling.reset()
+
+    def tearDown(self):
+        """
+        Leaves profiling as it was.
+        """
+        profiling.reset()
+        if self.was_enabled:
+            profiling.enable()
+
+    def test_profile_counts_calls(self):
+        """
+        Calls made inside profile() are counted, not the others.
+        """
+        rectangle = Rectangle(1, 1)
+        with profiling.profile():
+            rectangle.update(width=2)
+            rectangle.update(height=3)
+        rectangle.update(x=1)
+        entry = profiling.stats()["Rectangle.update"]
+        self.assertEqual(entry["calls"], 2)
+        self.assertEqual(sum(entry["histogram"].values()), 2)
+        self.assertFalse(profiling.is_enabled())
+
+    def test_disable_restores_methods(self):
+        """
+        disable() puts the original methods back.
+        """
+        update = Rectangle.__dict__["update"]
+        profiling.enable()
+        self.assertIsNot(Rectangle.__dict__["update"], update)
+        profiling.disable()
+        self.assertIs(Rectangle.__dict__["update"], update)
+
+    def test_report(self):
+        """
+        report() writes one line per operation and its histogram.
+        """
+        with profiling.profile():
+            Rectangle.to_json_string([{"id": 1}])
+        output = io.StringIO()
+        profiling.report(output)
+        self.assertIn("Base.to_json_string", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
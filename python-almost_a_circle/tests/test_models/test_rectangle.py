@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/rectangle.py.
+"""
+import io
+import unittest
+
+from models.rectangle import Rectangle
+from models.square import Square
+
+
+class ColoredRectangle(Rectangle):
+    """
+    Rectangle adding a field to its dictionary.
+    """
+
+    def to_dictionary(self):
+        """
+        Returns the Rectangle dictionary with a color.
+        """
+        return dict(super().to_dictionary(), color="red")
+
+
+class ColoredSquare(Square):
+    """
+    Square adding a field to its dictionary.
+    """
+
+    def to_dictionary(self):
+        """
+        Returns the Square dictionary with a color.
+        """
+        return dict(super().to_dictionary(), color="red")
+
+
+class TestRectangle(unittest.TestCase):
+    """
+    Tests for the Rectangle class.
+    """
+
+    def test_attributes(self):
+        """
+        Constructor arguments are validated and stored.
+        """
+        rect = Rectangle(2, 3, 4, 5, 12)
+        self.assertEqual(rect.to_dictionary(),
+                         {"id": 12, "width": 2, "height": 3, "x": 4, "y": 5})
+        self.assertEqual(rect.area(), 6)
+        self.assertEqual(str(rect), "[Rectangle] (12) 4/5 - 2/3")
+        with self.assertRaises(TypeError):
+            Rectangle("2", 3)
+        with self.assertRaises(ValueError):
+            Rectangle(2, 0)
+        with self.assertRaises(ValueError):
+            Rectangle(2, 3, -1)
+
+    def test_display(self):
+        """
+        display() writes the same text as render().
+        """
+        rect = Rectangle(2, 2, 1, 1)
+        output = io.StringIO()
+        rect.display(output)
+        self.assertEqual(output.getvalue(), "\n ##\n ##\n")
+        self.assertEqual(rect.render(), output.getvalue())
+
+    def test_update(self):
+        """
+        update() takes positional or keyword arguments.
+        """
+        rect = Rectangle(1, 1, id=1)
+        rect.update(7, 2, 3)
+        self.assertEqual((rect.id, rect.width, rect.height), (7, 2, 3))
+        rect.update(x=4, height=5)
+        self.assertEqual((rect.x, rect.height), (4, 5))
+
+    def test_to_json_record(self):
+        """
+        to_json_record() matches json.dumps(to_dictionary()).
+        """
+        for shape in (Rectangle(2, 3, 4, 5, 12), Square(2, id="a")):
+            self.assertEqual(shape.to_json_record(),
+                             Rectangle.to_json_string(
+                                 [shape.to_dictionary()])[1:-1])
+
+    def test_to_json_record_subclass(self):
+        """
+        Fields a subclass adds in to_dictionary() are encoded too.
+        """
+        shapes = [ColoredRectangle(2, 3, id=1), ColoredSquare(4, id=2)]
+        self.assertEqual(Rectangle.encode_json(shapes),
+                         Rectangle.to_json_string(
+                             [shape.to_dictionary() for shape in shapes]))
+        self.assertIn('"color": "red"', shapes[1].to_json_record())
+
+
+class TestUpdateMany(unittest.TestCase):
+    """
+    Tests for Rectangle.update_many().
+    """
+
+    def setUp(self):
+        """
+        Builds a small collection.
+        """
+        self.shapes = [Rectangle(1, 1, id=1), Square(2, id=2)]
+
+    def test_applied(self):
+        """
+        Valid change sets are applied, size fanning out on squares.
+        """
+        failures = Rectangle.update_many(
+            self.shapes, [(1, {"width": 5, "x": 2}), (2, {"size": 4}),
+                          (1, {"id": 10}), (10, {"y": 3})])
+        self.assertEqual(failures, [])
+        self.assertEqual(self.shapes[0].to_dictionary(),
+                         {"id": 10, "width": 5, "height": 1, "x": 2, "y": 3})
+        self.assertEqual(self.shapes[1].size, 4)
+
+    def test_failures_reported(self):
+        """
+        Bad items are reported one by one and leave their shape intact.
+        """
+        failures = Rectangle.update_many(
+            self.shapes, [(3, {"width": 2}), (1, {"width": 2, "x": -1}),
+                          (1, None), (1,), 5, ([1], {"x": 1}),
+                          (2, {"size": 3})])
+        self.assertEqual([type(error) for _, error in failures],
+                         [KeyError, ValueError, TypeError, TypeError,
+                          TypeError, TypeError])
+        self.assertEqual([id for id, _ in failures][:3], [3, 1, 1])
+        self.assertEqual(self.shapes[0].width, 1)
+        self.assertEqual(self.shapes[1].size, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/shape_store.py.
+"""
+import unittest
+
+from models.rectangle import Rectangle
+from models.shape_store import ShapeStore
+from models.square import Square
+
+
+class TestShapeStore(unittest.TestCase):
+    """
+    Tests for the ShapeStore class and its views.
+    """
+
+    def setUp(self):
+        """
+        Builds a store with one rectangle and one square.
+        """
+        self.store = ShapeStore([Rectangle(2, 3, 1, 1, 1), Square(4, id=2)])
+
+    def test_views(self):
+        """
+        Views read and write the columns.
+        """
+        self.assertEqual(len(self.store), 2)
+        self.assertIsInstance(self.store[1], Square)
+        self.assertEqual(self.store.to_dictionaries(),
+                         [{"id": 1, "width": 2, "height": 3, "x": 1, "y": 1},
+                          {"id": 2, "size": 4, "x": 0, "y": 0}])
+        self.store[0].width = 7
+        self.assertEqual(list(self.store.areas()), [21, 16])
+        with self.assertRaises(ValueError):
+            self.store[0].width = 0
+
+    def test_update_many(self):
+        """
+        Change sets are written to the columns.
+        """
+        failures = self.store.update_many([(1, {"x": 5}), (2, {"size": 6})])
+        self.assertEqual(failures, [])
+        self.assertEqual(self.store[0].x, 5)
+        self.assertEqual(self.store[1].to_dictionary()["size"], 6)
+
+    def test_update_many_bad_values(self):
+        """
+        Values the columns can't hold are reported, and nothing of their
+        change set is applied.
+        """
+        failures = self.store.update_many(
+            [(1, {"id": "abc", "width": 9}), (1, {"x": 2 ** 70, "y": 3}),
+             (2, None)])
+        self.assertEqual([type(error) for _, error in failures],
+                         [TypeError, ValueError, TypeError])
+        self.assertEqual(self.store.to_dictionaries()[0],
+                         {"id": 1, "width": 2, "height": 3, "x": 1, "y": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
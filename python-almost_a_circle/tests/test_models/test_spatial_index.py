@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/spatial_index.py.
+"""
+import math
+import random
+import time
+import unittest
+
+from models.rectangle import Rectangle
+from models.spatial_index import SpatialIndex
+from models.square import Square
+
+
+def distance(shape, x, y):
+    """
+    Returns the distance used by SpatialIndex.nearest().
+    """
+    dx = max(shape.x - x, 0, x - shape.x - shape.width)
+    dy = max(shape.y - y, 0, y - shape.y - shape.height)
+    return math.hypot(dx, dy)
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """
+    Tests for the SpatialIndex class, checked against brute force.
+    """
+
+    def setUp(self):
+        """
+        Builds an index over random shapes.
+        """
+        rng = random.Random(6)
+        self.shapes = [Rectangle(rng.randint(1, 80), rng.randint(1, 80),
+                                 rng.randint(0, 1000), rng.randint(0, 1000))
+                       for _ in range(300)]
+        self.index = SpatialIndex(self.shapes, cell_size=32)
+
+    def test_overlapping(self):
+        """
+        Overlap queries, small and huge, match a scan.
+        """
+        for box in ((100, 100, 50, 50), (0, 0, 10 ** 7, 10 ** 7),
+                    (500, 500, 1, 1), (-50, -50, 60, 60)):
+            x, y, width, height = box
+            expected = [s for s in self.shapes
+                        if s.x < x + width and x < s.x + s.width
+                        and s.y < y + height and y < s.y + s.height]
+            self.assertEqual(self.index.overlapping(*box), expected)
+
+    def test_containing(self):
+        """
+        Point queries match a scan.
+        """
+        expected = [s for s in self.shapes
+                    if s.x <= 400 < s.x + s.width
+                    and s.y <= 300 < s.y + s.height]
+        self.assertEqual(self.index.containing(400, 300), expected)
+
+    def test_nearest(self):
+        """
+        Nearest queries match a scan, near and far from the shapes.
+        """
+        for x, y, k in ((500, 500, 5), (-3000, 20, 3), (10 ** 6, 10 ** 6, 4)):
+            expected = sorted(self.shapes,
+                              key=lambda s: distance(s, x, y))[:k]
+            found = self.index.nearest(x, y, k)
+            self.assertEqual([distance(s, x, y) for s in found],
+                             [distance(s, x, y) for s in expected])
+
+    def test_far_query_is_fast(self):
+        """
+        A point far from a tiny index does not walk every ring between.
+        """
+        index = SpatialIndex([Square(1, 0, 0)])
+        start = time.perf_counter()
+        self.assertEqual(len(index.nearest(192000, 192000)), 1)
+        self.assertEqual(len(index.overlapping(0, 0, 10 ** 9, 10 ** 9)), 1)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_update_and_remove(self):
+        """
+        The index follows updates and removals.
+        """
+        shape = self.shapes[0]
+        self.index.update(shape, x=5000, y=5000)
+        self.assertEqual(self.index.containing(5000, 5000), [shape])
+        self.index.remove(shape)
+        self.assertNotIn(shape, self.index)
+        self.assertEqual(len(self.index), len(self.shapes) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
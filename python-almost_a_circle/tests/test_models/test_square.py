@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/square.py.
+"""
+import json
+import unittest
+
+from models.base import Base
+from models.rectangle import Rectangle
+from models.square import Square
+
+from . import TempDirTestCase
+
+
+class TestSquare(unittest.TestCase):
+    """
+    Tests for the Square class.
+    """
+
+    def test_size(self):
+        """
+        size sets width and height, with the width error messages.
+        """
+        square = Square(3, 1, 2, 7)
+        square.size = 5
+        self.assertEqual((square.width, square.height), (5, 5))
+        self.assertEqual(str(square), "[Square] (7) 1/2 - 5")
+        with self.assertRaisesRegex(ValueError, "width must be > 0"):
+            square.size = 0
+        with self.assertRaisesRegex(TypeError, "width must be an integer"):
+            Square("1")
+
+    def test_update(self):
+        """
+        update() takes id, size, x, y in order or by name.
+        """
+        square = Square(1, id=1)
+        square.update(10, 2, 3, 4)
+        self.assertEqual(square.to_dictionary(),
+                         {"id": 10, "size": 2, "x": 3, "y": 4})
+        square.update(size=6, y=0)
+        self.assertEqual(square.to_dictionary(),
+                         {"id": 10, "size": 6, "x": 3, "y": 0})
+
+    def test_create_many(self):
+        """
+        create_many() matches create() and takes no id for given ones.
+        """
+        dictionaries = [{"id": 4, "size": 2, "x": 1, "y": 1}, {"size": 3}]
+        expected = [Square.create(**d).to_dictionary() for d in dictionaries]
+        squares = Square.create_many(dictionaries)
+        self.assertEqual(squares[0].to_dictionary(), expected[0])
+        self.assertEqual(squares[1].size, 3)
+
+    def test_to_json_record(self):
+        """
+        The direct JSON text equals json.dumps of to_dictionary().
+        """
+        square = Square(2, 3, 4, 5)
+        self.assertEqual(square.to_json_record(),
+                         json.dumps(square.to_dictionary()))
+
+
+class TestTagged(TempDirTestCase):
+    """
+    Tests for save_tagged() and load_tagged() on mixed lists.
+    """
+
+    def test_round_trip(self):
+        """
+        Each shape comes back as its own class, in order.
+        """
+        shapes = [Square(2, id=1), Rectangle(2, 3, id=2), Square(4, id=3)]
+        Base.save_tagged(shapes)
+        loaded = Base.load_tagged()
+        self.assertEqual([type(shape) for shape in loaded],
+                         [Square, Rectangle, Square])
+        self.assertEqual([shape.to_dictionary() for shape in loaded],
+                         [shape.to_dictionary() for shape in shapes])
+
+
+if __name__ == "__main__":
+    unittest.main()
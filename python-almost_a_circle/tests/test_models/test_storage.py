@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Unittest module for models/storage.py.
+"""
+import unittest
+
+from models.base import Base
+from models.rectangle import Rectangle
+from models.square import Square
+from models.storage import SQLiteStorage
+
+from . import TempDirTestCase
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """
+    Tests for the SQLiteStorage backend.
+    """
+
+    def setUp(self):
+        """
+        Uses a private in-memory database.
+        """
+        self.storage = SQLiteStorage(":memory:")
+        Base.set_storage(self.storage)
+
+    def tearDown(self):
+        """
+        Goes back to the default backend.
+        """
+        Base.set_storage(None)
+        self.storage.close()
+
+    def test_save_and_load(self):
+        """
+        Saved rows are loaded back in order.
+        """
+        Rectangle.save([Rectangle(2, 3, 1, 1, 10), Rectangle(4, 5, id=11)])
+        loaded = Rectangle.load()
+        self.assertEqual([r.to_dictionary() for r in loaded],
+                         [{"id": 10, "width": 2, "height": 3, "x": 1, "y": 1},
+                          {"id": 11, "width": 4, "height": 5, "x": 0, "y": 0}])
+
+    def test_where(self):
+        """
+        Filters are applied in SQL.
+        """
+        Rectangle.save([Rectangle(2, 3, id=10), Rectangle(40, 5, id=11)])
+        self.assertEqual([r.id for r in Rectangle.load([("width", ">", 10)])],
+                         [11])
+        with self.assertRaises(ValueError):
+            Rectangle.load([("depth", ">", 10)])
+
+    def test_failed_save_keeps_old_rows(self):
+        """
+        A save failing on a bad record leaves the old rows in place.
+        """
+        Rectangle.save([Rectangle(2, 3, id=10), Rectangle(4, 5, id=11)])
+        with self.assertRaises(ValueError):
+            Rectangle.save([Rectangle(7, 7, id=12), Square(2, id=13)])
+        self.assertEqual([r.id for r in Rectangle.load()], [10, 11])
+
+    def test_failed_insert_rolls_back(self):
+        """
+        An error raised by SQLite rolls the whole save back.
+        """
+        Rectangle.save([Rectangle(2, 3, id=10)])
+        with self.assertRaises(Exception):
+            Rectangle.save([Rectangle(2, 3, id=2 ** 70)])
+        self.assertEqual([r.id for r in Rectangle.load()], [10])
+
+
+class TestJSONFileStorage(TempDirTestCase):
+    """
+    Tests for the default JSONFileStorage backend.
+    """
+
+    def test_where(self):
+        """
+        Filters are applied in Python after loading.
+        """
+        Rectangle.save([Rectangle(2, 3, id=10), Rectangle(40, 5, id=11)])
+        self.assertEqual([r.id for r in Rectangle.load([("height", "==", 3)])],
+                         [10])
+
+
+if __name__ == "__main__":
+    unittest.main()